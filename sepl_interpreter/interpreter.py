@@ -1,4 +1,5 @@
 from sepl_interpreter.ast_nodes import *
+from sepl_interpreter.stdlib import output
 
 class Environment:
     def __init__(self):
@@ -17,7 +18,10 @@ class Interpreter:
         self.env = Environment()
 
     def evaluate(self):
-        return self.exec_block(self.tree.children)
+        try:
+            return self.exec_block(self.tree.children)
+        finally:
+            output.flush()
 
     def exec_block(self, statements):
         for stmt in statements:
@@ -31,7 +35,7 @@ class Interpreter:
 
         elif isinstance(node, OutputNode):
             value = self.eval_expression(node.children[0])
-            print(value)
+            output.line(str(value))
 
         elif isinstance(node, IfNode):
             condition_value = self.eval_expression(node.condition)
@@ -62,6 +66,7 @@ class Interpreter:
 
 
         elif isinstance(node, InputNode):
+            output.flush()  # the prompt must follow everything printed so far
             val = input(node.value + ' ').strip()
             # Convert to int or float if numeric
             try:
@@ -0,0 +1,83 @@
+import atexit
+import sys
+import threading
+
+
+class OutputSink:
+    """Buffers program output and writes it to the target stream in large chunks.
+
+    The buffer is flushed when it passes `limit` characters, at exit, on
+    `flush()`, and after every write when the target is a terminal.
+    """
+
+    def __init__(self, stream=None, limit=1 << 16):
+        self.stream = stream
+        self.limit = limit
+        self.buf = []
+        self.size = 0
+        self.lock = threading.Lock()
+        self._owned = None
+        self._current = None
+        self._tty = False
+
+    def _target(self):
+        # caller holds the lock
+        target = self.stream or sys.stdout
+        if target is not self._current:
+            # new stream (redirect, swapped sys.stdout): drain to the old one and
+            # look up isatty() once instead of on every write
+            if self._current is not None:
+                self._drain()
+            self._current = target
+            try:
+                self._tty = target.isatty()
+            except (AttributeError, ValueError):
+                self._tty = False
+        return target
+
+    def write(self, text):
+        with self.lock:
+            self._target()
+            self.buf.append(text)
+            self.size += len(text)
+            if self.size >= self.limit or self._tty:
+                self._drain()
+
+    def line(self, text=""):
+        self.write(text + "\n")
+
+    def _drain(self):
+        # hand the buffer to the current target; only a terminal is flushed here,
+        # a file or pipe keeps its own buffering until flush()
+        if self.buf:
+            data = "".join(self.buf)
+            self.buf.clear()
+            self.size = 0
+            self._current.write(data)
+            if self._tty:
+                self._current.flush()
+
+    def flush(self):
+        with self.lock:
+            self._target()
+            self._drain()
+            try:
+                self._current.flush()
+            except (AttributeError, ValueError):
+                pass
+
+    def redirect(self, path=None, append=False):
+        """Send output to the file at `path`, or back to stdout when `path` is None."""
+        with self.lock:
+            if self._current is not None:
+                self._drain()
+            if self._owned is not None:
+                self._owned.close()
+                self._owned = None
+            if path is not None:
+                self._owned = open(path, "a" if append else "w", encoding="utf-8")
+            self.stream = self._owned
+            self._current = None
+
+output = OutputSink()
+atexit.register(output.flush)
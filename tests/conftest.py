@@ -0,0 +1,6 @@
+# tests/conftest.py
+# Makes the sepl_interpreter package importable from the repository root.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
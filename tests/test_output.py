@@ -0,0 +1,88 @@
+# tests/test_output.py
+# OutputSink buffering, redirect and the flush at interpreter exit.
+import io
+import os
+import subprocess
+import sys
+import threading
+
+from sepl_interpreter.stdlib import OutputSink
+
+
+class Stream(io.StringIO):
+    def __init__(self, tty=False):
+        super().__init__()
+        self.tty = tty
+        self.flushes = 0
+
+    def isatty(self): return self.tty
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+def test_buffers_until_limit_without_flushing():
+    s = Stream()
+    sink = OutputSink(s, limit=10)
+    sink.line("abc")
+    assert s.getvalue() == ""
+    sink.line("defghij")
+    assert s.getvalue() == "abc\ndefghij\n"
+    assert s.flushes == 0           # a pipe or file keeps its own buffering
+    sink.flush()
+    assert s.flushes == 1
+
+
+def test_terminal_gets_every_write():
+    s = Stream(tty=True)
+    sink = OutputSink(s)
+    sink.line("a")
+    assert s.getvalue() == "a\n" and s.flushes == 1
+
+
+def test_redirect_keeps_order(tmp_path, monkeypatch):
+    s = Stream()
+    monkeypatch.setattr(sys, "stdout", s)
+    sink = OutputSink()
+    sink.line("before")
+    sink.redirect(tmp_path / "out.txt")
+    sink.line("inside")
+    assert s.getvalue() == "before\n"
+    sink.redirect(None)
+    sink.line("after")
+    sink.flush()
+    assert (tmp_path / "out.txt").read_text() == "inside\n"
+    assert s.getvalue() == "before\nafter\n"
+
+
+def test_concurrent_writes_and_redirects_lose_nothing(tmp_path, monkeypatch):
+    s = Stream()
+    monkeypatch.setattr(sys, "stdout", s)
+    sink = OutputSink(limit=64)
+    paths = [tmp_path / f"{i}.txt" for i in range(20)]
+
+    def writer():
+        for i in range(500):
+            sink.line(str(i))
+
+    def redirector():
+        for p in paths:
+            sink.redirect(p, append=True)
+        sink.redirect(None)
+
+    threads = [threading.Thread(target=writer) for _ in range(4)] + [threading.Thread(target=redirector)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    sink.flush()
+    lines = s.getvalue().splitlines() + [l for p in paths if p.exists() for l in p.read_text().splitlines()]
+    assert sorted(lines) == sorted(str(i) for i in range(500) for _ in range(4))
+
+
+def test_flushed_at_exit():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "from sepl_interpreter.stdlib import output\noutput.line('bye')"
+    res = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert res.stdout == "bye\n"
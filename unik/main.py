@@ -6,6 +6,32 @@ import re
 import sys
 import json
 import os
+import operator
+import functools
+import hashlib
+import pickle
+import itertools
+from collections import OrderedDict
+from array import array
+
+from src.stdlib.persistent import PVector, PMap
+from src.stdlib import string as ustring
+from src.stdlib import collections as ucoll
+from src.stdlib.graph import Graph
+from src.stdlib.table import Table, read_csv
+from src.stdlib import json as ujson
+from src.stdlib import buffer as ubuf
+from src.stdlib import fileio
+from src.stdlib.output import out as uout
+from src.stdlib import runcache
+from src.stdlib.aicache import AICache, prompt_key
+from src.stdlib import aigen
+from src.stdlib import tasks as utasks
+
+try:
+    import numpy as np
+except ImportError:  # optional: bulk/vector fast paths fall back to pure Python
+    np = None
 
 # ----------------------------
 # Lexer
@@ -23,7 +49,7 @@ class Lexer:
     KEYWORDS = {
         "func","class","trait","init","self",
         "if","else","alter","match","case",
-        "loop","repeat","break","return","ret",
+        "loop","in","repeat","break","return","ret","yield",
         "try","catch","finally",
         "give","ask","askfile","givefile",
         "true","false",
@@ -35,7 +61,7 @@ class Lexer:
         ("STRING", r'"(?:\\.|[^"\\])*"'),
         ("NUMBER", r'\d+\.\d+|\d+'),
         # multi-char ops
-        ("OP", r'\|\>|\.\.|->|==|!=|<=|>=|\+=|-=|\*=|/=|%=|\+\+|--|&&|\|\||::|\:\?'),
+        ("OP", r'\|\>|\.\.|->|=>|==|!=|<=|>=|\+=|-=|\*=|/=|%=|\+\+|--|&&|\|\||::|\:\?'),
         # single-char ops
         ("OP", r'[+\-*/%<>=!?:@\$]'),
         ("ID", r'[A-Za-z_][A-Za-z0-9_]*'),
@@ -105,10 +131,17 @@ class Number(Node):
     def __init__(self, v): self.value = float(v) if '.' in v else int(v)
     def __repr__(self): return f"Number({self.value})"
 
+def unescape(s): return s.encode('utf8').decode('unicode_escape')
+
 class String(Node):
-    def __init__(self, v): self.value = v[1:-1].encode('utf8').decode('unicode_escape')
+    def __init__(self, v): self.value = unescape(v[1:-1])
     def __repr__(self): return f"String({self.value!r})"
 
+class Template(Node):
+    # "Hello {name}": parts are literal strs, expression nodes, or (node, format_spec)
+    def __init__(self, parts): self.parts = parts
+    def __repr__(self): return f"Template({self.parts})"
+
 class Boolean(Node):
     def __init__(self,v): self.value = (v=="true")
     def __repr__(self): return f"Boolean({self.value})"
@@ -118,7 +151,15 @@ class Var(Node):
     def __repr__(self): return f"Var({self.name})"
 
 class Assign(Node):
-    def __init__(self,name,expr): self.name=name; self.expr=expr
+    def __init__(self,name,expr):
+        self.name=name; self.expr=expr
+        # `s = s + x + y`: the pieces (x, y) a loop's string accumulator appends in place
+        self.append = None
+        tail = []
+        while isinstance(expr, BinOp) and expr.op == "+":
+            tail.append(expr.right); expr = expr.left
+        if tail and isinstance(expr, Var) and expr.name == name:
+            self.append = tail[::-1]
     def __repr__(self): return f"Assign({self.name}={self.expr})"
 
 class BinOp(Node):
@@ -126,16 +167,28 @@ class BinOp(Node):
     def __repr__(self): return f"BinOp({self.left} {self.op} {self.right})"
 
 class Print(Node):
-    def __init__(self,expr): self.expr=expr
+    def __init__(self,expr,parts=None): self.expr=expr; self.parts=parts  # parts: the `give a, b, c` items
     def __repr__(self): return f"Print({self.expr})"
 
 class Input(Node):
     def __init__(self,prompt=None): self.prompt=prompt
     def __repr__(self): return f"Input({self.prompt})"
 
+class FileIn(Node):
+    def __init__(self,path): self.path=path
+    def __repr__(self): return f"FileIn({self.path})"
+
+class FileOut(Node):
+    def __init__(self,path,expr,parts=None,append=False): self.path=path; self.expr=expr; self.parts=parts; self.append=append
+    def __repr__(self): return f"FileOut({self.path}, {self.expr})"
+
 class FuncDef(Node):
     def __init__(self,name,params,body=None,single=None, is_async=False):
         self.name=name; self.params=params; self.body=body or []; self.single=single; self.is_async=is_async
+        self.vplan = None  # cached vectorizability of `single` (see vectorize_fn)
+        self.is_generator = contains_yield(self.body)
+        self.memo = None   # cache size from a `memo` annotation
+        self.effects = None   # (impure, free names, assigned names), see plan_memo
     def __repr__(self): return f"FuncDef({self.name}/{len(self.params)})"
 
 class FuncCall(Node):
@@ -155,9 +208,10 @@ class ForLoop(Node):
         self.step = step
         self.body = body
         self.foreach = foreach  # True if loop over collection
+        self.accums = self_appends(body)
 
 class Repeat(Node):
-    def __init__(self,cond,body): self.cond=cond; self.body=body
+    def __init__(self,cond,body): self.cond=cond; self.body=body; self.accums=self_appends(body)
     def __repr__(self): return f"Repeat({self.cond})"
 
 class ClassDef(Node):
@@ -171,6 +225,10 @@ class Return(Node):
 class Break(Node):
     def __repr__(self): return "Break()"
 
+class Yield(Node):
+    def __init__(self,expr): self.expr=expr
+    def __repr__(self): return f"Yield({self.expr})"
+
 class TryCatch(Node):
     def __init__(self,tryb,catchb,finallyb=None): self.tryb=tryb; self.catchb=catchb; self.finallyb=finallyb
 
@@ -181,6 +239,27 @@ class AI(Node):
     def __init__(self,prompt): self.prompt=prompt
     def __repr__(self): return f"AI({self.prompt})"
 
+class Expanded(Node):
+    # an `aik` block replaced ahead of time by its generated program (see build_file)
+    def __init__(self,prompt,body): self.prompt=prompt; self.body=body
+    def __repr__(self): return f"Expanded({self.prompt!r}, {len(self.body)} stmts)"
+
+class Wait(Node):
+    def __init__(self,expr,unit="s"): self.expr=expr; self.unit=unit
+    def __repr__(self): return f"Wait({self.expr}{self.unit})"
+
+class AwaitExpr(Node):
+    def __init__(self,expr): self.expr=expr
+    def __repr__(self): return f"Await({self.expr})"
+
+class TaskDef(Node):
+    def __init__(self,name,body): self.name=name; self.body=body
+    def __repr__(self): return f"TaskDef({self.name})"
+
+class RunTasks(Node):
+    def __init__(self,targets): self.targets=targets
+    def __repr__(self): return f"RunTasks({self.targets})"
+
 class ListLiteral(Node):
     def __init__(self,items): self.items=items
     def __repr__(self): return f"List({self.items})"
@@ -190,9 +269,120 @@ class DictLiteral(Node):
     def __repr__(self): return f"Dict({self.pairs})"
 
 class AttrAccess(Node):
-    def __init__(self, obj, attr): self.obj=obj; self.attr=attr
+    def __init__(self, obj, attr): self.obj=obj; self.attr=attr; self.ic=InlineCache(attr)
     def __repr__(self): return f"Attr({self.obj}.{self.attr})"
 
+class Index(Node):
+    def __init__(self, obj, index): self.obj=obj; self.index=index
+    def __repr__(self): return f"Index({self.obj}[{self.index}])"
+
+class SetIndex(Node):
+    def __init__(self, obj, index, expr): self.obj=obj; self.index=index; self.expr=expr
+    def __repr__(self): return f"SetIndex({self.obj}[{self.index}]={self.expr})"
+
+class Lambda(Node):
+    def __init__(self, params, body): self.defnode = FuncDef("<lambda>", params, single=body)
+    def __repr__(self): return f"Lambda({self.defnode.params} => {self.defnode.single})"
+
+class SetAttr(Node):
+    def __init__(self, obj, attr, expr): self.obj=obj; self.attr=attr; self.expr=expr
+    def __repr__(self): return f"SetAttr({self.obj}.{self.attr}={self.expr})"
+
+def contains_yield(stmts):
+    # does this body yield? nested function definitions do not count
+    for st in stmts:
+        if isinstance(st, Yield):
+            return True
+        if isinstance(st, If) and (contains_yield(st.body) or contains_yield(st.orelse)):
+            return True
+        if isinstance(st, (ForLoop, Repeat)) and contains_yield(st.body):
+            return True
+    return False
+
+def has_suspend(stmts):
+    # can this body stop at `wait` / `await` / `run`? (nested function definitions do not count)
+    for st in stmts:
+        if isinstance(st, (Wait, RunTasks, AwaitExpr)):
+            return True
+        if isinstance(st, Assign) and isinstance(st.expr, AwaitExpr):
+            return True
+        if isinstance(st, Return) and isinstance(st.val, AwaitExpr):
+            return True
+        if isinstance(st, Print) and isinstance(st.expr, AwaitExpr):
+            return True
+        if isinstance(st, If) and (has_suspend(st.body) or has_suspend(st.orelse)):
+            return True
+        if isinstance(st, (ForLoop, Repeat)) and has_suspend(st.body):
+            return True
+    return False
+
+def self_appends(stmts, out=None):
+    # names accumulated with `s = s + x` anywhere in a loop body (nested functions excluded)
+    out = set() if out is None else out
+    for st in stmts:
+        if isinstance(st, Assign) and st.append:
+            out.add(st.name)
+        elif isinstance(st, If):
+            self_appends(st.body, out); self_appends(st.orelse, out)
+        elif isinstance(st, (ForLoop, Repeat)):
+            out |= st.accums
+    return out
+
+WAIT_UNITS = {"ms": 0.001, "s": 1, "min": 60, "h": 3600}
+
+def _hole_end(body, i):
+    # index just past the `}` closing the `{` at body[i] (skipping \"quoted\" text), or 0
+    depth, j, n = 0, i, len(body)
+    while j < n:
+        c = body[j]
+        if c == "\\" and body[j + 1:j + 2] == '"':
+            end = body.find('\\"', j + 2)
+            if end < 0:
+                return 0
+            j = end + 2
+            continue
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if not depth:
+                return j + 1
+        j += 1
+    return 0
+
+def _top_level_colon(src):
+    # position of the first `:` outside quotes and brackets, or -1
+    depth, quote, j = 0, False, 0
+    while j < len(src):
+        c = src[j]
+        if quote:
+            if c == "\\":
+                j += 1
+            elif c == '"':
+                quote = False
+        elif c == '"':
+            quote = True
+        elif c in "([{":
+            depth += 1
+        elif c in ")]}":
+            depth -= 1
+        elif c == ":" and depth == 0:
+            return j
+        j += 1
+    return -1
+
+def _format_spec_ok(spec):
+    # a spec any of int / float / str accepts; the value's own type is checked when formatted
+    if not spec:
+        return False
+    for sample in (0, 0.0, ""):
+        try:
+            format(sample, spec)
+            return True
+        except ValueError:
+            pass
+    return False
+
 # ----------------------------
 # Parser (recursive descent)
 # ----------------------------
@@ -248,21 +438,80 @@ class Parser:
             expr_fold = parts[0]
             for p in parts[1:]:
                 expr_fold = BinOp(expr_fold, "+", p)
-            return Print(expr_fold)
+            return Print(expr_fold, parts if len(parts) > 1 else None)
+
+        if self.match("KEYWORD", "task"):
+            self.eat("KEYWORD", "task")
+            name = self.eat("ID").value
+            return TaskDef(name, self.parse_block())
+        if self.match("KEYWORD", "run"):
+            # run t1, t2: start them together and wait for all of them
+            self.eat("KEYWORD", "run")
+            targets = [self.parse_expr()]
+            while self.match("PUNC", ","):
+                self.eat("PUNC", ",")
+                targets.append(self.parse_expr())
+            return RunTasks(targets)
+        if self.match("KEYWORD", "wait"):
+            # wait 2s / wait 500ms / wait n (seconds)
+            line = self.eat("KEYWORD", "wait").line
+            expr = self.parse_expr()
+            unit = "s"
+            tok = self.cur()
+            if tok is not None and tok.type == "ID" and tok.value in WAIT_UNITS and tok.line == line:
+                unit = self.eat("ID").value
+            return Wait(expr, unit)
+        if self.match("KEYWORD", "givefile"):
+            # givefile [append] path, a, b, ...
+            self.eat("KEYWORD", "givefile")
+            append = False
+            nxt = self.tokens[self.pos + 1] if self.pos + 1 < len(self.tokens) else None
+            if self.match("ID", "append") and nxt is not None and nxt.value != ",":
+                self.eat("ID"); append = True
+            path = self.parse_expr()
+            self.eat("PUNC", ",")
+            parts = [self.parse_expr()]
+            while self.match("PUNC", ","):
+                self.eat("PUNC", ",")
+                parts.append(self.parse_expr())
+            return FileOut(path, parts[0], parts if len(parts) > 1 else None, append)
 
         if self.match("KEYWORD", "ask"):
             self.eat("KEYWORD", "ask")
             prompt = None
             if self.match("STRING"):
-                prompt = String(self.eat("STRING").value)
+                prompt = self.parse_string(self.eat("STRING"))
             if self.match("OP", "->"):
                 self.eat("OP", "->")
                 name = self.eat("ID").value
                 return Assign(name, Input(prompt))
             return Input(prompt)
 
-        if self.match("KEYWORD", "func"):
+        if self.match("KEYWORD", "func") or self.match("KEYWORD", "init"):
             return self.parse_func()
+        if self.match("ID", "memo") and self.memo_annotation():
+            # memo func f(...) / memo(size) func f(...): cache results (see Memo)
+            self.eat("ID")
+            size = MEMO_SIZE
+            if self.match("PUNC", "("):
+                self.eat("PUNC", "(")
+                size = int(self.eat("NUMBER").value)
+                self.eat("PUNC", ")")
+            fn = self.parse_func()
+            fn.memo = size
+            return fn
+        if self.match("KEYWORD", "ret") or self.match("KEYWORD", "return"):
+            line = self.eat("KEYWORD").line
+            tok = self.cur()
+            if tok is None or tok.line != line or self.match("PUNC", "}"):
+                return Return(None)     # a bare return ends at the line break
+            return Return(self.parse_expr())
+        if self.match("KEYWORD", "break"):
+            self.eat("KEYWORD", "break")
+            return Break()
+        if self.match("KEYWORD", "yield"):
+            self.eat("KEYWORD", "yield")
+            return Yield(self.parse_expr())
         if self.match("KEYWORD", "class"):
             return self.parse_class()
         if self.match("KEYWORD", "if"):
@@ -303,9 +552,21 @@ class Parser:
     # ----------------------------
     # Function
     # ----------------------------
+    def memo_annotation(self):
+        t = self.tokens
+        i = self.pos + 1
+        if i + 2 < len(t) and t[i].value == "(" and t[i + 1].type == "NUMBER" and t[i + 2].value == ")":
+            i += 3
+        return i < len(t) and t[i].type == "KEYWORD" and t[i].value == "func"
+
     def parse_func(self):
-        self.eat("KEYWORD", "func")
-        name = self.eat("ID").value
+        if self.match("KEYWORD", "init"):
+            # constructor inside a class body: init(params) { ... }
+            self.eat("KEYWORD", "init")
+            name = "init"
+        else:
+            self.eat("KEYWORD", "func")
+            name = self.eat("ID").value
         self.eat("PUNC", "(")
         params = []
         if not self.match("PUNC", ")"):
@@ -417,8 +678,8 @@ class Parser:
     # Assignment / Expression
     # ----------------------------
     def parse_assign_or_expr(self):
-        if self.match("ID"):
-            name = self.eat("ID").value
+        if self.match("ID") or self.match("KEYWORD", "self"):
+            name = self.eat().value
             if self.match("OP", ":"):
                 self.eat("OP", ":")
                 ann = self.eat("ID").value
@@ -431,22 +692,14 @@ class Parser:
                 self.eat("OP", "=")
                 expr = self.parse_expr()
                 return Assign(name, expr)
-            node = Var(name)
-            while self.match("PUNC", "."):
-                self.eat("PUNC", ".")
-                attr = self.eat("ID").value
-                node = AttrAccess(node, attr)
-            if self.match("PUNC", "("):
-                self.eat("PUNC", "(")
-                args = []
-                if not self.match("PUNC", ")"):
-                    while True:
-                        args.append(self.parse_expr())
-                        if self.match("PUNC", ")"):
-                            break
-                        self.eat("PUNC", ",")
-                self.eat("PUNC", ")")
-                return FuncCall(node, args)
+            node = self.parse_postfix(Var(name))
+            if self.match("OP", "="):
+                if isinstance(node, AttrAccess):
+                    self.eat("OP", "=")
+                    return SetAttr(node.obj, node.attr, self.parse_expr())
+                if isinstance(node, Index):
+                    self.eat("OP", "=")
+                    return SetIndex(node.obj, node.index, self.parse_expr())
             return node
         return self.parse_expr()
 
@@ -503,20 +756,78 @@ class Parser:
             return BinOp(Number("0") if op == "-" else node, op, node)
         return self.parse_primary()
 
+    def parse_string(self, tok):
+        # split an interpolated literal into its format plan once. `{{` and `}}` are
+        # literal braces; so is any `{...}` that is not a valid hole (JSON, "{}", prose)
+        raw = tok.value
+        if "{" not in raw and "}" not in raw:
+            return String(raw)
+        body = raw[1:-1]
+        parts, lit, i, n = [], [], 0, len(body)
+        while i < n:
+            c = body[i]
+            if c in "{}" and body[i + 1:i + 2] == c:
+                lit.append(c); i += 2
+                continue
+            if c != "{":
+                lit.append(c); i += 1
+                continue
+            j = _hole_end(body, i)
+            hole = self.parse_hole(body[i + 1:j - 1].replace('\\"', '"'), tok) if j else None
+            if hole is None:
+                lit.append(c); i += 1
+                continue
+            if lit:
+                parts.append(unescape("".join(lit))); lit = []
+            parts.append(hole)
+            i = j
+        if lit:
+            parts.append(unescape("".join(lit)))
+        return Template(parts)
+
+    def parse_hole(self, src, tok):
+        # `expr` or `expr:spec` -> node or (node, spec); None when this is not a hole
+        spec = None
+        k = _top_level_colon(src)
+        if k >= 0:
+            src, spec = src[:k], src[k + 1:]
+            if not _format_spec_ok(spec):
+                return None
+        try:
+            sub = Parser(Lexer(src).tokenize())
+            node = sub.parse_expr() if sub.tokens else None
+        except SyntaxError:
+            return None
+        if node is None or sub.cur() is not None or isinstance(node, String):
+            return None     # a constant string computes nothing: `{"a": 1}` stays text
+        return node if spec is None else (node, spec)
+
     def parse_primary(self):
         # Added: handle `ask` as an expression here (so `x = ask "prompt"` works)
         if self.match("KEYWORD", "ask"):
             self.eat("KEYWORD", "ask")
             prompt = None
             if self.match("STRING"):
-                prompt = String(self.eat("STRING").value)
+                prompt = self.parse_string(self.eat("STRING"))
             # return Input node which can be used as expression or used via -> assignment form in parse_stmt
             return Input(prompt)
+        if self.match("KEYWORD", "await"):
+            self.eat("KEYWORD", "await")
+            return AwaitExpr(self.parse_primary())
+        if self.match("KEYWORD", "askfile"):
+            self.eat("KEYWORD", "askfile")
+            if self.match("PUNC", "("):
+                # askfile("x").lines(): the call parens hold the path, postfix ops bind to the handle
+                self.eat("PUNC", "(")
+                path = self.parse_expr()
+                self.eat("PUNC", ")")
+                return self.parse_postfix(FileIn(path))
+            return FileIn(self.parse_primary())
 
         if self.match("NUMBER"):
             return Number(self.eat("NUMBER").value)
         if self.match("STRING"):
-            return String(self.eat("STRING").value)
+            return self.parse_string(self.eat("STRING"))
         if self.match("KEYWORD") and self.cur().value in ("true", "false"):
             return Boolean(self.eat("KEYWORD").value)
         if self.match("PUNC", "["):
@@ -529,7 +840,7 @@ class Parser:
                         break
                     self.eat("PUNC", ",")
             self.eat("PUNC", "]")
-            return ListLiteral(items)
+            return self.parse_postfix(ListLiteral(items))
         if self.match("PUNC", "{"):
             self.eat("PUNC", "{")
             pairs = []
@@ -544,19 +855,27 @@ class Parser:
                     self.eat("PUNC", ",")
             self.eat("PUNC", "}")
             return DictLiteral(pairs)
+        params = self.lambda_params_ahead()
+        if params is not None:
+            self.eat("OP", "=>")
+            return Lambda(params, self.parse_expr())
         if self.match("PUNC", "("):
             self.eat("PUNC", "(")
             node = self.parse_expr()
             self.eat("PUNC", ")")
-            return node
-        if self.match("ID"):
-            name = self.eat("ID").value
-            node = Var(name)
-            while self.match("PUNC", "."):
+            return self.parse_postfix(node)
+        if self.match("ID") or self.match("KEYWORD", "self"):
+            name = self.eat().value
+            return self.parse_postfix(Var(name))
+        raise SyntaxError(f"Unexpected token: {self.cur()}")
+
+    def parse_postfix(self, node):
+        # chains of .attr, (args) and [index] after a primary
+        while True:
+            if self.match("PUNC", "."):
                 self.eat("PUNC", ".")
-                attr = self.eat("ID").value
-                node = AttrAccess(node, attr)
-            if self.match("PUNC", "("):
+                node = AttrAccess(node, self.eat("ID").value)
+            elif self.match("PUNC", "("):
                 self.eat("PUNC", "(")
                 args = []
                 if not self.match("PUNC", ")"):
@@ -566,9 +885,34 @@ class Parser:
                             break
                         self.eat("PUNC", ",")
                 self.eat("PUNC", ")")
-                return FuncCall(node, args)
-            return node
-        raise SyntaxError(f"Unexpected token: {self.cur()}")
+                node = FuncCall(node, args)
+            elif self.match("PUNC", "["):
+                self.eat("PUNC", "[")
+                node = Index(node, self.parse_expr())
+                self.eat("PUNC", "]")
+            else:
+                return node
+
+    def lambda_params_ahead(self):
+        # `x => ...` or `(a, b) => ...`; consumes the parameter list only on a match
+        toks, p = self.tokens, self.pos
+        def at(i, typ, val=None):
+            return i < len(toks) and toks[i].type == typ and (val is None or toks[i].value == val)
+        if at(p, "ID") and at(p + 1, "OP", "=>"):
+            self.pos = p + 1
+            return [toks[p].value]
+        if not at(p, "PUNC", "("):
+            return None
+        params, i = [], p + 1
+        while at(i, "ID"):
+            params.append(toks[i].value)
+            i += 1
+            if at(i, "PUNC", ","):
+                i += 1
+        if at(i, "PUNC", ")") and at(i + 1, "OP", "=>"):
+            self.pos = i + 1
+            return params
+        return None
 
 import os
 
@@ -595,6 +939,16 @@ class Env:
     def set(self, name, val):
         self.map[name] = val
 
+    def assign(self, name, val):
+        # rebind in the nearest scope that already defines `name`, else define locally
+        e = self
+        while e is not None:
+            if name in e.map:
+                e.map[name] = val
+                return
+            e = e.parent
+        self.map[name] = val
+
     def update(self, name, val):
         if name in self.map:
             self.map[name] = val
@@ -610,28 +964,957 @@ class UnikFunction:
     def __init__(self, defnode, env):
         self.defnode = defnode
         self.env = env
-
-    def call(self, args, interp):
+        self.memo = _UNPLANNED
+
+    def call(self, args, interp, this=None):
+        # first call: decide once whether to memoize, then bind `call` straight to
+        # the chosen path so plain functions pay nothing per call
+        self.use_memo(plan_memo(self))
+        return self.call(args, interp, this)
+
+    def use_memo(self, memo):
+        self.memo = memo
+        self.call = self.invoke if memo is None else self.call_memo
+
+    def call_memo(self, args, interp, this=None):
+        memo = self.memo
+        if this is not None:
+            return self.invoke(args, interp, this)
+        try:
+            key = memo.key(args)
+        except TypeError:
+            # unhashable (or, for an inferred memo, mutable) argument
+            return self.invoke(args, interp, this)
+        table = memo.table
+        hit = table.get(key, _MISS)
+        if hit is not _MISS:
+            memo.hits += 1
+            table.move_to_end(key)
+            return hit
+        memo.misses += 1
+        val = self.invoke(args, interp, this)
+        if memo.keeps(val):
+            table[key] = val
+            if len(table) > memo.maxsize:
+                table.popitem(last=False)
+        return val
+
+    def invoke(self, args, interp, this=None):
+        # args are already-evaluated values; `this` binds `self` for method calls
         local = Env(self.env)
+        if this is not None:
+            local.set("self", this)
         for i, param in enumerate(self.defnode.params):
-            local.set(param, interp.eval_node(args[i]) if i < len(args) else None)
+            local.set(param, args[i] if i < len(args) else None)
+        if self.defnode.is_async:
+            # the call is suspended until awaited (or spawned)
+            d = self.defnode
+            body = [Return(d.single)] if d.single is not None else d.body
+            return utasks.AsyncCall(lambda: interp.exec_async(body, local))
         if self.defnode.single is not None:
             return interp.eval_node_in_env(self.defnode.single, local)
-        return interp.run_block(self.defnode.body, local)
+        if self.defnode.is_generator:
+            # calling a generator function only creates the suspended body
+            return Stream(interp.exec_gen(self.defnode.body, local))
+        try:
+            return interp.run_block(self.defnode.body, local)
+        except ReturnSignal as r:
+            return r.value
+
+# ----------------------------
+# Memoization
+# ----------------------------
+# A function is memoized when it carries a `memo` annotation, or when it calls
+# itself and is pure: no I/O, no aik, no yield, no attribute/index stores, no
+# writes to names outside its own scope, and every free name it reads is a pure
+# Unik function or a pure builtin (a global constant could change between calls).
+# Inferred memos only key on immutable arguments and only keep immutable results,
+# so a caller mutating a returned list can never corrupt the table.
+MEMO_SIZE = 1 << 16
+_UNPLANNED = object()
+_MISS = object()
+_IMPURE_NODES = (Print, Input, FileIn, FileOut, AI, Expanded, Yield, SetAttr, SetIndex, ClassDef, FuncDef, Lambda)
+_PURE_BUILTINS = frozenset({"len", "range", "sum", "count", "first", "collect", "reduce", "map", "filter",
+                            "sort", "sort_by", "zip", "enumerate", "unique", "freeze", "pvec", "pmap"})
+_ATOMS = (int, float, str, bool, type(None), PVector, PMap)
+
+class Memo:
+    __slots__ = ("table", "maxsize", "hits", "misses", "inferred")
+
+    def __init__(self, maxsize=MEMO_SIZE, inferred=False):
+        self.table = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self.inferred = inferred
+
+    def key(self, args):
+        if self.inferred:
+            for a in args:
+                if not isinstance(a, _ATOMS):
+                    raise TypeError("mutable argument")
+        # 2, 2.0 and true hash alike; keep them apart
+        key = tuple((type(a), a) for a in args)
+        hash(key)
+        return key
+
+    def keeps(self, val):
+        return not self.inferred or isinstance(val, _ATOMS)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.table), "max": self.maxsize}
+
+def node_effects(defnode):
+    # syntactic part of the purity check, shared by every closure of a definition
+    if defnode.effects is None:
+        impure = False
+        reads, assigned = set(), set(defnode.params)
+        stack = [defnode.single] if defnode.single is not None else list(defnode.body)
+        while stack and not impure:
+            n = stack.pop()
+            if isinstance(n, (list, tuple)):
+                stack.extend(n)
+            elif isinstance(n, _IMPURE_NODES):
+                impure = True
+            elif isinstance(n, Node):
+                if isinstance(n, Var):
+                    reads.add(n.name)
+                elif isinstance(n, Assign):
+                    assigned.add(n.name)
+                elif isinstance(n, ForLoop):
+                    assigned.add(n.var)
+                elif isinstance(n, FuncCall) and not isinstance(n.callee, Var):
+                    impure = True   # method calls may mutate their receiver
+                stack.extend(v for v in vars(n).values() if isinstance(v, (Node, list, tuple)))
+        defnode.effects = (impure, reads - assigned, assigned - set(defnode.params))
+    return defnode.effects
+
+def plan_memo(fn):
+    d = fn.defnode
+    if d.is_generator or d.is_async:
+        return None
+    if d.memo is not None:
+        return Memo(d.memo)
+    return Memo(inferred=True) if is_pure(fn) and _recursive(fn) else None
+
+def _recursive(fn):
+    try:
+        return any(fn.env.get(name) is fn for name in node_effects(fn.defnode)[1])
+    except NameError:
+        return False
+
+def is_pure(fn, _seen=None):
+    seen = _seen if _seen is not None else set()
+    if id(fn) in seen:
+        return True
+    seen.add(id(fn))
+    impure, free, assigned = node_effects(fn.defnode)
+    if impure:
+        return False
+    env = fn.env
+    for name in assigned:
+        try:
+            env.get(name)
+            return False    # rebinding an outer name
+        except NameError:
+            pass
+    for name in free:
+        try:
+            v = env.get(name)
+        except NameError:
+            return False
+        if isinstance(v, UnikFunction):
+            if not is_pure(v, seen):
+                return False
+        elif name not in _PURE_BUILTINS or not callable(v):
+            return False
+    return True
+
+class ReturnSignal(Exception):
+    def __init__(self, value): self.value = value
+
+class BreakSignal(Exception):
+    pass
+
+class UnikTask:
+    # `task name { ... }`: a body that `run` / spawn / await start afresh each time
+    def __init__(self, name, body, env, interp):
+        self.name = name; self.body = body; self.env = env; self.interp = interp
+    def start(self): return self.interp.exec_async(self.body, Env(self.env))
+    def __repr__(self): return f"<task {self.name}>"
+
+class BoundMethod:
+    def __init__(self, obj, fn): self.obj = obj; self.fn = fn
+    def call(self, args, interp): return self.fn.call(args, interp, this=self.obj)
+
+class Shape:
+    # Hidden class: maps field names to slot indexes. Shapes are immutable; adding a
+    # field follows (or creates) a transition, so objects built the same way share one.
+    def __init__(self, cls, slots=None):
+        self.cls = cls
+        self.slots = slots or {}
+        self.transitions = {}
+
+    def with_field(self, name):
+        nxt = self.transitions.get(name)
+        if nxt is None:
+            slots = dict(self.slots)
+            slots[name] = len(slots)
+            nxt = self.transitions[name] = Shape(self.cls, slots)
+        return nxt
 
 class UnikObject:
-    def __init__(self, classname, fields=None, methods=None):
-        self.classname = classname
-        self.fields = fields or {}
-        self.methods = methods or {}
+    __slots__ = ("shape", "values")
+
+    def __init__(self, classname, fields=None, methods=None, shape=None):
+        if shape is None:
+            shape = UnikClass(classname, methods or {}).root
+        self.shape = shape
+        self.values = []
+        for k, v in (fields or {}).items():
+            self.set_attr(k, v)
+
+    @property
+    def classname(self): return self.shape.cls.name
+
+    @property
+    def methods(self): return self.shape.cls.methods
+
+    @property
+    def fields(self):
+        return {k: self.values[i] for k, i in self.shape.slots.items()}
 
     def get_attr(self, name):
-        if name in self.fields: return self.fields[name]
-        if name in self.methods: return self.methods[name]
+        i = self.shape.slots.get(name)
+        if i is not None: return self.values[i]
+        fn = self.shape.cls.methods.get(name)
+        if fn is not None: return BoundMethod(self, fn)
         raise AttributeError(f"{self.classname} has no attribute {name}")
 
     def set_attr(self, name, val):
-        self.fields[name] = val
+        i = self.shape.slots.get(name)
+        if i is None:
+            self.shape = self.shape.with_field(name)
+            self.values.append(val)
+        else:
+            self.values[i] = val
+
+_SHARED_DEFAULTS = (int, float, str, bool, type(None), PVector, PMap)
+
+class UnikClass:
+    def __init__(self, name, methods, fields=None, parent=None, factories=None):
+        self.name = name
+        self.methods = dict(parent.methods) if parent else {}
+        self.methods.update(methods)
+        self.fields = dict(parent.fields) if parent else {}
+        self.fields.update(fields or {})
+        # mutable defaults (lists, dicts, objects) are re-evaluated per instance
+        self.factories = dict(parent.factories) if parent else {}
+        for k in fields or {}:
+            self.factories.pop(k, None)
+        self.factories.update(factories or {})
+        # all instances start from the same root shape, default fields laid out first
+        self.root = Shape(self)
+        for k in self.fields:
+            self.root = self.root.with_field(k)
+        self.fresh = [(self.root.slots[k], expr) for k, expr in self.factories.items()]
+
+    def call(self, args, interp):
+        obj = UnikObject(self.name, shape=self.root)
+        obj.values = values = list(self.fields.values())
+        for i, expr in self.fresh:
+            values[i] = interp.eval_node_in_env(expr, interp.global_env)
+        init_fn = self.methods.get("init")
+        if init_fn is not None:
+            init_fn.call(args, interp, this=obj)
+        return obj
+
+    def __repr__(self): return f"<class {self.name}>"
+
+class InlineCache:
+    # Per-site cache for `obj.attr`: monomorphic on one shape, then a small
+    # polymorphic table, then megamorphic (plain lookup, no more caching).
+    POLY_LIMIT = 4
+    FIELD, METHOD, DICT, COLUMN, NATIVE = 0, 1, 2, 3, 4
+
+    def __init__(self, attr):
+        self.attr = attr
+        self.shape = None
+        self.entry = None
+        self.poly = None
+        self.megamorphic = False
+
+    def lookup(self, key):
+        # key is an object Shape, or a Python type for non-Unik bases
+        if key is self.shape:
+            return self.entry
+        if self.poly is not None:
+            return self.poly.get(key)
+        return None
+
+    def resolve(self, key):
+        if isinstance(key, ColumnLayout):
+            i = key.slots.get(self.attr)
+            if i is not None:
+                entry = (self.COLUMN, i)
+            elif self.attr in key.cls.methods:
+                entry = (self.METHOD, key.cls.methods[self.attr])
+            else:
+                raise AttributeError(f"{key.cls.name} has no attribute {self.attr}")
+        elif isinstance(key, Shape):
+            i = key.slots.get(self.attr)
+            if i is not None:
+                entry = (self.FIELD, i)
+            elif self.attr in key.cls.methods:
+                entry = (self.METHOD, key.cls.methods[self.attr])
+            else:
+                raise AttributeError(f"{key.cls.name} has no attribute {self.attr}")
+        elif key is dict:
+            entry = (self.DICT, None)
+        elif self.attr in getattr(key, "unik_methods", ()):
+            entry = (self.NATIVE, None)
+        else:
+            raise AttributeError("Attribute access on non-object")
+        if self.megamorphic:
+            return entry
+        if self.shape is None:
+            self.shape, self.entry = key, entry
+        else:
+            if self.poly is None:
+                self.poly = {self.shape: self.entry}
+            if len(self.poly) >= self.POLY_LIMIT:
+                self.megamorphic = True
+                self.poly = None
+                self.shape = self.entry = None
+            else:
+                self.poly[key] = entry
+        return entry
+
+# ----------------------------
+# Lists (compact numeric storage)
+# ----------------------------
+def _pack(values):
+    # all-int or all-float contents go unboxed into array('q'/'d'); anything else stays a list
+    if not isinstance(values, list):
+        values = list(values)
+    if values:
+        types = set(map(type, values))
+        if len(types) == 1:
+            code = _typecode_for(values[0])
+            if code:
+                try:
+                    return array(code, values)
+                except OverflowError:  # int beyond 64 bits
+                    pass
+    return values
+
+class UnikList:
+    """The runtime list value.
+
+    Storage is array('q') / array('d') while every item is an int / a float, which
+    costs 8 bytes per item instead of a pointer plus a boxed number. The first
+    non-matching write (a float into an int list, a string, a bigint...) upgrades
+    the storage to a plain list for good; an emptied list may specialize again.
+    """
+    __slots__ = ("items",)
+    __hash__ = None
+    unik_methods = frozenset({"append", "push", "pop", "insert", "extend",
+                              "index", "count", "copy", "len"})
+
+    def __init__(self, values=()):
+        self.items = _pack(values)
+
+    @classmethod
+    def wrap(cls, items):
+        lst = cls.__new__(cls)
+        lst.items = items
+        return lst
+
+    def _fits(self, v):
+        return type(v) is (int if self.items.typecode == 'q' else float)
+
+    def _generic(self):
+        if type(self.items) is array:
+            self.items = self.items.tolist()
+        return self.items
+
+    def append(self, v):
+        items = self.items
+        if type(items) is array:
+            if self._fits(v):
+                try:
+                    items.append(v)
+                    return None
+                except OverflowError:
+                    pass
+            items = self._generic()
+        elif not items:
+            self.items = _pack([v])
+            return None
+        items.append(v)
+        return None
+
+    push = append
+
+    def extend(self, other):
+        other = other.items if isinstance(other, UnikList) else other
+        items = self.items
+        if type(items) is array and type(other) is array and other.typecode == items.typecode:
+            items.extend(other)
+        else:
+            for v in other:
+                self.append(v)
+        return None
+
+    def insert(self, i, v):
+        if type(self.items) is array and not self._fits(v):
+            self._generic()
+        try:
+            self.items.insert(i, v)
+        except OverflowError:
+            self._generic().insert(i, v)
+        return None
+
+    def pop(self, i=-1): return self.items.pop(i)
+    def index(self, v): return self.items.index(v)
+    def count(self, v): return self.items.count(v)
+    def copy(self): return UnikList.wrap(self.items[:])
+    def len(self): return len(self.items)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return UnikList.wrap(self.items[i])
+        return self.items[i]
+
+    def __setitem__(self, i, v):
+        if type(self.items) is array and not self._fits(v):
+            self._generic()
+        try:
+            self.items[i] = v
+        except OverflowError:
+            self._generic()[i] = v
+
+    def __len__(self): return len(self.items)
+    def __iter__(self): return iter(self.items)
+    def __contains__(self, v): return v in self.items
+
+    def __eq__(self, other):
+        if isinstance(other, UnikList):
+            other = other.items
+        elif not isinstance(other, list):
+            return NotImplemented
+        return len(self.items) == len(other) and all(map(operator.eq, self.items, other))
+
+    def __add__(self, other):
+        if not isinstance(other, (UnikList, list)):
+            return NotImplemented
+        res = self.copy()
+        res.extend(other)
+        return res
+
+    def __radd__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return UnikList(other) + self
+
+    def __mul__(self, n): return UnikList.wrap(self.items * n)
+    __rmul__ = __mul__
+
+    def __repr__(self):
+        return repr(self.items.tolist() if type(self.items) is array else self.items)
+
+# ----------------------------
+# ECS-style columnar storage
+# ----------------------------
+def _typecode_for(v):
+    if type(v) is int: return 'q'
+    if type(v) is float: return 'd'
+    return None
+
+def _fits(col, v):
+    # typed columns take exact ints ('q') or ints/floats ('d'); never bools or objects
+    if type(col) is not array: return True
+    t = type(v)
+    if t is int:
+        return col.typecode == 'd' or -_INT64_LIMIT <= v < _INT64_LIMIT
+    return t is float and col.typecode == 'd'
+
+_INT64_LIMIT = 2 ** 63
+
+class ColumnLayout(Shape):
+    # Shape of an entity handle: slots index the store's columns, not a values list.
+    pass
+
+class EntityHandle:
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index): self.store = store; self.index = index
+
+    @property
+    def shape(self): return self.store.layout
+
+    @property
+    def classname(self): return self.store.cls.name
+
+    def get_attr(self, name):
+        i = self.store.layout.slots.get(name)
+        if i is not None: return self.store.columns[i][self.index]
+        fn = self.store.cls.methods.get(name)
+        if fn is not None: return BoundMethod(self, fn)
+        raise AttributeError(f"{self.classname} has no attribute {name}")
+
+    def set_attr(self, name, val):
+        self.store.set(self.index, name, val)
+
+    def __repr__(self): return f"<{self.classname} #{self.index}>"
+
+class ColumnStore:
+    """Struct-of-arrays container for instances of one class.
+
+    Each field is its own column: array('q') for ints, array('d') for floats and a
+    plain list for anything else. A column widens (q -> d -> list) the first time
+    it receives a value its typecode cannot hold. Iteration yields EntityHandles,
+    which read and write like ordinary objects; the bulk methods below run one pass
+    over a column instead of one interpreted attribute access per entity.
+    """
+    unik_methods = frozenset({"new", "push", "get", "column", "fill", "update",
+                              "sum", "mean", "min", "max", "count"})
+
+    def __init__(self, cls, interp):
+        if not isinstance(cls, UnikClass):
+            raise TypeError("columnar() expects a class")
+        self.cls = cls
+        self.interp = interp
+        self.size = 0
+        self.columns = []
+        self.layout = ColumnLayout(cls)
+        for name, v in cls.fields.items():
+            self._add_column(name, v)
+
+    def _add_column(self, name, sample):
+        # entities stored before the field existed read it as None, which only a
+        # plain list can hold; an empty store can start typed
+        code = _typecode_for(sample) if not self.size else None
+        self.columns.append(array(code) if code else [None] * self.size)
+        slots = dict(self.layout.slots)
+        slots[name] = len(slots)
+        # a new layout object so inline caches keyed on the old one stay correct
+        self.layout = ColumnLayout(self.cls, slots)
+
+    def _widen(self, i, val):
+        col = self.columns[i]
+        if type(col) is array and col.typecode == 'q' and type(val) is float:
+            self.columns[i] = array('d', col)
+        else:
+            self.columns[i] = list(col)
+
+    def _slot(self, name):
+        i = self.layout.slots.get(name)
+        if i is None:
+            raise AttributeError(f"{self.cls.name} column store has no field {name}")
+        return i
+
+    def set(self, index, name, val):
+        i = self._slot(name)
+        if not _fits(self.columns[i], val):
+            self._widen(i, val)
+        self.columns[i][index] = val
+
+    def push(self, obj):
+        fields = obj.fields if isinstance(obj, UnikObject) else dict(obj)
+        for name, v in fields.items():
+            if name not in self.layout.slots:
+                self._add_column(name, v)
+        for name, i in self.layout.slots.items():
+            v = fields.get(name)
+            if not _fits(self.columns[i], v):
+                self._widen(i, v)
+            self.columns[i].append(v)
+        self.size += 1
+        return EntityHandle(self, self.size - 1)
+
+    def new(self, *args):
+        # construct through the class (runs init) and store the resulting fields
+        return self.push(self.cls.call(list(args), self.interp))
+
+    def get(self, index): return EntityHandle(self, index)
+
+    def _col(self, name): return self.columns[self._slot(name)]
+
+    def _view(self, name):
+        # zero-copy NumPy view over a typed column, or None when not possible
+        col = self._col(name)
+        if np is None or type(col) is not array:
+            return None
+        return np.frombuffer(col, dtype=np.int64 if col.typecode == 'q' else np.float64)
+
+    def column(self, name): return UnikList(self._col(name))
+
+    def fill(self, name, val):
+        i = self._slot(name)
+        code = _typecode_for(val)
+        self.columns[i] = array(code, [val]) * self.size if code else [val] * self.size
+
+    def update(self, name, op, operand):
+        # name = name <op> operand, where operand is a number or another field name
+        i = self._slot(name)
+        other = self._col(operand) if isinstance(operand, str) else None
+        v, o = self._view(name), self._view(operand) if other is not None else operand
+        if v is not None and (other is None or o is not None):
+            res = self._update_vector(op, v, o)
+            if res is not None:
+                self.columns[i] = array('q' if res.dtype.kind in 'iu' else 'd', res.tobytes())
+                return None
+        col = self.columns[i]
+        f = _BINARY_OPS[op]
+        vals = [f(a, b) for a, b in zip(col, other)] if other is not None else [f(a, operand) for a in col]
+        code = _typecode_for(vals[0]) if vals else None
+        self.columns[i] = vals
+        if code and all(type(x) is type(vals[0]) for x in vals):
+            try:
+                self.columns[i] = array(code, vals)
+            except OverflowError:
+                pass        # ints beyond int64 stay boxed
+        return None
+
+    @staticmethod
+    def _update_vector(op, v, o):
+        # NumPy result for column <op> operand, or None when it could differ from
+        # the per-element result: int64 overflow (see _int64_op), a float error
+        # Python would raise on (x / 0), or booleans from a comparison
+        try:
+            with np.errstate(all="raise"):
+                if _is_int64(v) and (type(o) is int or _is_int64(o)):
+                    res = _int64_op(op, v, o)
+                else:
+                    res = _BINARY_OPS[op](v, o)
+        except (_NotVectorizable, FloatingPointError):
+            return None
+        return res if res.dtype.kind in 'iuf' else None
+
+    def sum(self, name):
+        v = self._view(name)
+        return v.sum().item() if v is not None else sum(self._col(name))
+
+    def mean(self, name):
+        return self.sum(name) / self.size if self.size else 0
+
+    def min(self, name):
+        v = self._view(name)
+        return v.min().item() if v is not None else min(self._col(name))
+
+    def max(self, name):
+        v = self._view(name)
+        return v.max().item() if v is not None else max(self._col(name))
+
+    def count(self, name, op, val):
+        v = self._view(name)
+        if v is not None:
+            return int(_BINARY_OPS[op](v, val).sum())
+        f = _BINARY_OPS[op]
+        return sum(1 for a in self._col(name) if f(a, val))
+
+    def __len__(self): return self.size
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield EntityHandle(self, i)
+
+    def __repr__(self): return f"<columnar {self.cls.name} x{self.size}>"
+
+# operator functions broadcast element-wise when applied to NumPy arrays
+_BINARY_OPS = {
+    "+": operator.add, "-": operator.sub, "*": operator.mul,
+    "/": operator.truediv, "%": operator.mod,
+    "==": operator.eq, "!=": operator.ne, "<": operator.lt,
+    "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+
+# ----------------------------
+# NumPy-backed vectors
+# ----------------------------
+VECTORIZE_MIN = 8   # shorter lists are not worth the array round-trip
+
+def _need_numpy(what):
+    if np is None:
+        raise RuntimeError(f"{what} requires NumPy (pip install numpy)")
+
+class UnikVector:
+    """Numeric vector value backed by a NumPy array.
+
+    Arithmetic and comparisons are element-wise and broadcast against scalars,
+    comparisons yield boolean vectors, and indexing with a boolean vector masks.
+    """
+    __hash__ = None
+    unik_methods = frozenset({"sum", "mean", "min", "max", "list", "len"})
+
+    def __init__(self, data):
+        _need_numpy("vector")
+        self.data = data if isinstance(data, np.ndarray) else np.asarray(list(data))
+
+    def _bin(self, other, op, reflected=False):
+        o = other.data if isinstance(other, UnikVector) else other
+        return UnikVector(op(o, self.data) if reflected else op(self.data, o))
+
+    def __add__(self, o): return self._bin(o, operator.add)
+    def __radd__(self, o): return self._bin(o, operator.add, True)
+    def __sub__(self, o): return self._bin(o, operator.sub)
+    def __rsub__(self, o): return self._bin(o, operator.sub, True)
+    def __mul__(self, o): return self._bin(o, operator.mul)
+    def __rmul__(self, o): return self._bin(o, operator.mul, True)
+    def __truediv__(self, o): return self._bin(o, operator.truediv)
+    def __rtruediv__(self, o): return self._bin(o, operator.truediv, True)
+    def __mod__(self, o): return self._bin(o, operator.mod)
+    def __rmod__(self, o): return self._bin(o, operator.mod, True)
+    def __eq__(self, o): return self._bin(o, operator.eq)
+    def __ne__(self, o): return self._bin(o, operator.ne)
+    def __lt__(self, o): return self._bin(o, operator.lt)
+    def __le__(self, o): return self._bin(o, operator.le)
+    def __gt__(self, o): return self._bin(o, operator.gt)
+    def __ge__(self, o): return self._bin(o, operator.ge)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, UnikVector):
+            return UnikVector(self.data[idx.data])
+        return self.data[idx].item()
+
+    def __len__(self): return len(self.data)
+    def __iter__(self): return iter(self.data.tolist())
+    def __repr__(self): return f"vector({self.data.tolist() if len(self.data) <= 20 else self.data})"
+
+    def sum(self): return self.data.sum().item()
+    def mean(self): return self.data.mean().item()
+    def min(self): return self.data.min().item()
+    def max(self): return self.data.max().item()
+    def list(self): return UnikList(self.data.tolist())
+    def len(self): return len(self.data)
+
+class _NotVectorizable(Exception):
+    pass
+
+_VECTOR_OPS = frozenset(_BINARY_OPS) | {"&&", "||"}
+
+def _pure_arith(node):
+    if isinstance(node, (Number, Boolean, Var)):
+        return True
+    if isinstance(node, BinOp):
+        return node.op in _VECTOR_OPS and _pure_arith(node.left) and _pure_arith(node.right)
+    return False
+
+_INT64_SAFE = 2.0 ** 62     # int64 results below this cannot have wrapped
+_FLOAT_EXACT = 2 ** 53      # ints up to this convert to float64 exactly
+
+def _int64_op(op, l, r):
+    # int64 arithmetic with Python int results: anything that could wrap or round
+    # differently goes back to the per-element path
+    for x in (l, r):
+        if type(x) is int and not -_FLOAT_EXACT <= x <= _FLOAT_EXACT:
+            raise _NotVectorizable(op)
+    if op in ("+", "-", "*"):
+        f = _BINARY_OPS[op](np.asarray(l, dtype=np.float64), np.asarray(r, dtype=np.float64))
+        if np.abs(f).max(initial=0) >= _INT64_SAFE:
+            raise _NotVectorizable(op)
+    elif op == "/":
+        if max(np.abs(l).max(initial=0), np.abs(r).max(initial=0)) > _FLOAT_EXACT:
+            raise _NotVectorizable(op)
+    return _BINARY_OPS[op](l, r)
+
+def _is_int64(x):
+    return isinstance(x, np.ndarray) and x.dtype == np.int64
+
+def _eval_vector(node, bindings, env, exact=False):
+    if isinstance(node, (Number, Boolean)):
+        return node.value
+    if isinstance(node, Var):
+        if node.name in bindings:
+            return bindings[node.name]
+        v = env.get(node.name)
+        if type(v) is int or type(v) is float:
+            return v
+        raise _NotVectorizable(node.name)
+    l = _eval_vector(node.left, bindings, env, exact)
+    r = _eval_vector(node.right, bindings, env, exact)
+    if node.op == "&&": return np.logical_and(l, r)
+    if node.op == "||": return np.logical_or(l, r)
+    if exact and (_is_int64(l) or _is_int64(r)) and \
+            (type(l) is int or _is_int64(l)) and (type(r) is int or _is_int64(r)):
+        return _int64_op(node.op, l, r)
+    return _BINARY_OPS[node.op](l, r)
+
+def vectorize_fn(fn):
+    """Return arr -> arr for a pure-arithmetic single-expression Unik function, else None.
+
+    Free variables are read from the closure at call time and must be numbers.
+    With exact=True int64 input keeps Python int results (see _int64_op).
+    """
+    if np is None or not isinstance(fn, UnikFunction):
+        return None
+    d = fn.defnode
+    if d.vplan is None:
+        d.vplan = d.single is not None and len(d.params) == 1 and _pure_arith(d.single)
+    if not d.vplan:
+        return None
+    param, body, env = d.params[0], d.single, fn.env
+    def run(arr, exact=False):
+        res = _eval_vector(body, {param: arr}, env, exact)
+        return res if isinstance(res, np.ndarray) else np.full(len(arr), res)
+    return run
+
+def _as_array(seq):
+    # Exact-semantics array for a numeric list: float64 when every item is a float
+    # (IEEE ops are identical), int64 when every item is an int (evaluated with
+    # exact=True), else object dtype.
+    if isinstance(seq, UnikVector):
+        return seq.data
+    if np is None or not isinstance(seq, UnikList) or len(seq) < VECTORIZE_MIN:
+        return None
+    items = seq.items
+    if type(items) is array:
+        return np.frombuffer(items, dtype=np.float64 if items.typecode == 'd' else np.int64)
+    seq = items
+    types = set(map(type, seq))
+    if types == {float}:
+        return np.array(seq, dtype=np.float64)
+    if types <= {int, float}:
+        return np.array(seq, dtype=object)
+    return None
+
+def _list_from_array(arr):
+    # int64 / float64 results go straight into packed storage, no boxing
+    code = {np.dtype(np.int64): 'q', np.dtype(np.float64): 'd'}.get(arr.dtype)
+    if code is None:
+        return UnikList(arr.tolist())
+    return UnikList.wrap(array(code, np.ascontiguousarray(arr).tobytes()))
+
+def _list_errstate(lst, arr):
+    # plain float lists must keep Python semantics (1.0/0 raises), so any float
+    # error aborts the vector pass and the per-element path re-runs it
+    if isinstance(lst, UnikList) and arr.dtype != object:
+        return np.errstate(all="raise")
+    return np.errstate()
+
+# ----------------------------
+# Lazy streams (|> pipelines)
+# ----------------------------
+class Stream:
+    """Single-pass lazy sequence.
+
+    Streaming builtins (map, filter, take, flat_map, ...) return a Stream when fed
+    one, and `|>` feeds them one whenever the left side is a list, so a pipeline
+    builds no intermediate lists: the terminal (reduce, sum, count, first, collect
+    or a loop) pulls each item through every stage once and can stop early.
+    """
+    unik_methods = frozenset({"collect"})
+
+    def __init__(self, it): self.it = it
+    def __iter__(self): return self.it
+    def __next__(self): return next(self.it)
+    def collect(self): return UnikList(self.it)
+    def __repr__(self): return "<stream>"
+
+def freeze(x):
+    # deep snapshot: lists become pvecs, dicts become pmaps (shared, never copied again)
+    if isinstance(x, (UnikList, list, tuple)):
+        return PVector.from_iter((freeze(v) for v in x), UnikList)
+    if isinstance(x, dict):
+        return PMap.from_items(((k, freeze(v)) for k, v in x.items()), UnikList)
+    return x
+
+def thaw(x):
+    if isinstance(x, PVector):
+        return UnikList([thaw(v) for v in x])
+    if isinstance(x, PMap):
+        return {k: thaw(v) for k, v in x.items()}
+    return x
+
+def _is_unik_callable(x):
+    return isinstance(x, (UnikFunction, UnikClass, BoundMethod)) or (callable(x) and not isinstance(x, type))
+
+def _fn_and_data(a, b):
+    # streaming builtins take (fn, data) when called directly and (data, fn) from a pipe
+    if _is_unik_callable(b) and not _is_unik_callable(a):
+        return b, a
+    return a, b
+
+def _take(a, b):
+    src, n = (a, b) if isinstance(b, int) else (b, a)
+    return Stream(itertools.islice(src, n))
+
+def _drop(a, b):
+    src, n = (a, b) if isinstance(b, int) else (b, a)
+    return Stream(itertools.islice(src, n, None))
+
+def _count(src, pattern=None):
+    if isinstance(src, str) and pattern is not None:
+        return ustring.count(src, pattern)   # count(text, "needle")
+    if hasattr(src, "__len__"):
+        return len(src)
+    n = 0
+    for _ in src:
+        n += 1
+    return n
+
+def _first(src, default=None):
+    return next(iter(src), default)
+
+# ----------------------------
+# String builders
+# ----------------------------
+class StringBuilder:
+    """Growable string: `add` appends a part in amortized O(1), `str` joins once.
+
+    `builder()` hands one to scripts. The interpreter also uses one behind the
+    scenes for a string variable grown with `s = s + x` inside a loop, so report
+    building is linear instead of copying the whole prefix on every iteration.
+    """
+    unik_methods = frozenset({"add", "append", "str", "len", "clear"})
+    __slots__ = ("parts", "size")
+
+    def __init__(self, init=""):
+        self.parts = [init] if init else []
+        self.size = len(init)
+    def add(self, *xs):
+        for x in xs:
+            x = x if type(x) is str else str(x)
+            self.parts.append(x)
+            self.size += len(x)
+        return self
+    append = add
+    def str(self):
+        parts = self.parts
+        if len(parts) > 1:
+            self.parts = parts = ["".join(parts)]
+        return parts[0] if parts else ""
+    def len(self): return self.size
+    def clear(self):
+        self.parts = []; self.size = 0
+        return self
+    def __len__(self): return self.size
+    def __str__(self): return self.str()
+    def __repr__(self): return repr(self.str())
+
+class _StrAccum(StringBuilder):
+    # stands in for a string variable while a loop appends to it; reading the
+    # variable (Var) materializes it, and the loop rebinds the plain string on exit
+    __slots__ = ()
+
+# ----------------------------
+# aik code generation
+# ----------------------------
+def parse_source(src):
+    return Parser(Lexer(src).tokenize(src)).parse()
+
+def ai_prompts(nodes):
+    # every aik prompt in a program, in source order (generated code is not searched)
+    out, stack = [], [nodes]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, (list, tuple)):
+            stack.extend(reversed(n))
+        elif isinstance(n, AI):
+            out.append(n.prompt)
+        elif isinstance(n, Node):
+            stack.extend(reversed([v for v in vars(n).values() if isinstance(v, (Node, list, tuple))]))
+    return out
 
 # ----------------------------
 # Interpreter
@@ -641,26 +1924,328 @@ class Interpreter:
         self.global_env = Env()
         self.cache_dir = ".unik_ai_cache"
         os.makedirs(self.cache_dir, exist_ok=True)
+        self.ai_cache = AICache(self.cache_dir)
+        self.ai_backend = aigen.backend_from_env()
+        self.ai_prefetch = None
+        self.sched = utasks.Scheduler()
+        self.writers = []               # file / JSON writers a script may leave open
+        self.ai_locked = False  # --locked: aik must come from the build, never the generator
+        self.stdin = None   # a runcache.LineFeed when answers to `ask` are recorded
         self.register_builtins()
 
     def register_builtins(self):
         self.global_env.set("len", lambda x: len(x))
-        self.global_env.set("print", lambda *a: print(*a))
+        self.global_env.set("print", lambda *a: uout.line(" ".join(map(str, a))))
+        def _redirect_output(path=None, append=False):
+            runcache.taint("output redirected")
+            uout.redirect(path, append)
+        self.global_env.set("redirect_output", _redirect_output)
         def _map(fn, lst):
+            fn, lst = _fn_and_data(fn, lst)
+            if isinstance(lst, Stream):
+                return Stream(self.call_fn(fn, [v]) for v in lst)
+            arr = _as_array(lst)
+            vf = vectorize_fn(fn) if arr is not None else None
+            if vf is not None:
+                try:
+                    with _list_errstate(lst, arr):
+                        res = vf(arr, isinstance(lst, UnikList))
+                    return UnikVector(res) if isinstance(lst, UnikVector) else _list_from_array(res)
+                except (_NotVectorizable, FloatingPointError):
+                    pass
             out = []
             for v in lst:
-                out.append(fn.call([v] if not isinstance(v, (int, float)) else [v], self))
-            return out
+                out.append(self.call_fn(fn, [v]))
+            return UnikVector(out) if isinstance(lst, UnikVector) else UnikList(out)
         def _filter(fn, lst):
+            fn, lst = _fn_and_data(fn, lst)
+            if isinstance(lst, Stream):
+                return Stream(v for v in lst if self.call_fn(fn, [v]))
+            arr = _as_array(lst)
+            vf = vectorize_fn(fn) if arr is not None else None
+            if vf is not None:
+                try:
+                    with _list_errstate(lst, arr):
+                        mask = vf(arr, isinstance(lst, UnikList)).astype(bool)
+                    return UnikVector(arr[mask]) if isinstance(lst, UnikVector) else _list_from_array(arr[mask])
+                except (_NotVectorizable, FloatingPointError):
+                    pass
             out = []
             for v in lst:
-                res = fn.call([v] if not isinstance(v, (int, float)) else [v], self)
+                res = self.call_fn(fn, [v])
                 if res: out.append(v)
-            return out
-        self.global_env.set("map", _map)
-        self.global_env.set("filter", _filter)
+            return UnikVector(out) if isinstance(lst, UnikVector) else UnikList(out)
+        def _reduce(fn, lst, init=None):
+            fn, lst = _fn_and_data(fn, lst)
+            # `(a, b) => a <op> b` folds without re-entering the tree walker: a ufunc
+            # reduce on vectors, a functools fold over apply_op on anything else
+            d = getattr(fn, "defnode", None)
+            body = d.single if d is not None else None
+            if (isinstance(body, BinOp) and body.op in _BINARY_OPS and len(d.params) == 2
+                    and isinstance(body.left, Var) and isinstance(body.right, Var)
+                    and (body.left.name, body.right.name) == tuple(d.params)):
+                ufunc = {"+": np.add, "-": np.subtract, "*": np.multiply, "/": np.divide}.get(body.op) if np else None
+                if isinstance(lst, UnikVector) and ufunc is not None:
+                    if init is None:
+                        return ufunc.reduce(lst.data).item()
+                    return ufunc.reduce(np.concatenate(([init], lst.data))).item()
+                op = functools.partial(self.apply_op, body.op)
+                return functools.reduce(op, lst, init) if init is not None else functools.reduce(op, lst)
+            acc_set = init is not None
+            acc = init
+            for v in lst:
+                if not acc_set:
+                    acc, acc_set = v, True
+                else:
+                    acc = self.call_fn(fn, [acc, v])
+            return acc
+        def _flat_map(fn, lst):
+            fn, lst = _fn_and_data(fn, lst)
+            return Stream(x for v in lst for x in self.call_fn(fn, [v]))
+        def _take_while(fn, lst):
+            fn, lst = _fn_and_data(fn, lst)
+            return Stream(itertools.takewhile(lambda v: self.call_fn(fn, [v]), lst))
+        def _drop_while(fn, lst):
+            fn, lst = _fn_and_data(fn, lst)
+            return Stream(itertools.dropwhile(lambda v: self.call_fn(fn, [v]), lst))
+        def _range(start, end, step=1):
+            # lazy integer range with an inclusive end, matching `loop i in a..b`
+            return Stream(iter(range(start, end + (1 if step > 0 else -1), step)))
+        for name, fn in (("map", _map), ("filter", _filter), ("flat_map", _flat_map),
+                         ("take_while", _take_while), ("drop_while", _drop_while),
+                         ("take", _take), ("drop", _drop)):
+            fn.streaming = True
+            self.global_env.set(name, fn)
+        self.global_env.set("reduce", _reduce)
+        self.global_env.set("range", _range)
+        self.global_env.set("collect", lambda s: UnikList(s))
+        self.global_env.set("sum", lambda s, start=0: sum(s, start))
+        self.global_env.set("count", _count)
+        self.global_env.set("first", _first)
+        self.register_hof_builtins()
+        def _vector(x):
+            return x if isinstance(x, UnikVector) else UnikVector(x)
+        def _vrange(start, end, step=1):
+            # integer range with an inclusive end, matching `loop i in a..b`
+            _need_numpy("vrange")
+            return UnikVector(np.arange(start, end + (1 if step > 0 else -1), step))
+        self.global_env.set("vector", _vector)
+        self.global_env.set("vrange", _vrange)
+        self.global_env.set("columnar", lambda cls: ColumnStore(cls, self))
+        self.global_env.set("pvec", lambda xs=(): PVector.from_iter(xs, UnikList))
+        self.global_env.set("pmap", lambda d=None: PMap.from_items((d or {}).items(), UnikList))
+        self.global_env.set("freeze", freeze)
+        self.global_env.set("thaw", thaw)
+        self.global_env.set("heap", lambda items=(), max=False: ucoll.Heap(items, max, UnikList))
+        self.global_env.set("deque", lambda items=(), maxlen=None: ucoll.Deque(items, maxlen, UnikList))
+        self.global_env.set("sorted_set", lambda items=(): ucoll.SortedSet(items, UnikList))
+        self.global_env.set("sorted_map", lambda d=None: ucoll.SortedMap((d or {}).items(), UnikList))
+        self.global_env.set("counter", lambda items=(): ucoll.Counter(items, UnikList))
+        self.global_env.set("bitset", lambda size=0: ucoll.Bitset(size, UnikList))
+        def _edge_array(xs):
+            # hand typed storage straight to the CSR builder (no per-element boxing)
+            if isinstance(xs, UnikList): return xs.items
+            if isinstance(xs, UnikVector): return xs.data
+            return xs
+        self.global_env.set("graph", lambda edges, directed=True: Graph.from_edges(edges, directed, UnikList))
+        self.global_env.set("graph_csr", lambda src, dst, weights=None, n=None, directed=True: Graph.from_arrays(
+            _edge_array(src), _edge_array(dst), None if weights is None else _edge_array(weights), n, directed,
+            list_type=UnikList))
+        def _read(src):
+            # file inputs are part of a cached run's key (see runcache); stdin and
+            # devices cannot be, so reading one makes the run uncacheable
+            if isinstance(src, str):
+                if src == "-": runcache.taint("stdin")
+                elif os.path.isfile(src): runcache.note_read(src)
+                elif os.path.exists(src): runcache.taint(f"reads {src}")
+            return src
+        def _written(target):
+            if isinstance(target, str): runcache.note_write(target, False)
+            return target
+        native_aggs = {self.global_env.get("sum"): "sum", _count: "count"}
+        def _resolve_agg(f):
+            # agg(sum, count): the builtins reduce natively; other functions run per group
+            name = native_aggs.get(f) if not isinstance(f, UnikFunction) else None
+            if name is not None or not _is_unik_callable(f):
+                return name
+            def per_group(vals):
+                return self.call_fn(f, [vals])
+            per_group.__name__ = f.defnode.name if isinstance(f, UnikFunction) else "agg"
+            return per_group
+        # columns reach script code as vectors it can compute with
+        self.global_env.set("read_csv", lambda path, columns=None, sep=",", header=True: read_csv(
+            _read(path), columns, sep, header, wrap=UnikVector, resolve=_resolve_agg, list_type=UnikList))
+        self.global_env.set("table", lambda cols: Table(cols, UnikVector, _resolve_agg, UnikList))
+        self.global_env.set("json_events", lambda src: Stream(ujson.events(_read(src))))
+        self.global_env.set("json_items", lambda src, path="": Stream(ujson.items(_read(src), path)))
+        self.global_env.set("json_lines", lambda src: Stream(ujson.lines(_read(src))))
+        self.global_env.set("json_lazy", lambda src: ujson.lazy(_read(src), UnikList))
+        self.global_env.set("json_writer", lambda target, mode="array": self.track(ujson.Writer(_written(target), mode)))
+        def _bytes(x=b"", encoding="utf-8"):
+            if isinstance(x, str): return ubuf.Bytes(x.encode(encoding), UnikList)
+            if isinstance(x, ubuf.Bytes): return ubuf.Bytes(x.mv.tobytes(), UnikList)
+            return ubuf.Bytes(bytes(x), UnikList)
+        self.global_env.set("bytes", _bytes)
+        self.global_env.set("buffer", lambda size=0: ubuf.Bytes(bytearray(size), UnikList))
+        self.global_env.set("pack", lambda fmt, *values: ubuf.pack(fmt, *values, list_type=UnikList))
+        self.global_env.set("from_hex", lambda s: ubuf.from_hex(s, UnikList))
+        self.global_env.set("from_base64", lambda s: ubuf.from_base64(s, UnikList))
+        self.global_env.set("read_chunks", lambda path, size=ubuf.CHUNK: Stream(ubuf.read_chunks(_read(path), size, UnikList)))
+        self.global_env.set("matcher", lambda pats, ignore_case=False: ustring.Automaton(pats, ignore_case, UnikList, Stream))
+        self.global_env.set("find_all", lambda text, pattern: UnikList(ustring.find_all(text, pattern)))
+        self.global_env.set("builder", lambda init="": StringBuilder(init if isinstance(init, str) else str(init)))
+        def _memoize(fn, size=MEMO_SIZE):
+            m = UnikFunction(fn.defnode, fn.env)
+            m.use_memo(Memo(size))
+            return m
+        def _memo_stats(fn):
+            memo = fn.memo if isinstance(fn, UnikFunction) else None
+            return memo.stats() if isinstance(memo, Memo) else None
+        self.global_env.set("memoize", _memoize)
+        self.global_env.set("memo_stats", _memo_stats)
+        def _sleep(seconds):
+            def body():
+                yield utasks.Sleep(seconds)
+            return utasks.AsyncCall(body)
+        def _gather(items):
+            def body():
+                return UnikList((yield utasks.Gather(list(items))))
+            return utasks.AsyncCall(body)
+        self.global_env.set("spawn", lambda x, name=None: self.sched.spawn(x, name or getattr(x, "name", None)))
+        self.global_env.set("cancel", lambda h: h.cancel())
+        self.global_env.set("timeout", lambda x, seconds: utasks.Timeout(x, seconds))
+        self.global_env.set("sleep", _sleep)
+        self.global_env.set("gather", _gather)
+        self.global_env.set("task_limit", lambda n: self.sched.set_limit(n))
+        self.global_env.set("ai_stats", lambda: self.ai_cache.stats())
+        self.global_env.set("open_file", lambda path, encoding="utf-8": fileio.TextFile(path, encoding, UnikList, Stream))
+        self.global_env.set("file_writer", lambda path, append=False: self.track(fileio.FileWriter(path, append)))
+
+    def register_hof_builtins(self):
+        # Higher-order builtins. A key function runs exactly once per element
+        # (decorate-sort-undecorate); ordering, grouping and selection then happen
+        # in C over the precomputed keys.
+        def keys_of(fn, seq):
+            arr = _as_array(seq)
+            vf = vectorize_fn(fn) if arr is not None else None
+            if vf is not None:
+                try:
+                    with _list_errstate(seq, arr):
+                        return vf(arr, isinstance(seq, UnikList)).tolist()
+                except (_NotVectorizable, FloatingPointError):
+                    pass
+            call = self.call_fn
+            return [call(fn, [v]) for v in seq]
+        def materialize(seq):
+            return seq if isinstance(seq, (UnikList, UnikVector)) else UnikList(seq)
+        def _sort(seq, key=None, desc=False):
+            if key is not None:
+                key, seq = _fn_and_data(key, seq)   # sort(fn, xs)
+            if key is not None and not _is_unik_callable(key):
+                key, desc = None, key   # sort(xs, true)
+            if key is None:
+                return UnikList(sorted(seq, reverse=bool(desc)))
+            return _sort_by(seq, key, desc)
+        def _sort_by(a, b, desc=False):
+            fn, seq = _fn_and_data(a, b)
+            seq = materialize(seq)
+            keys = keys_of(fn, seq)
+            order = sorted(range(len(keys)), key=keys.__getitem__, reverse=bool(desc))
+            return UnikList([seq[i] for i in order])
+        def _group_by(a, b):
+            fn, seq = _fn_and_data(a, b)
+            seq = materialize(seq)
+            groups = {}
+            for k, v in zip(keys_of(fn, seq), seq):
+                g = groups.get(k)
+                if g is None:
+                    groups[k] = g = UnikList()
+                g.append(v)
+            return groups
+        def _by(pick):
+            def by(a, b):
+                fn, seq = _fn_and_data(a, b)
+                seq = materialize(seq)
+                if not len(seq):
+                    return None
+                keys = keys_of(fn, seq)
+                return seq[pick(range(len(keys)), key=keys.__getitem__)]
+            return by
+        def _zip(*seqs):
+            rows = (UnikList(t) for t in zip(*seqs))
+            return Stream(rows) if any(isinstance(q, Stream) for q in seqs) else UnikList(rows)
+        def _enumerate(seq, start=0):
+            rows = (UnikList(t) for t in enumerate(seq, start))
+            return Stream(rows) if isinstance(seq, Stream) else UnikList(rows)
+        def _unique(a, b=None):
+            fn, seq = _fn_and_data(a, b) if b is not None else (None, a)
+            def gen():
+                seen, seen_list = set(), []
+                for v in seq:
+                    k = self.call_fn(fn, [v]) if fn is not None else v
+                    try:
+                        if k in seen:
+                            continue
+                        seen.add(k)
+                    except TypeError:  # unhashable key: linear check
+                        if k in seen_list:
+                            continue
+                        seen_list.append(k)
+                    yield v
+            if isinstance(seq, Stream):
+                return Stream(gen())
+            if fn is None and isinstance(seq, UnikList) and type(seq.items) is array:
+                return UnikList(dict.fromkeys(seq.items))
+            return UnikList(gen())
+        def _chunk(a, b):
+            seq, n = (a, b) if isinstance(b, int) else (b, a)
+            it = iter(seq)
+            rows = iter(lambda: UnikList(itertools.islice(it, n)), UnikList())
+            return Stream(rows) if isinstance(seq, Stream) else UnikList(rows)
+        for name, fn in (("sort", _sort), ("sort_by", _sort_by), ("group_by", _group_by),
+                         ("min_by", _by(min)), ("max_by", _by(max)), ("zip", _zip),
+                         ("enumerate", _enumerate), ("unique", _unique), ("chunk", _chunk)):
+            self.global_env.set(name, fn)
+        for fn in (_enumerate, _unique, _chunk):
+            fn.streaming = True
+
+    def track(self, writer):
+        if len(self.writers) >= 64:
+            self.writers = [w for w in self.writers if not w.closed]
+        self.writers.append(writer)
+        return writer
+
+    def close_writers(self, failed=False):
+        # end of run: commit what scripts left open, or drop it if the run raised
+        writers, self.writers = self.writers, []
+        for w in writers:
+            if w.closed:
+                continue
+            if failed and hasattr(w, "abort"):
+                w.abort()
+            else:
+                w.close()
+
+    def ask(self, prompt):
+        if self.stdin is not None:
+            uout.write(prompt)
+            uout.flush()
+            answer = self.stdin.readline()
+        else:
+            uout.flush()
+            answer = input(prompt)
+        runcache.note_input(answer)
+        return answer
+
+    def call_fn(self, fn, args):
+        if isinstance(fn, (UnikFunction, UnikClass, BoundMethod)):
+            return fn.call(args, self)
+        return fn(*args)
 
     def run(self, nodes):
+        if has_suspend(nodes):
+            # top-level `wait` / `await` / `run`: the program itself becomes a task
+            return self.sched.run(self.exec_async(nodes, self.global_env))
         result = None
         for n in nodes:
             result = self.eval_node(n)
@@ -681,67 +2266,99 @@ class Interpreter:
         # ----------------------------
         if isinstance(node, Number): return node.value
         if isinstance(node, String): return node.value
+        if isinstance(node, Template):
+            ev = self.eval_node_in_env
+            out = []
+            for p in node.parts:
+                if p.__class__ is str: out.append(p)
+                elif p.__class__ is tuple: out.append(format(ev(p[0], env), p[1]))
+                else: out.append(str(ev(p, env)))
+            return "".join(out)
         if isinstance(node, Boolean): return node.value
-        if isinstance(node, Var): return env.get(node.name)
+        if isinstance(node, Var):
+            v = env.get(node.name)
+            return v.str() if type(v) is _StrAccum else v
         if isinstance(node, Assign):
+            if node.append:
+                acc = env.get(node.name)
+                if type(acc) is _StrAccum:
+                    size = acc.size
+                    rs = [self.eval_node_in_env(p, env) for p in node.append]
+                    if acc.size == size and env.get(node.name) is acc:
+                        acc.add(*rs)
+                        return None
+                    # a right-hand side rebound or grew the name; plain `+` read
+                    # the left operand before that happened
+                    val = acc.str()[:size]
+                    for r in rs:
+                        val = self.apply_op("+", val, r)
+                    env.assign(node.name, val)
+                    return val
             val = self.eval_node_in_env(node.expr, env)
-            env.set(node.name, val)
+            env.assign(node.name, val)
             return val
         if isinstance(node, BinOp):
+            if node.op == "|>":
+                return self.eval_pipe(node, env)
             l = self.eval_node_in_env(node.left, env)
             r = self.eval_node_in_env(node.right, env)
             return self.apply_op(node.op, l, r)
         if isinstance(node, Print):
-            v = self.eval_node_in_env(node.expr, env)
-            print(v)
+            v = self.concat(node.parts, env) if node.parts else self.eval_node_in_env(node.expr, env)
+            uout.line(v if type(v) is str else str(v))
             return v
         if isinstance(node, Input):
-            if node.prompt:
-                prompt_val = self.eval_node_in_env(node.prompt, env)
-                return input(str(prompt_val))
-            return input()
+            return self.ask(str(self.eval_node_in_env(node.prompt, env)) if node.prompt else "")
+        if isinstance(node, FileIn):
+            return fileio.TextFile(self.eval_node_in_env(node.path, env), "utf-8", UnikList, Stream)
+        if isinstance(node, FileOut):
+            path = self.eval_node_in_env(node.path, env)
+            v = self.concat(node.parts, env) if node.parts else self.eval_node_in_env(node.expr, env)
+            return fileio.write_file(path, v, node.append)
+        if isinstance(node, Lambda):
+            return UnikFunction(node.defnode, env)
+        if isinstance(node, Index):
+            return self.eval_node_in_env(node.obj, env)[self.eval_node_in_env(node.index, env)]
         if isinstance(node, FuncDef):
             func = UnikFunction(node, env)
             env.set(node.name, func)
             return func
         if isinstance(node, FuncCall):
             callee = node.callee
+            args = [self.eval_node_in_env(a, env) for a in node.args]
             if isinstance(callee, Var):
                 fn = env.get(callee.name)
-                if callable(fn) and not isinstance(fn, UnikFunction):
-                    args = [self.eval_node_in_env(a, env) for a in node.args]
+                if isinstance(fn, (UnikFunction, UnikClass, BoundMethod)):
+                    return fn.call(args, self)
+                if callable(fn):
                     return fn(*args)
-                if isinstance(fn, UnikFunction):
-                    return fn.call(node.args, self)
                 raise TypeError(f"{callee.name} is not callable")
             elif isinstance(callee, AttrAccess):
                 obj = self.eval_node_in_env(callee.obj, env)
-                if isinstance(obj, UnikObject):
-                    meth = obj.get_attr(callee.attr)
-                    if isinstance(meth, UnikFunction):
-                        return meth.call(node.args, self)
-                    if callable(meth):
-                        args = [self.eval_node_in_env(a, env) for a in node.args]
-                        return meth(*args)
+                kind, slot = self.lookup_attr(callee.ic, obj)
+                if kind == InlineCache.METHOD:
+                    return slot.call(args, self, this=obj)
+                meth = self.read_attr(kind, slot, obj, callee.attr)
+                if isinstance(meth, (UnikFunction, UnikClass, BoundMethod)):
+                    return meth.call(args, self)
+                if callable(meth):
+                    return meth(*args)
                 raise TypeError("Attribute not callable")
             else:
-                raise TypeError("Unsupported callee type")
+                return self.call_fn(self.eval_node_in_env(callee, env), args)
         if isinstance(node, ClassDef):
-            methods, fields = {}, {}
+            methods, fields, factories = {}, {}, {}
             for mem in node.body:
                 if isinstance(mem, FuncDef):
                     methods[mem.name] = UnikFunction(mem, self.global_env)
                 elif isinstance(mem, Assign):
-                    fields[mem.name] = self.eval_node_in_env(mem.expr, self.global_env)
-            def class_factory(*args):
-                obj = UnikObject(node.name, fields.copy(), methods.copy())
-                if "init" in obj.methods:
-                    init_fn = obj.methods["init"]
-                    local = Env(self.global_env)
-                    local.set("self", obj)
-                    init_fn.call([a for a in args], self)
-                return obj
-            env.set(node.name, class_factory)
+                    v = fields[mem.name] = self.eval_node_in_env(mem.expr, self.global_env)
+                    if not isinstance(v, _SHARED_DEFAULTS):
+                        factories[mem.name] = mem.expr
+            parent = env.get(node.parent) if node.parent else None
+            if parent is not None and not isinstance(parent, UnikClass):
+                raise TypeError(f"{node.parent} is not a class")
+            env.set(node.name, UnikClass(node.name, methods, fields, parent, factories))
             return node
         if isinstance(node, If):
             cond = self.eval_node_in_env(node.cond, env)
@@ -754,67 +2371,266 @@ class Interpreter:
         # Loop & Repeat nodes
         # ----------------------------
         if isinstance(node, ForLoop):
-            if node.foreach:
-                iterable = self.eval_node_in_env(node.start, env)
-                for item in iterable:
+            opened = self.open_accums(node.accums, env) if node.accums else None
+            try:
+                for item in self.loop_values(node, env):
                     env.set(node.var, item)
-                    for stmt in node.body:
-                        self.eval_node_in_env(stmt, Env(env))
-            else:
-                start = self.eval_node_in_env(node.start, env)
-                end = self.eval_node_in_env(node.end, env)
-                step = self.eval_node_in_env(node.step, env) if node.step else 1
-                i = start
-                while i <= end:
-                    env.set(node.var, i)
-                    for stmt in node.body:
-                        self.eval_node_in_env(stmt, Env(env))
-                    i += step
+                    self.run_block(node.body, Env(env))
+            except BreakSignal:
+                pass
+            finally:
+                if opened: self.close_accums(opened)
             return None
 
         if isinstance(node, Repeat):
-            while self.eval_node_in_env(node.cond, env):
-                self.run_block(node.body, Env(env))
+            opened = self.open_accums(node.accums, env) if node.accums else None
+            try:
+                while self.eval_node_in_env(node.cond, env):
+                    self.run_block(node.body, Env(env))
+            except BreakSignal:
+                pass
+            finally:
+                if opened: self.close_accums(opened)
             return None
+        if isinstance(node, Return):
+            raise ReturnSignal(self.eval_node_in_env(node.val, env) if node.val is not None else None)
+        if isinstance(node, Break):
+            raise BreakSignal()
+        if isinstance(node, Yield):
+            raise SyntaxError("yield outside a function")
 
         # ----------------------------
         # Literals / Attributes / AI stub
         # ----------------------------
         if isinstance(node, ListLiteral):
-            return [self.eval_node_in_env(it, env) for it in node.items]
+            return UnikList([self.eval_node_in_env(it, env) for it in node.items])
         if isinstance(node, DictLiteral):
             return {self.eval_node_in_env(k, env): self.eval_node_in_env(v, env) for k, v in node.pairs}
         if isinstance(node, AttrAccess):
             base = self.eval_node_in_env(node.obj, env)
-            if isinstance(base, UnikObject):
-                return base.get_attr(node.attr)
-            if isinstance(base, dict):
-                return base.get(node.attr)
-            raise AttributeError("Attribute access on non-object")
-        if isinstance(node, AI):
-            prompt = node.prompt
-            key = f"ai_{abs(hash(prompt))}"
-            cache_path = os.path.join(self.cache_dir, key + ".unik")
-            if os.path.exists(cache_path):
-                with open(cache_path,'r',encoding='utf8') as f: gen=f.read()
+            kind, slot = self.lookup_attr(node.ic, base)
+            return self.read_attr(kind, slot, base, node.attr)
+        if isinstance(node, SetIndex):
+            container = self.eval_node_in_env(node.obj, env)
+            idx = self.eval_node_in_env(node.index, env)
+            val = self.eval_node_in_env(node.expr, env)
+            container[idx] = val
+            return val
+        if isinstance(node, SetAttr):
+            base = self.eval_node_in_env(node.obj, env)
+            val = self.eval_node_in_env(node.expr, env)
+            if isinstance(base, (UnikObject, EntityHandle)):
+                base.set_attr(node.attr, val)
+            elif isinstance(base, dict):
+                base[node.attr] = val
             else:
-                low = prompt.lower()
-                if "add" in low and "function" in low:
-                    gen = 'func add(a, b) -> a + b\ngive add(x, y)\n'
-                else:
-                    gen = f'# AI GENERATED (stub): {prompt}\n'
-                with open(cache_path,'w',encoding='utf8') as f:
-                    f.write(gen)
-            lex = Lexer(gen)
-            toks = lex.tokenize(gen)
-            parsed = Parser(toks).parse()
-            return self.run(parsed)
+                raise AttributeError("Attribute assignment on non-object")
+            return val
+        if isinstance(node, (Wait, AwaitExpr, RunTasks)):
+            # reached from synchronous code: run just this step on the scheduler
+            return self.sched.run(self._async_block([node], env))
+        if isinstance(node, TaskDef):
+            t = UnikTask(node.name, node.body, env, self)
+            env.set(node.name, t)
+            return t
+        if isinstance(node, Expanded):
+            # same scope as a live aik block: the generated program runs globally
+            return self.run(node.body)
+        if isinstance(node, AI):
+            if self.ai_locked:
+                raise RuntimeError(f"aik block '{node.prompt}' is not in the build; run main.py --build first")
+            runcache.taint("aik")
+            prog = self.ai_cache.program(node.prompt, self.ai_backend.name, self.ai_source, parse_source)
+            return self.run(prog)
 
         raise TypeError(f"Unimplemented node exec: {node}")
 
+    def prefetch_ai(self, ast):
+        """Start generating every uncached aik prompt of `ast` in concurrent batches."""
+        name = self.ai_backend.name
+        todo = [p for p in ai_prompts(ast) if not self.ai_cache.has(prompt_key(p, name))]
+        if not todo:
+            return
+        if self.ai_prefetch is None:
+            store = lambda p, src: self.ai_cache.store(prompt_key(p, name), src)
+            self.ai_prefetch = aigen.Prefetcher(self.ai_backend, on_done=store)
+        self.ai_prefetch.submit(todo)
+
+    def ai_source(self, prompt):
+        if self.ai_prefetch is not None:
+            return self.ai_prefetch.get(prompt)
+        return self.ai_backend.generate(prompt)
+
+    def loop_values(self, node, env):
+        if node.foreach:
+            return iter(self.eval_node_in_env(node.start, env))
+        start = self.eval_node_in_env(node.start, env)
+        end = self.eval_node_in_env(node.end, env)
+        step = self.eval_node_in_env(node.step, env) if node.step else 1
+        return self._range_values(start, end, step)
+
+    @staticmethod
+    def _range_values(i, end, step):
+        while i <= end:
+            yield i
+            i += step
+
+    def exec_gen(self, block, env):
+        """Run a generator body as a Python generator.
+
+        Statements that can reach a `yield` are walked here so the Python frame can
+        suspend between items; everything else goes to eval_node_in_env. No threads.
+        """
+        try:
+            yield from self._gen_block(block, env)
+        except ReturnSignal:
+            return
+
+    def _gen_block(self, block, env):
+        for st in block:
+            if isinstance(st, Yield):
+                yield self.eval_node_in_env(st.expr, env)
+            elif isinstance(st, If) and (contains_yield(st.body) or contains_yield(st.orelse)):
+                branch = st.body if self.eval_node_in_env(st.cond, env) else st.orelse
+                yield from self._gen_block(branch, Env(env))
+            elif isinstance(st, ForLoop) and contains_yield(st.body):
+                try:
+                    for item in self.loop_values(st, env):
+                        env.set(st.var, item)
+                        yield from self._gen_block(st.body, Env(env))
+                except BreakSignal:
+                    pass
+            elif isinstance(st, Repeat) and contains_yield(st.body):
+                try:
+                    while self.eval_node_in_env(st.cond, env):
+                        yield from self._gen_block(st.body, Env(env))
+                except BreakSignal:
+                    pass
+            else:
+                self.eval_node_in_env(st, env)
+
+    def exec_async(self, block, env):
+        """Run a task / async function body as a generator of scheduler requests.
+
+        Like exec_gen: statements that can reach `wait`, `await` or `run` are walked
+        here so the body can suspend there; everything else runs synchronously.
+        """
+        try:
+            return (yield from self._async_block(block, env))
+        except ReturnSignal as r:
+            return r.value
+
+    def _async_block(self, block, env):
+        ev, res = self.eval_node_in_env, None
+        for st in block:
+            if isinstance(st, Wait):
+                yield utasks.Sleep(ev(st.expr, env) * WAIT_UNITS[st.unit])
+                res = None
+            elif isinstance(st, RunTasks):
+                res = UnikList((yield utasks.Gather([ev(t, env) for t in st.targets])))
+            elif isinstance(st, AwaitExpr):
+                res = yield utasks.Await(ev(st.expr, env))
+            elif isinstance(st, Assign) and isinstance(st.expr, AwaitExpr):
+                res = yield utasks.Await(ev(st.expr.expr, env))
+                env.assign(st.name, res)
+            elif isinstance(st, Input) or isinstance(st, Assign) and isinstance(st.expr, Input):
+                # `ask` blocks on stdin: read it off the loop so other tasks keep running
+                node = st if isinstance(st, Input) else st.expr
+                prompt = str(ev(node.prompt, env)) if node.prompt else ""
+                res = yield utasks.Blocking(lambda: self.ask(prompt))
+                if node is not st:
+                    env.assign(st.name, res)
+            elif isinstance(st, Return) and isinstance(st.val, AwaitExpr):
+                raise ReturnSignal((yield utasks.Await(ev(st.val.expr, env))))
+            elif isinstance(st, Print) and isinstance(st.expr, AwaitExpr):
+                res = yield utasks.Await(ev(st.expr.expr, env))
+                uout.line(res if type(res) is str else str(res))
+            elif isinstance(st, If) and (has_suspend(st.body) or has_suspend(st.orelse)):
+                branch = st.body if ev(st.cond, env) else st.orelse
+                res = yield from self._async_block(branch, Env(env))
+            elif isinstance(st, ForLoop) and has_suspend(st.body):
+                try:
+                    for item in self.loop_values(st, env):
+                        env.set(st.var, item)
+                        yield from self._async_block(st.body, Env(env))
+                except BreakSignal:
+                    pass
+                res = None
+            elif isinstance(st, Repeat) and has_suspend(st.body):
+                try:
+                    while ev(st.cond, env):
+                        yield from self._async_block(st.body, Env(env))
+                except BreakSignal:
+                    pass
+                res = None
+            else:
+                res = ev(st, env)
+        return res
+
+    def eval_pipe(self, node, env):
+        # `data |> f(a, b)` calls f(data, a, b); `data |> f` calls f(data)
+        data = self.eval_node_in_env(node.left, env)
+        stage = node.right
+        if isinstance(stage, FuncCall):
+            fn = self.eval_node_in_env(stage.callee, env)
+            args = [self.eval_node_in_env(a, env) for a in stage.args]
+        else:
+            fn = self.eval_node_in_env(stage, env)
+            args = []
+        if getattr(fn, "streaming", False) and type(data) is not Stream and (
+                isinstance(data, (UnikList, list, tuple, str, fileio.TextFile)) or hasattr(data, "__next__")):
+            data = Stream(iter(data))
+        return self.call_fn(fn, [data] + args)
+
+    # ----------------------------
+    # Attribute access (inline-cached)
+    # ----------------------------
+    def lookup_attr(self, ic, base):
+        t = type(base)
+        key = base.shape if t is UnikObject or t is EntityHandle else t
+        return ic.lookup(key) or ic.resolve(key)
+
+    def read_attr(self, kind, slot, base, attr):
+        if kind == InlineCache.FIELD: return base.values[slot]
+        if kind == InlineCache.COLUMN: return base.store.columns[slot][base.index]
+        if kind == InlineCache.METHOD: return BoundMethod(base, slot)
+        if kind == InlineCache.NATIVE: return getattr(base, attr)
+        return base.get(attr)
+
     # ----------------------------
     # Operators
     # ----------------------------
+    def open_accums(self, names, env):
+        # swap each string grown by `s = s + x` in the loop for an in-place builder
+        opened = []
+        for name in names:
+            e = env
+            while e is not None and name not in e.map:
+                e = e.parent
+            if e is not None and type(e.map[name]) is str:
+                acc = e.map[name] = _StrAccum(e.map[name])
+                opened.append((e, name, acc))
+        return opened
+
+    def close_accums(self, opened):
+        for e, name, acc in opened:
+            if e.map.get(name) is acc:
+                e.map[name] = acc.str()
+
+    def concat(self, parts, env):
+        # left fold of `+` (as `give a, b, c` means) that turns into a single join
+        # as soon as the running value is a string
+        ev = self.eval_node_in_env
+        acc = ev(parts[0], env)
+        for i in range(1, len(parts)):
+            r = ev(parts[i], env)
+            if isinstance(acc, str) or isinstance(r, str):
+                out = [str(acc), str(r)]
+                out.extend(str(ev(p, env)) for p in parts[i + 1:])
+                return "".join(out)
+            acc = self.apply_op("+", acc, r)
+        return acc
+
     def apply_op(self, op, l, r):
         if op == "+": return str(l) + str(r) if isinstance(l, str) or isinstance(r, str) else l + r
         if op == "-": return l - r
@@ -827,8 +2643,14 @@ class Interpreter:
         if op == "<=": return l <= r
         if op == ">": return l > r
         if op == ">=": return l >= r
-        if op == "&&": return bool(l) and bool(r)
-        if op == "||": return bool(l) or bool(r)
+        if op == "&&":
+            if isinstance(l, UnikVector) or isinstance(r, UnikVector):
+                return UnikVector(np.logical_and(getattr(l, "data", l), getattr(r, "data", r)))
+            return bool(l) and bool(r)
+        if op == "||":
+            if isinstance(l, UnikVector) or isinstance(r, UnikVector):
+                return UnikVector(np.logical_or(getattr(l, "data", l), getattr(r, "data", r)))
+            return bool(l) or bool(r)
         if op == "|>":
             if isinstance(r, Var):
                 fn = self.global_env.get(r.name)
@@ -840,21 +2662,160 @@ class Interpreter:
 # ----------------------------
 # REPL & runner
 # ----------------------------
-def run_file(path):
+def source_digest(toks):
+    return runcache.hash_tokens(hashlib.sha256(), toks).hexdigest()
+
+AIK_DEPTH = 8   # generated code may itself contain aik blocks, up to this deep
+
+def expand_ai(v, resolve, depth=0):
+    # replace every AI node under `v` by an Expanded node holding its parsed program
+    if isinstance(v, AI):
+        if depth >= AIK_DEPTH:
+            raise RuntimeError(f"aik expansion deeper than {AIK_DEPTH} levels at '{v.prompt}'")
+        return Expanded(v.prompt, expand_ai(resolve(v.prompt), resolve, depth + 1))
+    if isinstance(v, list):
+        v[:] = [expand_ai(x, resolve, depth) for x in v]
+    elif isinstance(v, tuple):
+        return tuple(expand_ai(x, resolve, depth) for x in v)
+    elif isinstance(v, Node):
+        for k, x in list(vars(v).items()):
+            if isinstance(x, (Node, list, tuple)):
+                setattr(v, k, expand_ai(x, resolve, depth))
+    return v
+
+BUILD_FORMAT = 1    # bump when the AST classes or the build / lock layout change
+
+def build_paths(path):
+    return path + "c", path + ".lock"
+
+def build_file(path):
+    """Resolve every aik block of `path` once and save the expanded program.
+
+    Writes <path>c (the expanded AST and the code each prompt produced) and
+    <path>.lock (format, source digest, generator, and the digest of the code
+    behind every prompt). A run whose source still matches the lock loads the
+    AST and never generates code.
+    """
+    with open(path, 'r', encoding='utf8') as f:
+        code = f.read()
+    toks = Lexer(code).tokenize(code)
+    ast = Parser(toks).parse()
+    interp = Interpreter()
+    interp.prefetch_ai(ast)
+    cache, name, lock, sources = interp.ai_cache, interp.ai_backend.name, {}, {}
+    def resolve(prompt):
+        key = prompt_key(prompt, name)
+        src = cache.load(key)
+        if src is None:
+            src = interp.ai_source(prompt)
+            cache.store(key, src)
+        sources[key] = src
+        lock[key] = code_digest(src)
+        return parse_source(src)
+    try:
+        expand_ai(ast, resolve)
+    finally:
+        if interp.ai_prefetch is not None:
+            interp.ai_prefetch.close()
+    digest = source_digest(toks)
+    out_path, lock_path = build_paths(path)
+    with open(out_path + ".tmp", "wb") as f:
+        pickle.dump({"format": BUILD_FORMAT, "source": digest, "aik": sources, "ast": ast},
+                    f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(out_path + ".tmp", out_path)
+    with open(lock_path + ".tmp", "w", encoding="utf8") as f:
+        json.dump({"format": BUILD_FORMAT, "source": digest, "generator": name,
+                   "aik": dict(sorted(lock.items()))}, f, indent=2)
+        f.write("\n")
+    os.replace(lock_path + ".tmp", lock_path)
+    return len(lock)
+
+def code_digest(src):
+    return hashlib.sha256(src.encode("utf-8")).hexdigest()
+
+class _BuildUnpickler(pickle.Unpickler):
+    # `main.py --build` pickles the AST classes as __main__.X; resolve them in this
+    # module however it was loaded (script or `import main`)
+    def find_class(self, module, name):
+        if module in ("__main__", __name__):
+            return globals()[name]
+        return super().find_class(module, name)
+
+def load_build(path, toks):
+    # the expanded AST, if a build exists and the lock matches this source
+    out_path, lock_path = build_paths(path)
+    try:
+        with open(lock_path, encoding="utf8") as f:
+            lock = json.load(f)
+        with open(out_path, "rb") as f:
+            built = _BuildUnpickler(f).load()
+    except Exception:
+        return None     # missing, unreadable, or written by another runtime: no build
+    if not isinstance(lock, dict) or not isinstance(built, dict):
+        return None
+    if lock.get("format") != BUILD_FORMAT or built.get("format") != BUILD_FORMAT:
+        return None
+    digest = source_digest(toks)
+    if lock.get("source") != digest or built.get("source") != digest:
+        return None
+    # the code inside the build must be exactly the code the lock pins
+    pinned, sources = lock.get("aik"), built.get("aik")
+    if not isinstance(pinned, dict) or not isinstance(sources, dict) or pinned.keys() != sources.keys():
+        return None
+    if any(code_digest(src) != pinned[key] for key, src in sources.items()):
+        return None
+    return built["ast"]
+
+def run_file(path, args=(), cache=False, locked=False):
     with open(path,'r',encoding='utf8') as f:
         code = f.read()
     lx = Lexer(code)
     toks = lx.tokenize(code)
-    ast = Parser(toks).parse()
+    if cache:
+        # replay a recorded run whose inputs are unchanged, else record this one
+        store, feed = runcache.RunCache(), runcache.LineFeed()
+        key = runcache.run_key(toks, args)
+        rec = store.lookup(key, feed)
+        if rec is not None:
+            store.replay(rec, uout)
+            uout.flush()
+            return
+        trace = runcache.current = runcache.Trace()
+        uout.tap = trace.capture
+    ast = load_build(path, toks)
+    if ast is None:
+        if locked:
+            raise RuntimeError(f"{path}: no build matching this source; run main.py --build {path}")
+        ast = Parser(toks).parse()
     interp = Interpreter()
-    interp.run(ast)
+    interp.ai_locked = locked
+    interp.global_env.set("args", UnikList(list(args)))
+    interp.prefetch_ai(ast)
+    if cache:
+        interp.stdin = feed
+    failed = True
+    try:
+        interp.run(ast)
+        interp.sched.finish()       # the program ends when the tasks it spawned do
+        failed = False
+    finally:
+        interp.sched.shutdown()     # after an error: cancel what is still running
+        interp.close_writers(failed)
+        if interp.ai_prefetch is not None:
+            interp.ai_prefetch.close()
+        uout.flush()    # program output lands before any traceback
+        if cache:
+            uout.tap = runcache.current = None
+    if cache:
+        store.store(key, trace)
 
 def repl():
     interp = Interpreter()
-    print("Welcome to Unik REPL (single-file runtime). Type 'exit' or '.exit' to quit. .load <file>")
+    uout.line("Welcome to Unik REPL (single-file runtime). Type 'exit' or '.exit' to quit. .load <file>")
     buffer = ""
     while True:
         try:
+            uout.flush()
             line = input("unik> ")
         except EOFError:
             break
@@ -866,11 +2827,11 @@ def repl():
             if len(parts) == 2:
                 filename = parts[1].strip()
                 if not os.path.exists(filename):
-                    print(f"[Error] File '{filename}' not found")
+                    uout.line(f"[Error] File '{filename}' not found")
                     continue
                 run_file(filename)
             else:
-                print("Usage: .load <filename>")
+                uout.line("Usage: .load <filename>")
             continue
         # allow entering multiple statements separated by ';'
         try:
@@ -880,10 +2841,18 @@ def repl():
             ast = Parser(toks).parse()
             res = interp.run(ast)
         except Exception as e:
-            print(f"[Error] {e}")
+            uout.line(f"[Error] {e}")
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        run_file(sys.argv[1])
+    # main.py [--cache] [--locked] script.unik args...  |  main.py --build script.unik
+    argv = sys.argv[1:]
+    flags = set()
+    while argv and argv[0] in ("--cache", "--locked", "--build"):
+        flags.add(argv.pop(0))
+    if argv and "--build" in flags:
+        n = build_file(argv[0])
+        print(f"built {argv[0]}: {n} aik prompt(s) expanded -> {build_paths(argv[0])[0]}")
+    elif argv:
+        run_file(argv[0], argv[1:], "--cache" in flags, "--locked" in flags)
     else:
         repl()
@@ -0,0 +1,135 @@
+# src/stdlib/aicache.py
+# Cache for code generated by `aik` blocks:
+#   prompt_key - stable digest of the normalized prompt plus a context string (the
+#                generator's identity), the same in every process
+#   AICache    - generated source on disk (<key>.unik, capped at `max_bytes`, least
+#                recently used files evicted first) and an in-memory LRU of parsed
+#                programs, so an `aik` inside a loop is lexed and parsed once
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+MAX_BYTES = 64 << 20
+LRU_SIZE = 256
+
+
+def normalize(prompt):
+    # whitespace and line-ending differences do not change what is asked for
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+def prompt_key(prompt, context=""):
+    h = hashlib.sha256()
+    h.update(context.encode("utf-8"))
+    h.update(b"\x00")
+    h.update(normalize(prompt).encode("utf-8"))
+    return h.hexdigest()
+
+
+class AICache:
+    def __init__(self, root, max_bytes=MAX_BYTES, lru_size=LRU_SIZE):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.lru_size = lru_size
+        self.parsed = OrderedDict()     # key -> parsed program
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        self._bytes = None              # on-disk total, scanned on first write
+        self.lock = threading.Lock()    # prefetch threads store results too
+
+    def _path(self, key):
+        return os.path.join(self.root, key + ".unik")
+
+    def program(self, prompt, context, generate, parse):
+        """Parsed program for `prompt`: memory, then disk, then `generate(prompt)`."""
+        key = prompt_key(prompt, context)
+        prog = self.parsed.get(key)
+        if prog is not None:
+            self.hits += 1
+            self.parsed.move_to_end(key)
+            return prog
+        src = self.load(key)
+        if src is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            src = generate(prompt)
+            self.store(key, src)
+        prog = parse(src)
+        self.parsed[key] = prog
+        if len(self.parsed) > self.lru_size:
+            self.parsed.popitem(last=False)
+        return prog
+
+    # -------------------------
+    # DISK
+    # -------------------------
+    def load(self, key):
+        p = self._path(key)
+        try:
+            with open(p, "r", encoding="utf-8") as f:
+                src = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(p)                 # mtime doubles as the eviction clock
+        except OSError:
+            pass
+        return src
+
+    def store(self, key, src):
+        p = self._path(key)
+        with self.lock:
+            if not os.path.exists(p):   # a key names one generation; keep the first
+                self._store(p, src)
+
+    def _store(self, p, src):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{p}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(src)
+        os.replace(tmp, p)              # readers in other processes see all or nothing
+        if self._bytes is None:
+            self._bytes = self._scan_size()
+        else:
+            self._bytes += os.path.getsize(p)
+        if self._bytes > self.max_bytes:
+            self.evict(keep=p)
+
+    def has(self, key):
+        return key in self.parsed or os.path.exists(self._path(key))
+
+    def _entries(self):
+        out = []
+        for e in os.scandir(self.root):
+            if e.name.endswith(".unik") and e.is_file():
+                st = e.stat()
+                out.append((st.st_mtime, st.st_size, e.path))
+        return out
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, keep=None):
+        """Drop least recently used files until the cache is under 90% of its cap."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 9 // 10
+        for _, size, path in entries:
+            if total <= target:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._bytes = total
+
+    def stats(self):
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "evictions": self.evictions, "parsed": len(self.parsed)}
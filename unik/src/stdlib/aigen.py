@@ -0,0 +1,206 @@
+# src/stdlib/aigen.py
+# Code generation backends for `aik`:
+#   Backend      - interface: generate(prompt) -> source, generate_many(prompts);
+#                  `name` identifies the generator in cache keys
+#   StubBackend  - the built-in offline generator
+#   HTTPBackend  - JSON over HTTP/1.1 with a pool of keep-alive connections;
+#                  POST /generate {"prompt"} -> {"code"}, POST /batch {"prompts"} -> {"codes"}
+#   serve        - local stand-in server speaking that protocol (tests, demos)
+#   Prefetcher   - sends every prompt of a program off in concurrent batches right
+#                  after parsing; `get` blocks on just the prompt asked for
+# The backend comes from UNIK_AI_URL (unset: the stub); see backend_from_env.
+
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+BATCH_SIZE = 8
+WORKERS = 8
+
+
+class Backend:
+    name = "backend"
+
+    def generate(self, prompt):
+        raise NotImplementedError
+
+    def generate_many(self, prompts):
+        return [self.generate(p) for p in prompts]
+
+    def close(self):
+        pass
+
+
+class StubBackend(Backend):
+    name = "stub/1"
+
+    def generate(self, prompt):
+        low = prompt.lower()
+        if "add" in low and "function" in low:
+            return 'func add(a, b) -> a + b\ngive add(x, y)\n'
+        return f'# AI GENERATED (stub): {prompt}\n'
+
+
+class HTTPBackend(Backend):
+    def __init__(self, url, pool_size=WORKERS, timeout=120):
+        u = urlsplit(url)
+        self.scheme, self.host, self.port = u.scheme, u.hostname, u.port
+        self.base = u.path.rstrip("/")
+        self.timeout = timeout
+        self.name = f"http/{u.netloc}{self.base}"
+        self.pool = queue.LifoQueue(maxsize=pool_size)   # most recently used: still warm
+
+    def _conn(self):
+        try:
+            return self.pool.get_nowait()
+        except queue.Empty:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            return cls(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, conn):
+        try:
+            self.pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _post(self, path, payload):
+        body = json.dumps(payload).encode("utf-8")
+        for attempt in (0, 1):
+            conn = self._conn()
+            try:
+                conn.request("POST", self.base + path, body, {"Content-Type": "application/json"})
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.HTTPException, ConnectionError):
+                conn.close()
+                if attempt:     # a pooled connection the server had already dropped: retry once
+                    raise
+                continue
+            if resp.status != 200:
+                conn.close()
+                raise RuntimeError(f"aik backend {self.name}: HTTP {resp.status} {data[:200]!r}")
+            self._release(conn)
+            return json.loads(data)
+
+    def generate(self, prompt):
+        return self._post("/generate", {"prompt": prompt})["code"]
+
+    def generate_many(self, prompts):
+        return self._post("/batch", {"prompts": list(prompts)})["codes"]
+
+    def close(self):
+        while True:
+            try:
+                self.pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def backend_from_env():
+    url = os.environ.get("UNIK_AI_URL")
+    return HTTPBackend(url) if url else StubBackend()
+
+
+# -------------------------
+# PREFETCH
+# -------------------------
+class Prefetcher:
+    def __init__(self, backend, batch_size=BATCH_SIZE, workers=WORKERS, on_done=None):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aik")
+        self.futures = {}               # prompt -> Future[str]
+        self.on_done = on_done          # on_done(prompt, source), from a worker thread
+        self.lock = threading.Lock()
+
+    def submit(self, prompts):
+        with self.lock:
+            todo = [p for p in dict.fromkeys(prompts) if p not in self.futures]
+            for p in todo:
+                self.futures[p] = Future()
+        for i in range(0, len(todo), self.batch_size):
+            self.pool.submit(self._run, todo[i:i + self.batch_size])
+
+    def _run(self, batch):
+        try:
+            codes = self.backend.generate_many(batch) if len(batch) > 1 else [self.backend.generate(batch[0])]
+        except BaseException as e:
+            for p in batch:
+                self.futures[p].set_exception(e)
+            return
+        for p, src in zip(batch, codes):
+            if self.on_done is not None:
+                try:
+                    self.on_done(p, src)
+                except Exception:
+                    pass        # caching is best effort; the result still goes out
+            self.futures[p].set_result(src)
+        if len(codes) < len(batch):
+            # a short answer must not leave `get` waiting forever on the rest
+            err = RuntimeError(f"aik backend {self.backend.name}: {len(codes)} codes for {len(batch)} prompts")
+            for p in batch[len(codes):]:
+                self.futures[p].set_exception(err)
+
+    def get(self, prompt):
+        """Source for `prompt`, waiting only for its own batch (submitting it if new)."""
+        fut = self.futures.get(prompt)
+        if fut is None:
+            self.submit([prompt])
+            fut = self.futures[prompt]
+        return fut.result()
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+# -------------------------
+# STAND-IN SERVER
+# -------------------------
+def serve(port=8765, host="127.0.0.1", backend=None, delay=0.0):
+    """Serve `backend` (default: the stub) over the HTTPBackend protocol.
+
+    `delay` seconds are slept per request to stand in for model latency. Returns
+    the server; call serve_forever() on it or run it in a thread.
+    """
+    gen = backend or StubBackend()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive, so client pools are exercised
+
+        def do_POST(self):
+            n = int(self.headers.get("Content-Length", 0))
+            req = json.loads(self.rfile.read(n) or b"{}")
+            if delay:
+                time.sleep(delay)
+            if self.path.endswith("/batch"):
+                out = {"codes": gen.generate_many(req.get("prompts", []))}
+            elif self.path.endswith("/generate"):
+                out = {"code": gen.generate(req.get("prompt", ""))}
+            else:
+                self.send_error(404)
+                return
+            body = json.dumps(out).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+if __name__ == "__main__":
+    import sys
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    print(f"aik stand-in backend on http://127.0.0.1:{port} (delay {delay}s)")
+    serve(port, delay=delay).serve_forever()
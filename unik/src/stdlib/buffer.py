@@ -0,0 +1,170 @@
+# src/stdlib/buffer.py
+# Binary data for Unik:
+#   Bytes      - a memoryview window over bytes (immutable) or a bytearray (mutable
+#                "buffer"); slice() and iteration never copy, only hex/base64/text/
+#                copy() and `+` build new data
+#   pack / unpack / iter_unpack - struct formats read and written in place
+#   read_chunks - a binary file as a stream of chunks filled with readinto into one
+#                reused buffer, so each byte is copied once (kernel -> buffer)
+
+import base64
+import binascii
+import struct
+
+CHUNK = 1 << 20
+
+
+class Bytes:
+    __slots__ = ("mv", "off", "_list")
+    __hash__ = None
+    unik_methods = frozenset({"len", "get", "set", "slice", "fill", "find", "hex", "base64",
+                              "text", "copy", "list", "unpack", "iter_unpack", "pack_into",
+                              "readinto", "write_to", "mutable"})
+
+    def __init__(self, data=b"", list_type=list):
+        off = 0
+        if isinstance(data, Bytes):
+            data, off = data.mv, data.off
+        elif isinstance(data, str):
+            data = data.encode("utf-8")
+        elif isinstance(data, int):
+            data = bytearray(data)      # buffer(n): n zero bytes
+        elif not isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data)          # an iterable of ints
+        self.mv = memoryview(data).cast("B") if isinstance(data, memoryview) else memoryview(data)
+        self.off = off                  # start of this window within self.mv.obj
+        self._list = list_type          # what list()/unpack() hand back
+
+    def _view(self, start, stop):
+        start, stop, _ = slice(start, stop).indices(self.mv.nbytes)
+        out = Bytes.__new__(Bytes)
+        out.mv = self.mv[start:max(start, stop)]
+        out.off = self.off + start
+        out._list = self._list
+        return out
+
+    # -------------------------
+    # ACCESS
+    # -------------------------
+    def len(self): return self.mv.nbytes
+    def mutable(self): return not self.mv.readonly
+
+    def get(self, i): return self.mv[i]
+
+    def set(self, i, v):
+        self.mv[i] = v
+        return self
+
+    def slice(self, start=0, stop=None):
+        """A view of bytes start..stop (end exclusive); shares memory with this value."""
+        return self._view(start, stop)
+
+    def fill(self, v=0, start=0, stop=None):
+        stop = self.mv.nbytes if stop is None else stop
+        self.mv[start:stop] = bytes([v]) * (stop - start)
+        return self
+
+    def find(self, sub, start=0):
+        sub = sub.mv if isinstance(sub, Bytes) else (sub.encode() if isinstance(sub, str) else bytes(sub))
+        base, off = self.mv.obj, self.off
+        if not hasattr(base, "find"):
+            base, off = self.mv.tobytes(), 0
+        # search the underlying object inside this window instead of copying it out
+        i = base.find(sub, off + start, off + self.mv.nbytes)
+        return i - off if i >= 0 else -1
+
+    # -------------------------
+    # CONVERSIONS (these copy)
+    # -------------------------
+    def hex(self, sep=""):
+        return self.mv.hex(sep) if sep else self.mv.hex()
+
+    def base64(self): return base64.b64encode(self.mv).decode("ascii")
+    def text(self, encoding="utf-8", errors="strict"): return str(self.mv, encoding, errors)
+    def copy(self): return Bytes(bytearray(self.mv), self._list)
+    def list(self): return self._list(self.mv.tolist())
+
+    # -------------------------
+    # STRUCT
+    # -------------------------
+    def unpack(self, fmt, offset=0):
+        """Values of struct format `fmt` read at `offset` (no intermediate bytes)."""
+        return self._list(struct.unpack_from(fmt, self.mv, offset))
+
+    def iter_unpack(self, fmt):
+        """Records of `fmt` laid back to back over the whole value."""
+        return struct.iter_unpack(fmt, self.mv)
+
+    def pack_into(self, fmt, offset, *values):
+        struct.pack_into(fmt, self.mv, offset, *values)
+        return self
+
+    # -------------------------
+    # I/O
+    # -------------------------
+    def readinto(self, src, offset=0):
+        """Fill from a binary file (readinto) or socket (recv_into); returns the byte count."""
+        target = self.mv[offset:]
+        if hasattr(src, "readinto"):
+            n = src.readinto(target)
+        else:
+            n = src.recv_into(target)
+        return n or 0
+
+    def write_to(self, dst):
+        return dst.write(self.mv) if hasattr(dst, "write") else dst.sendall(self.mv)
+
+    # -------------------------
+    # PROTOCOL
+    # -------------------------
+    def __len__(self): return self.mv.nbytes
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            if i.step not in (None, 1):
+                raise ValueError("bytes slices must be contiguous")
+            return self._view(i.start, i.stop)
+        return self.mv[i]
+
+    def __setitem__(self, i, v): self.mv[i] = v
+    def __iter__(self): return iter(self.mv)
+    def __buffer__(self, flags): return self.mv     # Python 3.12+: usable wherever bytes are
+
+    def __eq__(self, other):
+        if isinstance(other, Bytes):
+            return self.mv == other.mv
+        return isinstance(other, (bytes, bytearray)) and self.mv == other
+
+    def __add__(self, other):
+        if isinstance(other, str):
+            return NotImplemented
+        return Bytes(bytes(self.mv) + bytes(other.mv if isinstance(other, Bytes) else other), self._list)
+
+    def __repr__(self):
+        head = self.mv[:32].tobytes()
+        more = f"... ({self.mv.nbytes} bytes)" if self.mv.nbytes > 32 else ""
+        kind = "buffer" if not self.mv.readonly else "bytes"
+        return f"{kind}({head!r}{more})"
+
+
+def pack(fmt, *values, list_type=list):
+    return Bytes(struct.pack(fmt, *values), list_type)
+
+
+def from_hex(s, list_type=list): return Bytes(binascii.unhexlify(s.replace(" ", "")), list_type)
+def from_base64(s, list_type=list): return Bytes(base64.b64decode(s), list_type)
+
+
+def read_chunks(path, size=CHUNK, list_type=list):
+    """Yield successive chunks of a binary file.
+
+    All chunks are views of ONE buffer that readinto refills in place: a chunk
+    is only valid until the next one is produced (copy() it to keep it).
+    """
+    buf = Bytes(size, list_type)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = buf.readinto(f)
+            if not n:
+                return
+            yield buf.slice(0, n)
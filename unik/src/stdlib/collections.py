@@ -0,0 +1,457 @@
+# src/stdlib/collections.py
+# Lists, dicts, sets, DSA helpers for Unik:
+#   Heap       - binary heap (heapq), min or max, optional per-item priority
+#   Deque      - double-ended queue with O(1) pushes/pops at both ends (collections.deque)
+#   SortedSet  - ordered set: O(log n) insert/delete/search, inclusive range queries
+#   SortedMap  - ordered dict on the same index as SortedSet
+#   Counter    - multiset/tally (collections.Counter)
+#   Bitset     - packed bits in a bytearray, 1 bit per member
+# All of them are Unik values: scripts call the names in `unik_methods`. Methods
+# that return several items build them with the `list_type` given to the constructor.
+
+import collections as _pycoll
+import heapq
+from bisect import bisect_left, bisect_right
+
+_LOAD = 512   # sorted index: sublists split at 2 * _LOAD elements
+
+
+# -------------------------
+# HEAP
+# -------------------------
+class _Rev:
+    # inverts ordering so heapq (a min-heap) can serve as a max-heap for any comparable key
+    __slots__ = ("k",)
+    def __init__(self, k): self.k = k
+    def __lt__(self, other): return other.k < self.k
+    def __eq__(self, other): return self.k == other.k
+
+
+class Heap:
+    """Priority queue. `push(x)` orders by x itself; `push(x, priority)` orders by
+    priority and never compares the items, so any value can be queued. Ties pop
+    in insertion order."""
+    __slots__ = ("_h", "_max", "_seq", "_list")
+    unik_methods = frozenset({"push", "pop", "peek", "pushpop", "len", "list", "empty", "clear"})
+
+    def __init__(self, items=(), max=False, list_type=list):
+        self._list = list_type
+        self._max = bool(max)
+        self._seq = 0
+        self._h = [self._entry(x, None) for x in items]
+        heapq.heapify(self._h)
+
+    def _entry(self, item, priority):
+        key = item if priority is None else priority
+        self._seq += 1
+        return (_Rev(key) if self._max else key, self._seq, item)
+
+    def push(self, item, priority=None):
+        heapq.heappush(self._h, self._entry(item, priority))
+        return self
+
+    def pop(self):
+        if not self._h:
+            raise IndexError("pop from an empty heap")
+        return heapq.heappop(self._h)[2]
+
+    def peek(self):
+        if not self._h:
+            raise IndexError("peek at an empty heap")
+        return self._h[0][2]
+
+    def pushpop(self, item, priority=None):
+        """Push then pop in one sift: the cheap way to keep the k best of a stream."""
+        return heapq.heappushpop(self._h, self._entry(item, priority))[2]
+
+    def len(self): return len(self._h)
+    def empty(self): return not self._h
+    def list(self): return self._list([e[2] for e in sorted(self._h)])
+
+    def clear(self):
+        self._h.clear()
+        return self
+
+    def __len__(self): return len(self._h)
+    def __iter__(self): return (e[2] for e in sorted(self._h))
+    def __repr__(self): return f"heap({[e[2] for e in sorted(self._h)]})"
+
+
+# -------------------------
+# DEQUE
+# -------------------------
+class Deque:
+    __slots__ = ("_d", "_list")
+    unik_methods = frozenset({"push", "push_left", "pop", "pop_left", "peek", "peek_left",
+                              "rotate", "len", "list", "empty", "clear"})
+
+    def __init__(self, items=(), maxlen=None, list_type=list):
+        # with maxlen, pushing onto a full deque drops from the other end (a sliding window)
+        self._d = _pycoll.deque(items, maxlen)
+        self._list = list_type
+
+    def push(self, x):
+        self._d.append(x)
+        return self
+
+    def push_left(self, x):
+        self._d.appendleft(x)
+        return self
+
+    def pop(self):
+        if not self._d:
+            raise IndexError("pop from an empty deque")
+        return self._d.pop()
+
+    def pop_left(self):
+        if not self._d:
+            raise IndexError("pop from an empty deque")
+        return self._d.popleft()
+
+    def peek(self): return self._d[-1]
+    def peek_left(self): return self._d[0]
+
+    def rotate(self, n=1):
+        self._d.rotate(n)
+        return self
+
+    def len(self): return len(self._d)
+    def empty(self): return not self._d
+    def list(self): return self._list(self._d)
+
+    def clear(self):
+        self._d.clear()
+        return self
+
+    def __len__(self): return len(self._d)
+    def __iter__(self): return iter(self._d)
+    def __getitem__(self, i): return self._d[i]
+    def __repr__(self): return f"deque({list(self._d)})"
+
+
+# -------------------------
+# SORTED INDEX
+# -------------------------
+class _SortedKeys:
+    """Sorted list of unique keys kept as a list of short sorted sublists.
+
+    `_maxes` holds each sublist's last key, so locating a key is two bisects
+    (O(log n)) and an insert or delete only shifts one sublist of at most
+    2 * _LOAD keys. Range scans walk sublists in order.
+    """
+    __slots__ = ("_lists", "_maxes", "_len")
+
+    def __init__(self, keys=()):
+        keys = sorted(set(keys))
+        self._lists = [keys[i:i + _LOAD] for i in range(0, len(keys), _LOAD)]
+        self._maxes = [sub[-1] for sub in self._lists]
+        self._len = len(keys)
+
+    def _locate(self, key):
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return i, 0
+        return i, bisect_left(self._lists[i], key)
+
+    def __contains__(self, key):
+        i, j = self._locate(key)
+        return i < len(self._lists) and self._lists[i][j] == key
+
+    def add(self, key):
+        """Insert `key`; False if it was already present."""
+        lists, maxes = self._lists, self._maxes
+        if not lists:
+            lists.append([key]); maxes.append(key)
+            self._len = 1
+            return True
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            i -= 1
+            lists[i].append(key); maxes[i] = key
+        else:
+            sub = lists[i]
+            j = bisect_left(sub, key)
+            if sub[j] == key:
+                return False
+            sub.insert(j, key)
+        self._len += 1
+        if len(lists[i]) > 2 * _LOAD:
+            sub = lists[i]
+            lists[i:i + 1] = [sub[:_LOAD], sub[_LOAD:]]
+            maxes[i:i + 1] = [sub[_LOAD - 1], sub[-1]]
+        return True
+
+    def remove(self, key):
+        """Delete `key`; False if it was absent."""
+        i, j = self._locate(key)
+        lists = self._lists
+        if i == len(lists) or lists[i][j] != key:
+            return False
+        sub = lists[i]
+        del sub[j]
+        self._len -= 1
+        if not sub:
+            del lists[i]; del self._maxes[i]
+        else:
+            self._maxes[i] = sub[-1]
+        return True
+
+    def first(self): return self._lists[0][0] if self._lists else None
+    def last(self): return self._lists[-1][-1] if self._lists else None
+
+    def floor(self, key):
+        """Largest key <= key, or None."""
+        i = bisect_right(self._maxes, key)
+        if i < len(self._lists):
+            j = bisect_right(self._lists[i], key)
+            if j:
+                return self._lists[i][j - 1]
+        return self._maxes[i - 1] if i else None
+
+    def ceil(self, key):
+        """Smallest key >= key, or None."""
+        i, j = self._locate(key)
+        return self._lists[i][j] if i < len(self._lists) else None
+
+    def irange(self, lo=None, hi=None):
+        """Keys with lo <= key <= hi in order; None leaves that end open."""
+        lists = self._lists
+        if lo is None:
+            i = j = 0
+        else:
+            i, j = self._locate(lo)
+        while i < len(lists):
+            sub = lists[i]
+            if hi is not None and sub[-1] > hi:
+                yield from sub[j:bisect_right(sub, hi, j)]
+                return
+            yield from sub[j:] if j else sub
+            i += 1; j = 0
+
+    def __iter__(self):
+        for sub in self._lists:
+            yield from sub
+
+    def __reversed__(self):
+        for sub in reversed(self._lists):
+            yield from reversed(sub)
+
+    def __len__(self): return self._len
+
+
+class SortedSet:
+    __slots__ = ("_keys", "_list")
+    unik_methods = frozenset({"add", "remove", "has", "min", "max", "pop_min", "pop_max",
+                              "floor", "ceil", "range", "len", "list"})
+
+    def __init__(self, items=(), list_type=list):
+        self._keys = _SortedKeys(items)
+        self._list = list_type
+
+    def add(self, x):
+        self._keys.add(x)
+        return self
+
+    def remove(self, x):
+        if not self._keys.remove(x):
+            raise KeyError(x)
+        return self
+
+    def has(self, x): return x in self._keys
+    def min(self): return self._keys.first()
+    def max(self): return self._keys.last()
+
+    def pop_min(self):
+        x = self._keys.first()
+        if x is None:
+            raise IndexError("pop from an empty sorted set")
+        self._keys.remove(x)
+        return x
+
+    def pop_max(self):
+        x = self._keys.last()
+        if x is None:
+            raise IndexError("pop from an empty sorted set")
+        self._keys.remove(x)
+        return x
+
+    def floor(self, x): return self._keys.floor(x)
+    def ceil(self, x): return self._keys.ceil(x)
+    def range(self, lo=None, hi=None): return self._list(self._keys.irange(lo, hi))
+    def len(self): return len(self._keys)
+    def list(self): return self._list(self._keys)
+
+    def __contains__(self, x): return x in self._keys
+    def __len__(self): return len(self._keys)
+    def __iter__(self): return iter(self._keys)
+    def __repr__(self): return f"sorted_set({list(self._keys)})"
+
+
+class SortedMap:
+    """Dict iterated in key order: the values live in a plain dict, the order in a _SortedKeys."""
+    __slots__ = ("_keys", "_vals", "_list")
+    unik_methods = frozenset({"set", "get", "has", "remove", "keys", "values", "items",
+                              "min", "max", "pop_min", "floor", "ceil", "range", "len"})
+
+    def __init__(self, pairs=(), list_type=list):
+        self._vals = dict(pairs)
+        self._keys = _SortedKeys(self._vals)
+        self._list = list_type
+
+    def set(self, k, v):
+        if k not in self._vals:
+            self._keys.add(k)
+        self._vals[k] = v
+        return self
+
+    def get(self, k, default=None): return self._vals.get(k, default)
+    def has(self, k): return k in self._vals
+
+    def remove(self, k):
+        del self._vals[k]
+        self._keys.remove(k)
+        return self
+
+    def keys(self): return self._list(self._keys)
+    def values(self): return self._list([self._vals[k] for k in self._keys])
+    def items(self): return self._list([(k, self._vals[k]) for k in self._keys])
+    def min(self): return self._keys.first()
+    def max(self): return self._keys.last()
+
+    def pop_min(self):
+        k = self._keys.first()
+        if k is None:
+            raise IndexError("pop from an empty sorted map")
+        self._keys.remove(k)
+        return (k, self._vals.pop(k))
+
+    def floor(self, k): return self._keys.floor(k)
+    def ceil(self, k): return self._keys.ceil(k)
+
+    def range(self, lo=None, hi=None):
+        """(key, value) pairs with lo <= key <= hi, in key order."""
+        vals = self._vals
+        return self._list([(k, vals[k]) for k in self._keys.irange(lo, hi)])
+
+    def len(self): return len(self._vals)
+
+    def __getitem__(self, k): return self._vals[k]
+
+    def __setitem__(self, k, v): self.set(k, v)
+    def __contains__(self, k): return k in self._vals
+    def __len__(self): return len(self._vals)
+    def __iter__(self): return iter(self._keys)
+    def __repr__(self): return "sorted_map({" + ", ".join(f"{k!r}: {self._vals[k]!r}" for k in self._keys) + "})"
+
+
+# -------------------------
+# COUNTER
+# -------------------------
+class Counter:
+    __slots__ = ("_c", "_list")
+    unik_methods = frozenset({"add", "update", "get", "remove", "most_common", "total",
+                              "keys", "items", "len"})
+
+    def __init__(self, items=(), list_type=list):
+        self._c = _pycoll.Counter(items)
+        self._list = list_type
+
+    def add(self, x, n=1):
+        self._c[x] += n
+        return self
+
+    def update(self, items):
+        self._c.update(items)   # counting loop runs in C
+        return self
+
+    def get(self, x): return self._c.get(x, 0)
+
+    def remove(self, x):
+        self._c.pop(x, None)
+        return self
+
+    def most_common(self, k=None):
+        """The k most frequent (item, count) pairs; heap-selected when k is small."""
+        return self._list(self._c.most_common(k))
+
+    def total(self): return sum(self._c.values())
+    def keys(self): return self._list(self._c)
+    def items(self): return self._list(self._c.items())
+    def len(self): return len(self._c)
+
+    def __getitem__(self, x): return self._c.get(x, 0)
+    def __contains__(self, x): return x in self._c
+    def __len__(self): return len(self._c)
+    def __iter__(self): return iter(self._c)
+    def __repr__(self): return f"counter({dict(self._c)})"
+
+
+# -------------------------
+# BITSET
+# -------------------------
+class Bitset:
+    """Set of non-negative ints packed 8 per byte; grows on demand.
+
+    Bulk operations (count, union, intersect, difference) go through int.from_bytes
+    so they run in C over the whole buffer.
+    """
+    __slots__ = ("_b", "_list")
+    unik_methods = frozenset({"set", "unset", "has", "flip", "count", "union", "intersect",
+                              "difference", "list", "size"})
+
+    def __init__(self, size=0, list_type=list):
+        self._b = bytearray((size + 7) >> 3)
+        self._list = list_type
+
+    def _from_int(self, n, nbytes):
+        bs = Bitset(0, self._list)
+        bs._b = bytearray(n.to_bytes(nbytes, "little"))
+        return bs
+
+    def _int(self): return int.from_bytes(self._b, "little")
+
+    def set(self, i):
+        b = self._b
+        if i >> 3 >= len(b):
+            b.extend(bytes((i >> 3) + 1 - len(b)))
+        b[i >> 3] |= 1 << (i & 7)
+        return self
+
+    def unset(self, i):
+        if i >> 3 < len(self._b):
+            self._b[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+        return self
+
+    def has(self, i):
+        return i >> 3 < len(self._b) and bool(self._b[i >> 3] >> (i & 7) & 1)
+
+    def flip(self, i):
+        return self.unset(i) if self.has(i) else self.set(i)
+
+    def count(self): return self._int().bit_count()
+
+    def _combine(self, other, op):
+        n = max(len(self._b), len(other._b))
+        return self._from_int(op(self._int(), other._int()), n)
+
+    def union(self, other): return self._combine(other, int.__or__)
+    def intersect(self, other): return self._combine(other, int.__and__)
+    def difference(self, other): return self._combine(other, lambda a, b: a & ~b)
+
+    def _members(self):
+        out = []
+        for byte_i, byte in enumerate(self._b):
+            while byte:
+                low = byte & -byte
+                out.append((byte_i << 3) + low.bit_length() - 1)
+                byte ^= low
+        return out
+
+    def list(self): return self._list(self._members())
+
+    def size(self): return len(self._b) << 3   # capacity in bits; len() is the member count
+
+    def __contains__(self, i): return self.has(i)
+    def __iter__(self): return iter(self._members())
+    def __len__(self): return self.count()
+    def __repr__(self): return f"bitset({self._members()})"
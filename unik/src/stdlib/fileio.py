@@ -0,0 +1,205 @@
+# src/stdlib/fileio.py
+# File I/O behind `askfile` / `givefile`:
+#   TextFile   - lazy handle: iterating streams lines through a large read buffer,
+#                slicing / find / bytes() go through an mmap of the file, nothing
+#                is read until asked for (str(handle) is the only whole-file read);
+#                close() releases the mmap
+#   FileWriter - buffered writer; "replace" mode writes a temp file (unique per
+#                writer) next to the target and renames it over the target on close
+#                (atomic), "append" mode appends in place
+#   write_file - one-shot givefile: strings, bytes, handles and streams of lines
+
+import mmap
+import os
+import shutil
+import tempfile
+
+from src.stdlib import runcache
+from src.stdlib.buffer import Bytes
+
+READ_BUFFER = 1 << 20
+WRITE_BUFFER = 1 << 20
+
+_UMASK = os.umask(0)        # mkstemp creates 0600 files; replaced targets get the usual mode
+os.umask(_UMASK)
+
+
+class TextFile:
+    unik_methods = frozenset({"lines", "read", "size", "len", "slice", "bytes", "find",
+                              "head", "count_lines", "path", "close"})
+
+    def __init__(self, path, encoding="utf-8", list_type=list, stream_type=iter):
+        """`list_type` builds what head() returns, `stream_type` wraps the line
+        iterator lines() returns (the interpreter passes UnikList and Stream)."""
+        self._path = os.fspath(path)
+        self.encoding = encoding
+        self.list_type = list_type
+        self.stream_type = stream_type
+        self._mm = None
+        if not os.path.isfile(self._path):
+            raise FileNotFoundError(f"askfile: no such file '{self._path}'")
+        runcache.note_read(self._path)
+
+    def _map(self):
+        if self._mm is None:
+            with open(self._path, "rb") as f:
+                # an empty file cannot be mapped; stand in with an empty buffer
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        return self._mm
+
+    # -------------------------
+    # STREAMING
+    # -------------------------
+    def lines(self, keep_ends=False):
+        return self.stream_type(self._lines(keep_ends))
+
+    def _lines(self, keep_ends=False):
+        with open(self._path, "r", encoding=self.encoding, newline="", buffering=READ_BUFFER) as f:
+            if keep_ends:
+                yield from f
+                return
+            for line in f:
+                yield line.rstrip("\r\n")
+
+    def __iter__(self): return self._lines()
+
+    def head(self, n=10):
+        out = []
+        for line in self._lines():
+            if len(out) >= n:
+                break
+            out.append(line)
+        return self.list_type(out)
+
+    def count_lines(self):
+        n, last = 0, b"\n"
+        with open(self._path, "rb", buffering=0) as f:
+            for block in iter(lambda: f.read(READ_BUFFER), b""):
+                n += block.count(b"\n")
+                last = block[-1:]
+        return n + (last != b"\n")
+
+    # -------------------------
+    # RANDOM ACCESS (mmap, byte offsets)
+    # -------------------------
+    def path(self): return self._path
+    def size(self): return os.path.getsize(self._path)
+    def len(self): return self.size()
+    def __len__(self): return self.size()
+
+    def bytes(self, start=0, stop=None):
+        """A zero-copy view of bytes start..stop of the file."""
+        return Bytes(memoryview(self._map()), self.list_type).slice(start, stop)
+
+    def slice(self, start=0, stop=None):
+        """Text of bytes start..stop (decoded; a cut multi-byte char is replaced)."""
+        return str(self._map()[start:stop], self.encoding, "replace")
+
+    def find(self, sub, start=0):
+        mm = self._map()
+        sub = sub.encode(self.encoding) if isinstance(sub, str) else bytes(sub)
+        return mm.find(sub, start) if len(mm) else -1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.slice(i.start or 0, i.stop)
+        return self.slice(i, i + 1 if i != -1 else None)
+
+    # -------------------------
+    # WHOLE FILE
+    # -------------------------
+    def read(self):
+        with open(self._path, "r", encoding=self.encoding, newline="") as f:
+            return f.read()
+
+    def close(self):
+        mm, self._mm = self._mm, None
+        if isinstance(mm, mmap.mmap):
+            try:
+                mm.close()
+            except BufferError:
+                pass    # a bytes() view still points into it; freed with the view
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+    def __str__(self): return self.read()
+    def __repr__(self): return f"<file {self._path!r} {self.size()} bytes>"
+
+
+class FileWriter:
+    unik_methods = frozenset({"write", "line", "close"})
+
+    def __init__(self, path, append=False, encoding="utf-8"):
+        self.path = os.fspath(path)
+        self.encoding = encoding
+        self.append = append
+        runcache.note_write(self.path, append, os.path.getsize(self.path) if append and os.path.exists(self.path) else 0)
+        if append:
+            self._tmp = None
+            self.f = open(self.path, "ab", buffering=WRITE_BUFFER)
+        else:
+            d, name = os.path.split(os.path.abspath(self.path))
+            fd, self._tmp = tempfile.mkstemp(dir=d, prefix=f".{name}.", suffix=".tmp")
+            try:
+                mode = os.stat(self.path).st_mode & 0o7777
+            except OSError:
+                mode = 0o666 & ~_UMASK
+            os.chmod(self._tmp, mode)
+            self.f = open(fd, "wb", buffering=WRITE_BUFFER)
+
+    def write(self, value):
+        f = self.f
+        if isinstance(value, str):
+            f.write(value.encode(self.encoding))
+        elif isinstance(value, Bytes):
+            f.write(value.mv)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            f.write(value)
+        elif isinstance(value, TextFile):
+            with open(value.path(), "rb") as src:
+                shutil.copyfileobj(src, f, READ_BUFFER)
+        elif hasattr(value, "__iter__") and not isinstance(value, dict):
+            enc, write = self.encoding, f.write
+            for item in value:
+                write((item if isinstance(item, str) else str(item)).encode(enc))
+                write(b"\n")
+        else:
+            f.write(str(value).encode(self.encoding))
+        return self
+
+    def line(self, value=""):
+        self.write(value if isinstance(value, str) else str(value))
+        self.f.write(b"\n")
+        return self
+
+    @property
+    def closed(self): return self.f.closed
+
+    def close(self):
+        if self.f.closed:
+            return
+        self.f.close()
+        if self._tmp:
+            os.replace(self._tmp, self.path)
+
+    def abort(self):
+        # drop a replace-mode write: the target keeps its previous contents
+        if not self.f.closed:
+            self.f.close()
+        if self._tmp and os.path.exists(self._tmp):
+            os.remove(self._tmp)
+
+    def __enter__(self): return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_file(path, value, append=False, encoding="utf-8"):
+    with FileWriter(path, append, encoding) as w:
+        w.write(value)
+    return path
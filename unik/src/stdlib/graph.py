@@ -0,0 +1,414 @@
+# src/stdlib/graph.py
+# Graph algorithms for Unik on compressed sparse row (CSR) adjacency:
+#   indptr[v] .. indptr[v + 1] is the slice of `indices` (and `weights`) holding v's out-edges.
+# The three arrays are typed array.array buffers (8 bytes per entry, no per-edge
+# Python objects); with NumPy installed they are also read as zero-copy ndarrays,
+# so building, level-synchronous BFS, components and PageRank run vectorized.
+# Vertices are 0..n-1 internally; graphs built from labelled edges ("a" -> "b")
+# translate results back to the labels. Vertex lists are built with the
+# `list_type` given to the constructors (the interpreter passes its list type).
+
+import heapq
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # optional: every algorithm has a pure-Python path
+    np = None
+
+_INF = float("inf")
+
+
+def _typed(code, data):
+    # array.array from a list, an array or an ndarray (the last via its raw buffer)
+    if np is not None and isinstance(data, np.ndarray):
+        a = array(code)
+        a.frombytes(data.astype(np.int64 if code == "q" else np.float64, copy=False).tobytes())
+        return a
+    return array(code, data)
+
+
+class Graph:
+    __slots__ = ("n", "indptr", "indices", "weights", "labels", "_ids", "directed", "_views", "_list")
+    unik_methods = frozenset({"nodes", "edges", "neighbors", "degree", "bfs", "hops", "dfs",
+                              "dijkstra", "path", "toposort", "components", "pagerank"})
+
+    def __init__(self, n, indptr, indices, weights=None, labels=None, directed=True, list_type=list):
+        self.n = n
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.labels = labels
+        self._ids = {lab: i for i, lab in enumerate(labels)} if labels is not None else None
+        self.directed = directed
+        self._views = None
+        self._list = list_type
+
+    # -------------------------
+    # BUILDING
+    # -------------------------
+    @classmethod
+    def from_arrays(cls, src, dst, weights=None, n=None, directed=True, labels=None, list_type=list):
+        """CSR from parallel edge arrays of vertex ids (a counting sort, O(n + m))."""
+        if np is not None:
+            src = np.asarray(src, dtype=np.int64)
+            dst = np.asarray(dst, dtype=np.int64)
+            w = None if weights is None else np.asarray(weights, dtype=np.float64)
+            if not directed:
+                src, dst = np.concatenate((src, dst)), np.concatenate((dst, src))
+                w = None if w is None else np.concatenate((w, w))
+            if n is None:
+                n = int(max(src.max(initial=-1), dst.max(initial=-1))) + 1
+            order = np.argsort(src, kind="stable")
+            indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+            return cls(n, _typed("q", indptr), _typed("q", dst[order]),
+                       None if w is None else _typed("d", w[order]), labels, directed, list_type)
+        src, dst = list(src), list(dst)
+        w = None if weights is None else list(weights)
+        if not directed:
+            src, dst = src + dst, dst + src
+            w = None if w is None else w + w
+        if n is None:
+            n = max(max(src, default=-1), max(dst, default=-1)) + 1
+        counts = [0] * (n + 1)
+        for u in src:
+            counts[u + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        pos = counts[:-1]
+        indices = array("q", bytes(8 * len(dst)))
+        weights_a = None if w is None else array("d", bytes(8 * len(dst)))
+        for e, u in enumerate(src):
+            p = pos[u]
+            indices[p] = dst[e]
+            if w is not None:
+                weights_a[p] = w[e]
+            pos[u] = p + 1
+        return cls(n, array("q", counts), indices, weights_a, labels, directed, list_type)
+
+    @classmethod
+    def from_edges(cls, edges, directed=True, list_type=list):
+        """Graph from (u, v) or (u, v, weight) pairs; u and v may be any hashable labels."""
+        ids, labels = {}, []
+        src, dst, w = [], [], []
+        for e in edges:
+            for node in e[:2]:
+                if node not in ids:
+                    ids[node] = len(labels)
+                    labels.append(node)
+            src.append(ids[e[0]]); dst.append(ids[e[1]])
+            if len(e) > 2:
+                w.append(e[2])
+        if w and len(w) != len(src):
+            raise ValueError("either every edge has a weight or none does")
+        # edges over 0..n-1 met in order need no label table
+        plain = all(type(lab) is int and lab == i for i, lab in enumerate(labels))
+        return cls.from_arrays(src, dst, w or None, len(labels), directed, None if plain else labels, list_type)
+
+    # -------------------------
+    # HELPERS
+    # -------------------------
+    def _np(self):
+        # zero-copy ndarray views of the CSR buffers
+        if self._views is None:
+            self._views = (np.frombuffer(self.indptr, dtype=np.int64),
+                           np.frombuffer(self.indices, dtype=np.int64))
+        return self._views
+
+    def _id(self, v):
+        if self._ids is not None:
+            try:
+                return self._ids[v]
+            except KeyError:
+                raise KeyError(f"no vertex {v!r}") from None
+        if not 0 <= v < self.n:
+            raise KeyError(f"no vertex {v!r}")
+        return v
+
+    def _out(self, ids):
+        labels = self.labels
+        return self._list(ids if labels is None else [labels[i] for i in ids])
+
+    def _key(self, i):
+        return i if self.labels is None else self.labels[i]
+
+    def _gather(self, frontier):
+        # all out-neighbours of the vertices in `frontier`, concatenated in frontier order
+        indptr, indices = self._np()
+        starts = indptr[frontier]
+        lens = indptr[frontier + 1] - starts
+        total = int(lens.sum())
+        if not total:
+            return indices[:0]
+        offs = np.repeat(starts - np.cumsum(lens) + lens, lens) + np.arange(total)
+        return indices[offs]
+
+    # -------------------------
+    # BASICS
+    # -------------------------
+    def nodes(self): return self.n
+    def edges(self): return len(self.indices)
+
+    def neighbors(self, v):
+        i = self._id(v)
+        return self._out(self.indices[self.indptr[i]:self.indptr[i + 1]])
+
+    def degree(self, v):
+        i = self._id(v)
+        return self.indptr[i + 1] - self.indptr[i]
+
+    # -------------------------
+    # TRAVERSAL
+    # -------------------------
+    def _levels(self, start):
+        """BFS frontiers from `start`, each in queue order."""
+        s = self._id(start)
+        if np is not None:
+            seen = np.zeros(self.n, dtype=bool)
+            seen[s] = True
+            frontier = np.array([s], dtype=np.int64)
+            while frontier.size:
+                yield frontier
+                nb = self._gather(frontier)
+                nb = nb[~seen[nb]]
+                # first occurrence of each new vertex keeps FIFO order
+                _, first = np.unique(nb, return_index=True)
+                frontier = nb[np.sort(first)]
+                seen[frontier] = True
+            return
+        indptr, indices = self.indptr, self.indices
+        seen = bytearray(self.n)
+        seen[s] = 1
+        frontier = [s]
+        while frontier:
+            yield frontier
+            nxt = []
+            for u in frontier:
+                for v in indices[indptr[u]:indptr[u + 1]]:
+                    if not seen[v]:
+                        seen[v] = 1
+                        nxt.append(v)
+            frontier = nxt
+
+    def bfs(self, start):
+        """Vertices reachable from `start` in breadth-first order."""
+        order = []
+        for level in self._levels(start):
+            order.extend(level.tolist() if np is not None else level)
+        return self._out(order)
+
+    def hops(self, start):
+        """{vertex: edge count of the shortest path from start} for reachable vertices."""
+        out = {}
+        key = self._key
+        for d, level in enumerate(self._levels(start)):
+            for v in (level.tolist() if np is not None else level):
+                out[key(v)] = d
+        return out
+
+    def dfs(self, start):
+        """Vertices reachable from `start` in depth-first preorder (iterative, no recursion limit)."""
+        indptr, indices = self.indptr, self.indices
+        s = self._id(start)
+        seen = bytearray(self.n)
+        seen[s] = 1
+        order = [s]
+        stack = [(s, indptr[s])]
+        while stack:
+            u, p = stack[-1]
+            end = indptr[u + 1]
+            while p < end and seen[indices[p]]:
+                p += 1
+            if p == end:
+                stack.pop()
+                continue
+            v = indices[p]
+            stack[-1] = (u, p + 1)
+            seen[v] = 1
+            order.append(v)
+            stack.append((v, indptr[v]))
+        return self._out(order)
+
+    # -------------------------
+    # SHORTEST PATHS
+    # -------------------------
+    def _dijkstra(self, s, target=None):
+        # binary heap with lazy deletion; unweighted graphs count each edge as 1
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        if weights is not None and len(weights) and min(weights) < 0:
+            raise ValueError("dijkstra needs non-negative edge weights")
+        dist = [_INF] * self.n
+        prev = array("q", bytes(8 * self.n))
+        done = bytearray(self.n)
+        dist[s] = 0
+        heap = [(0, s)]
+        pop, push = heapq.heappop, heapq.heappush
+        while heap:
+            d, u = pop(heap)
+            if done[u]:
+                continue
+            if u == target:
+                break
+            done[u] = 1
+            a, b = indptr[u], indptr[u + 1]
+            ws = weights[a:b] if weights is not None else (1,) * (b - a)
+            for v, w in zip(indices[a:b], ws):
+                nd = d + w
+                if nd < dist[v]:
+                    dist[v] = nd
+                    prev[v] = u
+                    push(heap, (nd, v))
+        return dist, prev
+
+    def dijkstra(self, start, target=None):
+        """Shortest distance to `target` (None if unreachable), or {vertex: distance} for all."""
+        s = self._id(start)
+        t = None if target is None else self._id(target)
+        if self.weights is None:
+            # every edge costs 1: breadth-first levels are the distances
+            for d, level in enumerate(self._levels(start)):
+                if t is not None and t in level:
+                    return d
+            return None if t is not None else self.hops(start)
+        dist, _ = self._dijkstra(s, t)
+        if t is not None:
+            return None if dist[t] == _INF else dist[t]
+        key = self._key
+        return {key(v): d for v, d in enumerate(dist) if d != _INF}
+
+    def path(self, start, target):
+        """Vertices on a shortest path from start to target, or None."""
+        s, t = self._id(start), self._id(target)
+        dist, prev = self._dijkstra(s, t)
+        if dist[t] == _INF:
+            return None
+        out = [t]
+        while out[-1] != s:
+            out.append(prev[out[-1]])
+        out.reverse()
+        return self._out(out)
+
+    # -------------------------
+    # ORDERING & STRUCTURE
+    # -------------------------
+    def toposort(self):
+        """Kahn's algorithm; raises ValueError if the graph has a cycle."""
+        n, indptr, indices = self.n, self.indptr, self.indices
+        if np is not None:
+            _, idx = self._np()
+            indeg = np.bincount(idx, minlength=n)
+            frontier = np.flatnonzero(indeg == 0)
+            order = []
+            while frontier.size:
+                order.append(frontier)
+                nb = self._gather(frontier)
+                indeg -= np.bincount(nb, minlength=n)
+                ready = np.unique(nb)
+                frontier = ready[indeg[ready] == 0]
+            order = np.concatenate(order).tolist() if order else []
+        else:
+            indeg = [0] * n
+            for v in indices:
+                indeg[v] += 1
+            order = [v for v in range(n) if not indeg[v]]
+            for u in order:  # grows while iterating: the queue
+                for v in indices[indptr[u]:indptr[u + 1]]:
+                    indeg[v] -= 1
+                    if not indeg[v]:
+                        order.append(v)
+        if len(order) != n:
+            raise ValueError("graph has a cycle")
+        return self._out(order)
+
+    def _component_ids(self):
+        # weakly connected component label per vertex: the smallest vertex id in it
+        n = self.n
+        if np is not None:
+            indptr, dst = self._np()
+            src = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+            labels = np.arange(n, dtype=np.int64)
+            while True:
+                # hook each edge's larger root under the smaller, then pointer-jump to roots
+                lu, lv = labels[src], labels[dst]
+                m = np.minimum(lu, lv)
+                new = labels.copy()
+                np.minimum.at(new, lu, m)
+                np.minimum.at(new, lv, m)
+                while True:
+                    nxt = new[new]
+                    if np.array_equal(nxt, new):
+                        break
+                    new = nxt
+                if np.array_equal(new, labels):
+                    return labels.tolist()
+                labels = new
+        parent = list(range(n))
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+        indptr, indices = self.indptr, self.indices
+        for u in range(n):
+            for v in indices[indptr[u]:indptr[u + 1]]:
+                ru, rv = find(u), find(v)
+                if ru != rv:
+                    if ru < rv: parent[rv] = ru
+                    else: parent[ru] = rv
+        return [find(v) for v in range(n)]
+
+    def components(self):
+        """Weakly connected components as vertex lists, ordered by their smallest vertex id."""
+        groups = {}
+        for v, c in enumerate(self._component_ids()):
+            groups.setdefault(c, []).append(v)
+        return self._list([self._out(g) for g in groups.values()])
+
+    def pagerank(self, damping=0.85, iters=100, tol=1e-8):
+        """{vertex: rank}; power iteration, dangling vertices spread their rank evenly."""
+        n = self.n
+        if not n:
+            return {}
+        key = self._key
+        if np is not None:
+            indptr, dst = self._np()
+            outdeg = np.diff(indptr)
+            src = np.repeat(np.arange(n, dtype=np.int64), outdeg)
+            dangling = outdeg == 0
+            inv = np.where(dangling, 0.0, 1.0 / np.maximum(outdeg, 1))
+            rank = np.full(n, 1.0 / n)
+            for _ in range(iters):
+                share = rank * inv
+                new = np.bincount(dst, weights=share[src], minlength=n)
+                new = (1.0 - damping) / n + damping * (new + rank[dangling].sum() / n)
+                done = np.abs(new - rank).sum() < tol
+                rank = new
+                if done:
+                    break
+            return {key(v): r for v, r in enumerate(rank.tolist())}
+        indptr, indices = self.indptr, self.indices
+        rank = [1.0 / n] * n
+        for _ in range(iters):
+            new = [0.0] * n
+            lost = 0.0
+            for u in range(n):
+                a, b = indptr[u], indptr[u + 1]
+                if a == b:
+                    lost += rank[u]
+                    continue
+                share = rank[u] / (b - a)
+                for v in indices[a:b]:
+                    new[v] += share
+            base = (1.0 - damping) / n + damping * lost / n
+            new = [base + damping * x for x in new]
+            delta = sum(abs(x - y) for x, y in zip(new, rank))
+            rank = new
+            if delta < tol:
+                break
+        return {key(v): r for v, r in enumerate(rank)}
+
+    def __len__(self): return self.n
+
+    def __repr__(self):
+        return f"<graph {self.n} nodes, {len(self.indices)} edges>"
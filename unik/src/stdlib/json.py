@@ -0,0 +1,535 @@
+# src/stdlib/json.py
+# Streaming and lazy JSON for Unik:
+#   events(src) - incremental parser: ("start_map"|"map_key"|"end_map"|"start_array"|
+#                 "end_array"|"value", value) pairs while reading src chunk by chunk
+#   items(src, path) - the elements of one array (top level, or under a dotted key
+#                 path) one at a time; each element is decoded by the C decoder
+#   lines(src)  - JSON-lines: one document per line
+#   lazy(src)   - LazyObject / LazyArray over the raw text (a file is mmapped):
+#                 nested values are only located and decoded when accessed
+#   Writer      - streaming writer for arrays and JSON-lines; a path target is
+#                 written through a temp file and replaced on close (atomic)
+# `src` is a path, "-" for stdin, an open file, or an iterable of text chunks.
+# Everything except lazy() holds only one chunk (plus the current item) in memory.
+
+import json
+import mmap
+import re
+import sys
+
+from src.stdlib.fileio import FileWriter
+
+CHUNK = 1 << 16
+
+_WS = re.compile(r"[ \t\n\r]*")
+_SCALAR = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null")
+_DELIM = re.compile(r"[ \t\n\r,\]}]")   # what may follow a number or literal
+_LITERALS = {"true": True, "false": False, "null": None}
+_decoder = json.JSONDecoder()
+_scanstring = json.decoder.scanstring
+
+
+class _ChunkFile:
+    # file-like read() over an iterable of text chunks; "" only at the end
+    def __init__(self, chunks): self.it = iter(chunks)
+    def close(self): pass
+
+    def read(self, n=-1):
+        for chunk in self.it:
+            if chunk:
+                return chunk
+        return ""
+
+
+class _Reader:
+    """A sliding text buffer over the source; positions are relative to `buf`."""
+
+    def __init__(self, source, chunk_size=CHUNK):
+        self.owned = False
+        if isinstance(source, str):
+            if source == "-":
+                self.f = sys.stdin
+            else:
+                self.f = open(source, encoding="utf-8")
+                self.owned = True
+        elif hasattr(source, "read"):
+            self.f = source
+        else:
+            self.f = _ChunkFile(source)
+        self.chunk = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def close(self):
+        if self.owned:
+            self.f.close()
+
+    def more(self):
+        """Append input (at least as much as is still unread, so retries stay linear); False at EOF."""
+        if self.eof:
+            return False
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        data = self.f.read(max(self.chunk, len(self.buf)))
+        if not data:
+            self.eof = True
+            return False
+        self.buf += data
+        return True
+
+    def peek(self):
+        # next non-whitespace character ("" at end of input), without consuming it
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                return ""
+
+    def error(self, what):
+        near = self.buf[self.pos:self.pos + 20]
+        return ValueError(f"JSON: expected {what} near {near!r}")
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise self.error(repr(ch))
+        self.pos += 1
+
+    def string(self):
+        if self.peek() != '"':
+            raise self.error("a string")
+        while True:
+            try:
+                s, self.pos = _scanstring(self.buf, self.pos + 1)
+                return s
+            except ValueError:   # unterminated: the string continues in the next chunk
+                if not self.more():
+                    raise
+
+    def scalar(self):
+        c = self.peek()
+        if c == '"':
+            return self.string()
+        while True:
+            m = _SCALAR.match(self.buf, self.pos)
+            # a token not yet followed by a delimiter may continue in the next chunk
+            if (m is None or not _DELIM.match(self.buf, m.end())) and self.more():
+                continue
+            if m is None:
+                raise self.error("a value")
+            self.pos = m.end()
+            tok = m.group()
+            if tok in _LITERALS:
+                return _LITERALS[tok]
+            return float(tok) if any(ch in tok for ch in ".eE") else int(tok)
+
+    def value(self):
+        """Decode one whole value with the C decoder, reading more input while it is incomplete."""
+        self.peek()
+        while True:
+            try:
+                v, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.more():
+                    continue
+                raise
+            if type(v) in (int, float) and not _DELIM.match(self.buf, end) and self.more():
+                continue   # a number cut by the chunk boundary: decode again with the rest
+            self.pos = end
+            return v
+
+
+# -------------------------
+# STREAMING READERS
+# -------------------------
+def events(source, chunk_size=CHUNK):
+    r = _Reader(source, chunk_size)
+    try:
+        yield from _events(r)
+    finally:
+        r.close()
+
+
+def _events(r):
+    stack = []   # "{" / "[" for each open container
+    while r.peek():
+        c = r.peek()
+        if c == "{":
+            r.pos += 1
+            yield ("start_map", None)
+            if r.peek() == "}":
+                r.pos += 1
+                yield ("end_map", None)
+            else:
+                stack.append("{")
+                key = r.string()
+                r.expect(":")
+                yield ("map_key", key)
+                continue
+        elif c == "[":
+            r.pos += 1
+            yield ("start_array", None)
+            if r.peek() == "]":
+                r.pos += 1
+                yield ("end_array", None)
+            else:
+                stack.append("[")
+                continue
+        else:
+            yield ("value", r.scalar())
+        # a value just ended: close finished containers, or step past a comma
+        while stack:
+            c = r.peek()
+            if c == ",":
+                r.pos += 1
+                if stack[-1] == "{":
+                    key = r.string()
+                    r.expect(":")
+                    yield ("map_key", key)
+                break
+            closer = "}" if stack[-1] == "{" else "]"
+            if c != closer:
+                raise r.error(f"',' or {closer!r}")
+            r.pos += 1
+            stack.pop()
+            yield ("end_map" if closer == "}" else "end_array", None)
+    if stack:
+        raise ValueError("JSON: unexpected end of input")
+
+
+def items(source, path="", chunk_size=CHUNK):
+    """Elements of the array at `path` ("" for a top-level array, "a.b" for doc["a"]["b"])."""
+    r = _Reader(source, chunk_size)
+    try:
+        for key in (path.split(".") if path else ()):
+            r.expect("{")
+            while True:
+                k = r.string()
+                r.expect(":")
+                if k == key:
+                    break
+                r.value()   # skip a sibling (decoded once, then dropped)
+                if r.peek() != ",":
+                    raise KeyError(f"JSON: no key {key!r} on path {path!r}")
+                r.pos += 1
+        r.expect("[")
+        if r.peek() == "]":
+            return
+        while True:
+            yield r.value()
+            c = r.peek()
+            r.pos += 1
+            if c == "]":
+                return
+            if c != ",":
+                r.pos -= 1
+                raise r.error("',' or ']'")
+    finally:
+        r.close()
+
+
+def lines(source):
+    """JSON-lines documents, one per non-blank line."""
+    r = _Reader(source)
+    try:
+        if not isinstance(r.f, _ChunkFile):
+            for line in r.f:      # files split lines in C
+                if line.strip():
+                    yield json.loads(line)
+            return
+        while True:
+            nl = r.buf.find("\n", r.pos)
+            if nl < 0:
+                if r.more():
+                    continue
+                nl = len(r.buf)
+                if r.pos >= nl:
+                    return
+            line = r.buf[r.pos:nl]
+            r.pos = nl + 1
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        r.close()
+
+
+# -------------------------
+# LAZY DOCUMENTS
+# -------------------------
+_WS_B = re.compile(rb"[ \t\n\r]*")
+_STR_B = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+# everything up to the next bracket that is not inside a string, in one C-level match
+_TO_BRACKET_B = re.compile(rb'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.S)
+_ATOM_B = re.compile(rb"[^,}\]\s]*")
+_OPEN = frozenset(b"{[")
+
+
+def _ws(data, i):
+    return _WS_B.match(data, i).end()
+
+
+def _value_end(data, i):
+    # end offset of the value starting at i, found by regex skipping (nothing decoded)
+    c = data[i]
+    if c in _OPEN:
+        depth, n = 0, len(data)
+        while True:
+            if i >= n:
+                raise ValueError("JSON: unterminated container")
+            depth += 1 if data[i] in _OPEN else -1
+            i += 1
+            if not depth:
+                return i
+            i = _TO_BRACKET_B.match(data, i).end()
+    if c == 0x22:
+        return _STR_B.match(data, i).end()
+    return _ATOM_B.match(data, i).end()
+
+
+def _decode(data, i, list_type=list):
+    c = data[i]
+    if c == 0x7B:
+        return LazyObject(data, i, list_type)
+    if c == 0x5B:
+        return LazyArray(data, i, list_type)
+    return json.loads(data[i:_value_end(data, i)])
+
+
+class _LazyContainer:
+    """Members are located incrementally, left to right, only as far as an access
+    needs; a container member is handed out as another lazy view from its start
+    offset, so skipping over it is the only work done on it until it is used.
+    `list_type` builds the lists keys() / items() / slices return."""
+    __slots__ = ("_data", "_start", "_end", "_pos", "_pending", "_cache", "_list")
+    _CLOSE = 0
+
+    def __init__(self, data, start=0, list_type=list):
+        self._data = data
+        self._list = list_type
+        self._start = start
+        self._end = None        # offset just past the closing bracket, once known
+        self._pos = _ws(data, start + 1)
+        self._pending = None    # start of the last located member, not yet skipped
+        self._cache = {}
+
+    def _advance(self):
+        # locate the next member; False once the closing bracket is reached
+        if self._end is not None:
+            return False
+        data, i = self._data, self._pos
+        if self._pending is not None:
+            i = _ws(data, _value_end(data, self._pending))
+            if data[i] == 0x2C:     # ','
+                i = _ws(data, i + 1)
+        if data[i] == self._CLOSE:
+            self._end = i + 1
+            return False
+        self._pos = self._member(data, i)
+        return True
+
+    def _scan_all(self):
+        while self._advance():
+            pass
+
+    def value(self):
+        """The whole container, fully decoded."""
+        self._scan_all()
+        return json.loads(self._data[self._start:self._end])
+
+    def __len__(self): return self.len()
+
+
+class LazyObject(_LazyContainer):
+    __slots__ = ("_spans",)
+    unik_methods = frozenset({"get", "has", "keys", "items", "len", "value"})
+    _CLOSE = 0x7D
+
+    def __init__(self, data, start=0, list_type=list):
+        super().__init__(data, start, list_type)
+        self._spans = {}
+
+    def _member(self, data, i):
+        ke = _value_end(data, i)
+        vs = _ws(data, _ws(data, ke) + 1)   # past ':'
+        self._spans[json.loads(data[i:ke])] = vs
+        self._pending = vs
+        return vs
+
+    def _locate(self, key):
+        spans = self._spans
+        while key not in spans and self._advance():
+            pass
+        return spans.get(key)
+
+    def __getitem__(self, key):
+        if key in self._cache:
+            return self._cache[key]
+        i = self._locate(key)
+        if i is None:
+            raise KeyError(key)
+        v = self._cache[key] = _decode(self._data, i, self._list)
+        return v
+
+    def get(self, key, default=None):
+        return self[key] if self._locate(key) is not None else default
+
+    def has(self, key): return self._locate(key) is not None
+
+    def keys(self):
+        self._scan_all()
+        return self._list(self._spans)
+
+    def items(self): return self._list([(k, self[k]) for k in self.keys()])
+
+    def len(self):
+        self._scan_all()
+        return len(self._spans)
+
+    def __contains__(self, key): return self.has(key)
+    def __iter__(self):
+        self._scan_all()
+        return iter(list(self._spans))
+    def __repr__(self):   # never forces a scan
+        return "<json object>" if self._end is None else f"<json object, {len(self._spans)} keys>"
+
+
+class LazyArray(_LazyContainer):
+    __slots__ = ("_starts",)
+    unik_methods = frozenset({"get", "len", "value"})
+    _CLOSE = 0x5D
+
+    def __init__(self, data, start=0, list_type=list):
+        super().__init__(data, start, list_type)
+        self._starts = []
+
+    def _member(self, data, i):
+        self._starts.append(i)
+        self._pending = i
+        return i
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return self._list([self[i] for i in range(*k.indices(self.len()))])
+        if k < 0:
+            k += self.len()
+        if k in self._cache:
+            return self._cache[k]
+        starts = self._starts
+        while len(starts) <= k and self._advance():
+            pass
+        if not 0 <= k < len(starts):
+            raise IndexError("JSON array index out of range")
+        v = self._cache[k] = _decode(self._data, starts[k], self._list)
+        return v
+
+    def get(self, k, default=None):
+        try:
+            return self[k]
+        except IndexError:
+            return default
+
+    def len(self):
+        self._scan_all()
+        return len(self._starts)
+
+    def __iter__(self):
+        # decoded one at a time and not cached, so a full pass stays small
+        k = 0
+        while k < len(self._starts) or self._advance():
+            yield self._cache[k] if k in self._cache else _decode(self._data, self._starts[k], self._list)
+            k += 1
+
+    def __repr__(self):
+        return "<json array>" if self._end is None else f"<json array, {len(self._starts)} items>"
+
+
+def lazy(source, list_type=list):
+    """Lazy view of a JSON document: a file path is mmapped, text is used as is.
+    `list_type` builds the lists the views return (keys(), items(), slices)."""
+    if isinstance(source, str) and source.lstrip()[:1] not in ("{", "["):
+        with open(source, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    elif isinstance(source, str):
+        data = source.encode("utf-8")
+    else:
+        data = source
+    return _decode(data, _ws(data, 0), list_type)
+
+
+# -------------------------
+# STREAMING WRITER
+# -------------------------
+def _default(o):
+    # Unik values without a JSON form of their own
+    if hasattr(o, "tolist"):
+        return o.tolist()
+    items_ = getattr(o, "items", None)
+    if callable(items_):
+        return dict(items_())
+    if hasattr(o, "__iter__"):
+        return list(o)
+    raise TypeError(f"{type(o).__name__} is not JSON serializable")
+
+
+class Writer:
+    """Writes an array (mode "array") or JSON-lines (mode "lines") one item at a time.
+
+    A path target only changes on close(): until then the items go to a temp
+    file, and abort() (or leaving a `with` block by an exception) drops them.
+    """
+    unik_methods = frozenset({"write", "write_all", "close"})
+
+    def __init__(self, target, mode="array"):
+        if mode not in ("array", "lines"):
+            raise ValueError(f"unknown JSON writer mode {mode!r}")
+        self.owned = isinstance(target, str)
+        self.f = FileWriter(target) if self.owned else target
+        self.mode = mode
+        self.n = 0
+        self.closed = False
+
+    def write(self, item):
+        s = json.dumps(item, default=_default, separators=(",", ":"), ensure_ascii=False)
+        if self.mode == "lines":
+            self.f.write(s + "\n")
+        else:
+            self.f.write(("[\n" if not self.n else ",\n") + s)
+        self.n += 1
+        return self
+
+    def write_all(self, seq):
+        for item in seq:
+            self.write(item)
+        return self
+
+    def close(self):
+        if self.closed:
+            return self.n
+        if self.mode == "array":
+            self.f.write("\n]\n" if self.n else "[]\n")
+        if self.owned:
+            self.f.close()
+        else:
+            self.f.flush()
+        self.closed = True
+        return self.n
+
+    def abort(self):
+        # a failed run: an owned target keeps its previous contents, not a cut-off array
+        if self.closed:
+            return
+        if self.owned:
+            self.f.abort()
+        else:
+            self.f.flush()
+        self.closed = True
+
+    def __enter__(self): return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
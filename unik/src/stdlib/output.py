@@ -0,0 +1,85 @@
+# src/stdlib/output.py
+# Buffered output for `give`:
+#   Sink   - collects text and hands it to the target stream in large writes;
+#            flushes when the buffer passes `limit`, before input is read, at exit,
+#            and after every write when the target is a terminal
+#   out    - the process-wide sink (stdout); `redirect` points it at a file
+# Writers may be threads or tasks: the buffer is guarded by one lock.
+
+import atexit
+import sys
+import threading
+
+LIMIT = 1 << 16
+
+
+class Sink:
+    def __init__(self, stream=None, limit=LIMIT):
+        self.stream = stream          # None: whatever sys.stdout is at write time
+        self.limit = limit
+        self.buf = []
+        self.size = 0
+        self._target = None
+        self._tty = False
+        self._owned = None            # file opened by redirect(), closed by us
+        self.tap = None               # callable that also sees every write (run cache)
+        self.lock = threading.Lock()
+
+    def _retarget(self, target):
+        # sys.stdout can be swapped under us (REPL tools, redirect_stdout): what was
+        # buffered for the old stream goes there first
+        self._drain()
+        self._target = target
+        try:
+            self._tty = target.isatty()
+        except (AttributeError, ValueError):
+            self._tty = False
+
+    def write(self, text):
+        with self.lock:
+            if self.tap is not None:
+                self.tap(text)
+            target = self.stream or sys.stdout
+            if target is not self._target:
+                self._retarget(target)
+            self.buf.append(text)
+            self.size += len(text)
+            if self._tty or self.size >= self.limit:
+                self._drain()
+
+    def line(self, text=""):
+        self.write(text + "\n")
+
+    def _drain(self):
+        if self.buf:
+            data = "".join(self.buf)
+            self.buf.clear()
+            self.size = 0
+            self._target.write(data)
+            if self._tty:
+                self._target.flush()
+
+    def flush(self):
+        with self.lock:
+            self._drain()
+            if self._target is not None:
+                try:
+                    self._target.flush()
+                except (AttributeError, ValueError):
+                    pass
+
+    def redirect(self, path=None, append=False):
+        """Send output to file `path` (None: back to stdout)."""
+        self.flush()
+        with self.lock:
+            if self._owned is not None:
+                self._owned.close()
+                self._owned = None
+            if path is not None:
+                self._owned = open(path, "a" if append else "w", encoding="utf-8", buffering=LIMIT)
+            self.stream = self._owned
+            self._target = None
+
+
+out = Sink()
+atexit.register(out.flush)
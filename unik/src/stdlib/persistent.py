@@ -0,0 +1,423 @@
+# src/stdlib/persistent.py
+# Persistent (immutable, structurally shared) collections for Unik:
+#   PVector - 32-way trie with a tail buffer (Clojure/RRB-style, append-optimized)
+#   PMap    - hash array mapped trie (HAMT)
+# Every update returns a new value in O(log32 n) and shares all untouched nodes
+# with the old one, so keeping earlier versions ("snapshots") costs nothing.
+# Methods that hand out a plain list (PVector.list, PMap.keys / values) build it
+# with the `list_type` given at construction; updated versions keep it.
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_HASH_MASK = (1 << 64) - 1
+
+
+# -------------------------
+# PERSISTENT VECTOR
+# -------------------------
+class PVector:
+    __slots__ = ("_cnt", "_shift", "_root", "_tail", "_list")
+    __hash__ = None
+    unik_methods = frozenset({"get", "set", "push", "pop", "len", "list"})
+
+    def __init__(self, cnt=0, shift=_BITS, root=None, tail=None, list_type=list):
+        self._cnt = cnt
+        self._shift = shift
+        self._root = root if root is not None else []
+        self._tail = tail if tail is not None else []
+        self._list = list_type
+
+    @classmethod
+    def from_iter(cls, items, list_type=list):
+        """Bulk build in O(n): cut leaves of 32, then stack parent levels bottom-up."""
+        items = list(items)
+        n = len(items)
+        if n == 0:
+            return EMPTY_VECTOR if list_type is list else cls(list_type=list_type)
+        tailoff = 0 if n < _WIDTH else ((n - 1) >> _BITS) << _BITS
+        nodes = [items[i:i + _WIDTH] for i in range(0, tailoff, _WIDTH)]
+        shift = _BITS
+        while len(nodes) > _WIDTH:
+            nodes = [nodes[i:i + _WIDTH] for i in range(0, len(nodes), _WIDTH)]
+            shift += _BITS
+        return cls(n, shift, nodes, items[tailoff:], list_type)
+
+    def _tailoff(self):
+        return 0 if self._cnt < _WIDTH else ((self._cnt - 1) >> _BITS) << _BITS
+
+    def _leaf_for(self, i):
+        if i >= self._tailoff():
+            return self._tail
+        node = self._root
+        level = self._shift
+        while level > 0:
+            node = node[(i >> level) & _MASK]
+            level -= _BITS
+        return node
+
+    def _check(self, i):
+        if i < 0:
+            i += self._cnt
+        if not 0 <= i < self._cnt:
+            raise IndexError("pvec index out of range")
+        return i
+
+    def get(self, i):
+        i = self._check(i)
+        return self._leaf_for(i)[i & _MASK]
+
+    def set(self, i, val):
+        if i == self._cnt:
+            return self.push(val)
+        i = self._check(i)
+        if i >= self._tailoff():
+            tail = list(self._tail)
+            tail[i & _MASK] = val
+            return PVector(self._cnt, self._shift, self._root, tail, self._list)
+        return PVector(self._cnt, self._shift, self._assoc(self._shift, self._root, i, val), self._tail, self._list)
+
+    def _assoc(self, level, node, i, val):
+        ret = list(node)
+        if level == 0:
+            ret[i & _MASK] = val
+        else:
+            sub = (i >> level) & _MASK
+            ret[sub] = self._assoc(level - _BITS, node[sub], i, val)
+        return ret
+
+    def push(self, val):
+        cnt = self._cnt
+        if cnt - self._tailoff() < _WIDTH:
+            return PVector(cnt + 1, self._shift, self._root, self._tail + [val], self._list)
+        # tail is full: move it into the tree, growing a level when the root is full
+        tailnode = self._tail
+        shift = self._shift
+        if (cnt >> _BITS) > (1 << shift):
+            root = [self._root, _new_path(shift, tailnode)]
+            shift += _BITS
+        else:
+            root = self._push_tail(shift, self._root, tailnode)
+        return PVector(cnt + 1, shift, root, [val], self._list)
+
+    def _push_tail(self, level, parent, tailnode):
+        sub = ((self._cnt - 1) >> level) & _MASK
+        ret = list(parent)
+        if level == _BITS:
+            node = tailnode
+        elif sub < len(parent):
+            node = self._push_tail(level - _BITS, parent[sub], tailnode)
+        else:
+            node = _new_path(level - _BITS, tailnode)
+        if sub == len(ret):
+            ret.append(node)
+        else:
+            ret[sub] = node
+        return ret
+
+    def pop(self):
+        cnt = self._cnt
+        if cnt == 0:
+            raise IndexError("pop from empty pvec")
+        if cnt == 1:
+            return PVector(list_type=self._list)
+        if cnt - self._tailoff() > 1:
+            return PVector(cnt - 1, self._shift, self._root, self._tail[:-1], self._list)
+        tail = self._leaf_for(cnt - 2)
+        root = self._pop_tail(self._shift, self._root)
+        shift = self._shift
+        if root is None:
+            root = []
+        if shift > _BITS and len(root) == 1:
+            root = root[0]
+            shift -= _BITS
+        return PVector(cnt - 1, shift, root, list(tail), self._list)
+
+    def _pop_tail(self, level, node):
+        sub = ((self._cnt - 2) >> level) & _MASK
+        if level > _BITS:
+            child = self._pop_tail(level - _BITS, node[sub])
+            if child is None and sub == 0:
+                return None
+            ret = node[:sub]
+            if child is not None:
+                ret.append(child)
+            return ret
+        if sub == 0:
+            return None
+        return node[:sub]
+
+    def len(self):
+        return self._cnt
+
+    def list(self):
+        return self._list(self)
+
+    def __len__(self):
+        return self._cnt
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return PVector.from_iter(list(self)[i], self._list)
+        return self.get(i)
+
+    def __setitem__(self, i, val):
+        raise TypeError("pvec is immutable; use v = v.set(i, x)")
+
+    def __iter__(self):
+        tailoff = self._tailoff()
+        for i in range(0, tailoff, _WIDTH):
+            yield from self._leaf_for(i)
+        yield from self._tail
+
+    def __eq__(self, other):
+        if isinstance(other, PVector):
+            return self._cnt == other._cnt and all(a == b for a, b in zip(self, other))
+        try:
+            return len(other) == self._cnt and all(a == b for a, b in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    def __add__(self, other):
+        res = self
+        for v in other:
+            res = res.push(v)
+        return res
+
+    def __repr__(self):
+        return f"pvec({list(self)!r})"
+
+
+def _new_path(level, node):
+    while level > 0:
+        node = [node]
+        level -= _BITS
+    return node
+
+
+EMPTY_VECTOR = PVector()
+
+
+# -------------------------
+# PERSISTENT MAP (HAMT)
+# -------------------------
+class _Bitmap:
+    # entries[i] is either a (key, value) tuple or a child node
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap, entries):
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+class _Collision:
+    # keys whose full 64-bit hashes are equal
+    __slots__ = ("hash", "pairs")
+
+    def __init__(self, h, pairs):
+        self.hash = h
+        self.pairs = pairs
+
+
+def _hash(k):
+    return hash(k) & _HASH_MASK
+
+
+def _merge(shift, h1, p1, h2, p2):
+    if h1 == h2:
+        return _Collision(h1, (p1, p2))
+    b1 = (h1 >> shift) & _MASK
+    b2 = (h2 >> shift) & _MASK
+    if b1 == b2:
+        return _Bitmap(1 << b1, (_merge(shift + _BITS, h1, p1, h2, p2),))
+    entries = (p1, p2) if b1 < b2 else (p2, p1)
+    return _Bitmap((1 << b1) | (1 << b2), entries)
+
+
+def _assoc(node, shift, h, k, v):
+    """Return (new_node, added) for node with key k set to v."""
+    if isinstance(node, _Collision):
+        pairs = list(node.pairs)
+        for i, (pk, pv) in enumerate(pairs):
+            if pk == k:
+                if pv is v:
+                    return node, False
+                pairs[i] = (k, v)
+                return _Collision(node.hash, tuple(pairs)), False
+        if h == node.hash:
+            return _Collision(h, tuple(pairs) + ((k, v),)), True
+        # different hash: push the collision node one level down next to the new pair
+        sub = _Bitmap(1 << ((node.hash >> shift) & _MASK), (node,))
+        return _assoc(sub, shift, h, k, v)
+    bit = 1 << ((h >> shift) & _MASK)
+    idx = (node.bitmap & (bit - 1)).bit_count()
+    entries = node.entries
+    if not node.bitmap & bit:
+        return _Bitmap(node.bitmap | bit, entries[:idx] + ((k, v),) + entries[idx:]), True
+    e = entries[idx]
+    if isinstance(e, tuple):
+        ek, ev = e
+        if ek == k:
+            if ev is v:
+                return node, False
+            new, added = (k, v), False
+        else:
+            new, added = _merge(shift + _BITS, _hash(ek), e, h, (k, v)), True
+    else:
+        new, added = _assoc(e, shift + _BITS, h, k, v)
+        if new is e:
+            return node, False
+    return _Bitmap(node.bitmap, entries[:idx] + (new,) + entries[idx + 1:]), added
+
+
+def _single_pair(node):
+    if isinstance(node, _Collision):
+        return node.pairs[0] if len(node.pairs) == 1 else None
+    if len(node.entries) == 1 and isinstance(node.entries[0], tuple):
+        return node.entries[0]
+    return None
+
+
+def _dissoc(node, shift, h, k):
+    """Return (new_node or None when emptied, removed)."""
+    if isinstance(node, _Collision):
+        pairs = tuple(p for p in node.pairs if p[0] != k)
+        if len(pairs) == len(node.pairs):
+            return node, False
+        return (_Collision(node.hash, pairs) if pairs else None), True
+    bit = 1 << ((h >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return node, False
+    idx = (node.bitmap & (bit - 1)).bit_count()
+    entries = node.entries
+    e = entries[idx]
+    if isinstance(e, tuple):
+        if e[0] != k:
+            return node, False
+        new = None
+    else:
+        new, removed = _dissoc(e, shift + _BITS, h, k)
+        if not removed:
+            return node, False
+        if new is not None:
+            new = _single_pair(new) or new
+    if new is None:
+        bitmap = node.bitmap & ~bit
+        if not bitmap:
+            return None, True
+        return _Bitmap(bitmap, entries[:idx] + entries[idx + 1:]), True
+    return _Bitmap(node.bitmap, entries[:idx] + (new,) + entries[idx + 1:]), True
+
+
+def _lookup(node, h, k, default):
+    shift = 0
+    while True:
+        if isinstance(node, _Collision):
+            for pk, pv in node.pairs:
+                if pk == k:
+                    return pv
+            return default
+        bit = 1 << ((h >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return default
+        e = node.entries[(node.bitmap & (bit - 1)).bit_count()]
+        if isinstance(e, tuple):
+            return e[1] if e[0] == k else default
+        node = e
+        shift += _BITS
+
+
+def _walk(node):
+    if isinstance(node, _Collision):
+        yield from node.pairs
+        return
+    for e in node.entries:
+        if isinstance(e, tuple):
+            yield e
+        else:
+            yield from _walk(e)
+
+
+_MISSING = object()
+
+
+class PMap:
+    __slots__ = ("_root", "_cnt", "_list")
+    __hash__ = None
+    unik_methods = frozenset({"get", "set", "remove", "has", "keys", "values", "len", "dict"})
+
+    def __init__(self, root=None, cnt=0, list_type=list):
+        self._root = root if root is not None else _Bitmap(0, ())
+        self._cnt = cnt
+        self._list = list_type
+
+    @classmethod
+    def from_items(cls, items, list_type=list):
+        m = EMPTY_MAP if list_type is list else cls(list_type=list_type)
+        for k, v in items:
+            m = m.set(k, v)
+        return m
+
+    def get(self, k, default=None):
+        return _lookup(self._root, _hash(k), k, default)
+
+    def has(self, k):
+        return _lookup(self._root, _hash(k), k, _MISSING) is not _MISSING
+
+    def set(self, k, v):
+        root, added = _assoc(self._root, 0, _hash(k), k, v)
+        if root is self._root:
+            return self
+        return PMap(root, self._cnt + 1 if added else self._cnt, self._list)
+
+    def remove(self, k):
+        root, removed = _dissoc(self._root, 0, _hash(k), k)
+        if not removed:
+            return self
+        return PMap(root, self._cnt - 1, self._list)
+
+    def keys(self):
+        return self._list([k for k, _ in _walk(self._root)])
+
+    def values(self):
+        return self._list([v for _, v in _walk(self._root)])
+
+    def items(self):
+        return _walk(self._root)
+
+    def len(self):
+        return self._cnt
+
+    def dict(self):
+        return dict(_walk(self._root))
+
+    def __len__(self):
+        return self._cnt
+
+    def __contains__(self, k):
+        return self.has(k)
+
+    def __getitem__(self, k):
+        v = _lookup(self._root, _hash(k), k, _MISSING)
+        if v is _MISSING:
+            raise KeyError(k)
+        return v
+
+    def __setitem__(self, k, v):
+        raise TypeError("pmap is immutable; use m = m.set(k, v)")
+
+    def __iter__(self):
+        return (k for k, _ in _walk(self._root))
+
+    def __eq__(self, other):
+        if isinstance(other, (PMap, dict)):
+            if len(other) != self._cnt:
+                return False
+            return all(k in other and other[k] == v for k, v in _walk(self._root))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"pmap({dict(_walk(self._root))!r})"
+
+
+EMPTY_MAP = PMap()
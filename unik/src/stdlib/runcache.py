@@ -0,0 +1,252 @@
+# src/stdlib/runcache.py
+# Whole-run result cache (`main.py --cache script.unik args...`):
+#   run key    - digest of the script's token stream (the program, not its
+#                formatting or comments), its arguments and the runtime itself
+#                (main.py and the stdlib sources)
+#   Trace      - what one run consumed and produced: `ask` answers, digests of
+#                files read through the runtime, files written, captured stdout
+#   RunCache   - recorded traces per run key; `lookup` replays a trace whose
+#                inputs still match, `store` records a finished run
+# Anything the trace cannot pin down (aik, output redirection, stdin outside
+# `ask`, timing and task interleaving, ...) calls `taint()` and the run is simply
+# not stored.
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+CACHE_DIR = ".unik_run_cache"
+MAX_VARIANTS = 8            # recorded traces kept per run key
+MAX_CAPTURE = 64 << 20      # stdout / output bytes a cacheable run may produce
+READ_BLOCK = 1 << 20
+
+current = None              # the Trace of the run in progress, if caching
+
+
+def digest_file(path):
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb", buffering=0) as f:
+        for block in iter(lambda: f.read(READ_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def hash_tokens(h, tokens):
+    # feeds a token stream to hasher `h`; shared with main.source_digest (builds)
+    for t in tokens:
+        h.update(f"{t.type}\x1f{t.value}\x1e".encode("utf-8"))
+    return h
+
+
+_runtime = None
+
+
+def runtime_digest():
+    # a changed interpreter or stdlib must not replay runs recorded by the old one
+    global _runtime
+    if _runtime is None:
+        stdlib = os.path.dirname(os.path.abspath(__file__))
+        root = os.path.dirname(os.path.dirname(stdlib))
+        paths = [os.path.join(root, "main.py")]
+        paths += [os.path.join(stdlib, n) for n in sorted(os.listdir(stdlib)) if n.endswith(".py")]
+        h = hashlib.blake2b(digest_size=20)
+        for path in paths:
+            h.update(f"{os.path.basename(path)}\x1f{digest_file(path)}\x1e".encode("utf-8"))
+        _runtime = h.hexdigest()
+    return _runtime
+
+
+def run_key(tokens, args):
+    h = hashlib.blake2b(digest_size=20)
+    h.update(runtime_digest().encode("ascii"))
+    h.update(os.getcwd().encode("utf-8", "surrogateescape"))   # relative paths resolve here
+    hash_tokens(h, tokens)
+    h.update(json.dumps(list(args)).encode("utf-8"))
+    return h.hexdigest()
+
+
+# -------------------------
+# HOOKS (called by the runtime; no-ops unless a run is being traced)
+# -------------------------
+def note_read(path):
+    if current is not None:
+        current.read(path)
+
+
+def note_input(text):
+    if current is not None:
+        current.inputs.append(text)
+
+
+def note_write(path, append, start=0):
+    if current is not None:
+        current.write(path, append, start)
+
+
+def taint(reason):
+    if current is not None and current.reason is None:
+        current.reason = reason
+
+
+class Trace:
+    def __init__(self):
+        self.inputs = []
+        self.reads = {}             # abs path -> digest at first read
+        self.writes = {}            # abs path -> (path as given, append, start offset)
+        self.stdout = []
+        self.size = 0
+        self.reason = None          # why this run cannot be cached
+
+    def read(self, path):
+        ap = os.path.abspath(os.fspath(path))
+        if ap in self.reads or ap in self.writes:
+            return                  # our own output: covered by the write record
+        try:
+            self.reads[ap] = digest_file(ap)
+        except OSError:
+            self.reads[ap] = None
+
+    def write(self, path, append, start):
+        ap = os.path.abspath(os.fspath(path))
+        if ap not in self.writes:
+            self.writes[ap] = (os.fspath(path), append, start)
+
+    def capture(self, text):
+        self.stdout.append(text)
+        self.size += len(text)
+        if self.size > MAX_CAPTURE:
+            self.stdout.clear()
+            taint("output too large")
+
+
+class RunCache:
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+        self.blobs = os.path.join(root, "blobs")
+        self.entries = os.path.join(root, "runs")
+
+    def _entry_path(self, key):
+        return os.path.join(self.entries, key + ".json")
+
+    def _load(self, key):
+        try:
+            with open(self._entry_path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _put_blob(self, data):
+        d = hashlib.blake2b(data, digest_size=20).hexdigest()
+        p = os.path.join(self.blobs, d)
+        if not os.path.exists(p):
+            os.makedirs(self.blobs, exist_ok=True)
+            tmp = f"{p}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, p)
+        return d
+
+    def _blob(self, d):
+        with open(os.path.join(self.blobs, d), "rb") as f:
+            return f.read()
+
+    # -------------------------
+    # LOOKUP / REPLAY
+    # -------------------------
+    def lookup(self, key, stdin):
+        """The recorded trace that matches current inputs, or None.
+
+        `stdin` is a LineFeed: answers read to compare against a recording are
+        kept, so a run that has to execute after all still sees them.
+        """
+        for rec in self._load(key):
+            if all(_digest_or_none(p) == d for p, d in rec["reads"].items()) \
+                    and stdin.matches(rec["inputs"]):
+                return rec
+        return None
+
+    def replay(self, rec, out):
+        for w in rec["writes"]:
+            data = self._blob(w["blob"])
+            if w["append"]:
+                with open(w["path"], "ab") as f:
+                    f.write(data)
+            else:
+                tmp = f"{w['path']}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, w["path"])
+        out.write(self._blob(rec["stdout"]).decode("utf-8"))
+
+    # -------------------------
+    # STORE
+    # -------------------------
+    def store(self, key, trace):
+        if trace.reason is not None:
+            return False
+        writes = []
+        for ap, (path, append, start) in trace.writes.items():
+            try:
+                with open(ap, "rb") as f:
+                    f.seek(start if append else 0)
+                    data = f.read(MAX_CAPTURE + 1)
+            except OSError:
+                return False
+            if len(data) > MAX_CAPTURE:
+                return False
+            writes.append({"path": path, "append": append, "blob": self._put_blob(data)})
+        rec = {"reads": trace.reads, "inputs": trace.inputs, "writes": writes,
+               "stdout": self._put_blob("".join(trace.stdout).encode("utf-8"))}
+        recs = [r for r in self._load(key) if (r["reads"], r["inputs"]) != (rec["reads"], rec["inputs"])]
+        recs = [rec] + recs[:MAX_VARIANTS - 1]
+        os.makedirs(self.entries, exist_ok=True)
+        tmp = f"{self._entry_path(key)}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(recs, f)
+        os.replace(tmp, self._entry_path(key))
+        return True
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def _digest_or_none(path):
+    try:
+        return digest_file(path)
+    except OSError:
+        return None
+
+
+class LineFeed:
+    """stdin for `ask`, with lines already read for cache matching served first."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.pending = []
+
+    def _more(self):
+        line = (self.stream or sys.stdin).readline()
+        if not line:
+            return None
+        line = line[:-1] if line.endswith("\n") else line
+        self.pending.append(line)
+        return line
+
+    def matches(self, answers):
+        if answers and (self.stream or sys.stdin).isatty():
+            return False            # never read ahead from a person at a terminal
+        for i, a in enumerate(answers):
+            have = self.pending[i] if i < len(self.pending) else self._more()
+            if have != a:
+                return False
+        return True
+
+    def readline(self):
+        if self.pending:
+            return self.pending.pop(0)
+        line = self._more()
+        if line is None:
+            raise EOFError("ask: end of input")
+        return self.pending.pop()
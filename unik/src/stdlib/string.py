@@ -0,0 +1,214 @@
+# src/stdlib/string.py
+# String search for Unik:
+#   Automaton - Aho-Corasick multi-pattern matcher: built once, then every search
+#               is a single left-to-right pass over the text, however many
+#               patterns there are (O(text + matches) instead of O(patterns x text));
+#               ignore_case compares casefolded text, offsets stay in the original
+#   Scanner   - streaming front end of an Automaton for text that arrives in chunks
+#   find_all / count - single-pattern search on top of str.find / str.count
+# Matches are (start, pattern) pairs with 0-based start offsets into the text.
+
+
+# -------------------------
+# AHO-CORASICK AUTOMATON
+# -------------------------
+class Automaton:
+    __slots__ = ("patterns", "ignore_case", "list_type", "stream_type", "_goto", "_fail", "_out", "_lens")
+    unik_methods = frozenset({"find_all", "count", "counts", "contains", "first", "scan", "stream"})
+
+    def __init__(self, patterns, ignore_case=False, list_type=list, stream_type=iter):
+        """Build the trie, then the failure links breadth-first.
+
+        Each state's output list already includes the outputs of every state on
+        its failure chain, so reporting a match never walks the chain again.
+        ignore_case matches on str.casefold; list_type / stream_type build the
+        values find_all / feed and scan return.
+        """
+        seen = {}
+        for p in patterns:
+            p = p if isinstance(p, str) else str(p)
+            if not p:
+                raise ValueError("empty pattern")
+            seen.setdefault(p.casefold() if ignore_case else p, None)
+        self.patterns = list(seen)
+        self.ignore_case = ignore_case
+        self.list_type = list_type
+        self.stream_type = stream_type
+        self._lens = [len(p) for p in self.patterns]
+        goto, out = [{}], [()]
+        for k, p in enumerate(self.patterns):
+            s = 0
+            for ch in p:
+                nxt = goto[s].get(ch)
+                if nxt is None:
+                    nxt = goto[s][ch] = len(goto)
+                    goto.append({})
+                    out.append(())
+                s = nxt
+            out[s] = out[s] + (k,)
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for s in queue:  # grows while iterating: a BFS over the trie
+            for ch, nxt in goto[s].items():
+                f = fail[s]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+                queue.append(nxt)
+        self._goto, self._fail, self._out = goto, fail, out
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def __repr__(self):
+        return f"<matcher {len(self.patterns)} patterns>"
+
+    def _fold(self):
+        return _Fold(max(self._lens)) if self.ignore_case else None
+
+    def _run(self, text, state=0, base=0, fold=None):
+        # the matching loop: yields (start, pattern) lazily, so contains/first can
+        # stop at the first hit, and returns the state to resume from
+        goto, fail, out, lens, pats = self._goto, self._fail, self._out, self._lens, self.patterns
+        chars = enumerate(text) if fold is None else fold.chars(text, base)
+        for i, ch in chars:
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt if nxt is not None else 0
+            if out[state]:
+                for k in out[state]:
+                    yield (base + i - lens[k] + 1 if fold is None else fold.start(lens[k])), pats[k]
+        return state
+
+    def _matches(self, text):
+        return self._run(text, fold=self._fold())
+
+    def _feed(self, text, state, base, found, fold=None):
+        # eager pass that appends to `found` and returns the state to resume from
+        run = self._run(text, state, base, fold)
+        add = found.append
+        while True:
+            try:
+                add(next(run))
+            except StopIteration as stop:
+                return stop.value
+
+    def find_all(self, text):
+        """Every occurrence of every pattern, overlapping ones included, in order of where they end."""
+        return self.list_type(self._matches(text))
+
+    def count(self, text):
+        n = 0
+        for _ in self._matches(text):
+            n += 1
+        return n
+
+    def counts(self, text):
+        """{pattern: occurrences} for the patterns that occur at least once."""
+        tally = {}
+        for _, p in self._matches(text):
+            tally[p] = tally.get(p, 0) + 1
+        return tally
+
+    def contains(self, text):
+        for _ in self._matches(text):
+            return True
+        return False
+
+    def first(self, text):
+        """The match that ends first, or None."""
+        return next(self._matches(text), None)
+
+    def scan(self, chunks):
+        """Lazily match over an iterable of chunks (e.g. file lines) as one continuous text."""
+        def gen():
+            sc = self.stream()
+            for chunk in chunks:
+                yield from sc.feed(chunk)
+        return self.stream_type(gen())
+
+    def stream(self):
+        return Scanner(self)
+
+
+class _Fold:
+    """Case-folded view of a text for ignore_case matching.
+
+    One character can fold to several ('ß' -> 'ss'), so positions in the folded
+    text drift from positions in the original. A ring of the source offsets of
+    the last `size` folded characters maps a match start back into the text.
+    """
+    __slots__ = ("ring", "n")
+
+    def __init__(self, size):
+        self.ring = [0] * size
+        self.n = 0
+
+    def chars(self, text, base):
+        ring, size = self.ring, len(self.ring)
+        for i, ch in enumerate(text):
+            for c in ch.casefold():
+                ring[self.n % size] = base + i
+                self.n += 1
+                yield i, c
+
+    def start(self, length):
+        return self.ring[(self.n - length) % len(self.ring)]
+
+
+class Scanner:
+    """Incremental matcher: `feed` chunks in order and get the matches they complete.
+
+    The automaton state is carried from one chunk to the next, so a pattern split
+    across a chunk boundary is still found, with its offset in the whole stream.
+    """
+    __slots__ = ("automaton", "_state", "_offset", "_fold")
+    unik_methods = frozenset({"feed", "offset", "reset"})
+
+    def __init__(self, automaton):
+        self.automaton = automaton
+        self.reset()
+
+    def feed(self, chunk):
+        chunk = chunk if isinstance(chunk, str) else str(chunk)
+        found = []
+        self._state = self.automaton._feed(chunk, self._state, self._offset, found, self._fold)
+        self._offset += len(chunk)
+        return self.automaton.list_type(found)
+
+    def offset(self):
+        return self._offset
+
+    def reset(self):
+        self._state = 0
+        self._offset = 0
+        self._fold = self.automaton._fold()
+        return self
+
+
+# -------------------------
+# SINGLE PATTERN
+# -------------------------
+def find_all(text, pattern, overlap=False):
+    """Start offsets of `pattern` in `text`; str.find does the scanning in C."""
+    if not pattern:
+        raise ValueError("empty pattern")
+    step = 1 if overlap else len(pattern)
+    out = []
+    find = text.find
+    i = find(pattern)
+    while i >= 0:
+        out.append(i)
+        i = find(pattern, i + step)
+    return out
+
+
+def count(text, pattern, overlap=False):
+    if not pattern:
+        raise ValueError("empty pattern")
+    if not overlap:
+        return text.count(pattern)
+    return len(find_all(text, pattern, True))
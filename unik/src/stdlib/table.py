@@ -0,0 +1,428 @@
+# src/stdlib/table.py
+# Columnar tables for Unik:
+#   Table    - named NumPy columns of equal length; where/select/sort_by/join/group_by
+#              all run as whole-column operations, and rows (dicts) are only built
+#              when a script asks for them (row, head, rows, iteration)
+#   GroupBy  - key codes computed once, then agg() reduces every column with bincount
+#              (reduceat for exact int sums, min and max; other callables per group)
+#   read_csv - chunked reader: a block of lines at a time, only the requested
+#              columns are converted, each to int64 / float64 / bool / str
+# Needs NumPy.
+
+import csv
+import itertools
+import operator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_OPS = {"==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le,
+        ">": operator.gt, ">=": operator.ge}
+_AGGS = ("sum", "mean", "count", "min", "max")
+_TRUE, _FALSE = ("true", "True", "TRUE"), ("false", "False", "FALSE")
+
+
+def _unwrap(x):
+    # vector values carry their ndarray in .data (an ndarray's own .data is a raw buffer)
+    if isinstance(x, np.ndarray):
+        return x
+    d = getattr(x, "data", None)
+    return d if isinstance(d, np.ndarray) else x
+
+
+def _need_numpy():
+    if np is None:
+        raise RuntimeError("tables require NumPy (pip install numpy)")
+
+
+# -------------------------
+# CSV INGEST
+# -------------------------
+def _infer(strs):
+    """One column chunk of strings -> int64, float64 (blank = nan), bool, or object str."""
+    a = np.array(strs)
+    if not a.size:
+        return a.astype(np.int64)
+    try:
+        return a.astype(np.int64)
+    except (ValueError, OverflowError):
+        pass
+    try:
+        return np.where(a == "", "nan", a).astype(np.float64)
+    except ValueError:
+        pass
+    if np.isin(a, _TRUE + _FALSE).all():
+        return np.isin(a, _TRUE)
+    return np.array(strs, dtype=object)
+
+
+def _concat(chunks):
+    # widen across chunks: int -> float -> str; a bool/number mix also becomes str
+    kinds = {c.dtype.kind for c in chunks}
+    if len(kinds) > 1:
+        if kinds <= {"i", "f"}:
+            chunks = [c.astype(np.float64) for c in chunks]
+        else:
+            chunks = [c if c.dtype.kind == "O" else c.astype(str).astype(object) for c in chunks]
+    return np.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+
+
+def _split_block(lines, sep, ncol):
+    """Rows of a block as one flat list of cells, or None if the fast path does not apply.
+
+    Unquoted, rectangular blocks are split with two C-level str operations; the
+    caller slices columns out of the flat list with a stride of ncol. Every line
+    must hold exactly ncol fields: a short row next to a long one would balance
+    the total and shift cells between rows.
+    """
+    block = "".join(lines)
+    if '"' in block:
+        return None
+    if "\r" in block:
+        block = block.replace("\r", "")
+    block = block.rstrip("\n")
+    if any(line.count(sep) != ncol - 1 for line in lines):
+        return None   # blank or ragged lines
+    flat = block.replace("\n", sep).split(sep)
+    if len(flat) != len(lines) * ncol:
+        return None   # blank or ragged lines
+    return flat
+
+
+def read_csv(path, columns=None, sep=",", header=True, chunk_rows=65536, encoding="utf-8",
+             wrap=None, resolve=None, list_type=list):
+    """Load a CSV file into a Table, `chunk_rows` lines at a time.
+
+    `columns` limits parsing and memory to the named columns; without a header
+    row the columns are named c0, c1, ... `wrap`, `resolve` and `list_type` are
+    passed to Table.
+    """
+    _need_numpy()
+    with open(path, newline="", encoding=encoding) as f:
+        first = f.readline()
+        if not first:
+            return Table({}, wrap, resolve, list_type)
+        names = next(csv.reader([first], delimiter=sep))
+        ncol = len(names)
+        if not header:
+            names = [f"c{i}" for i in range(ncol)]
+            f.seek(0)
+        want = names if columns is None else list(columns)
+        missing = [c for c in want if c not in names]
+        if missing:
+            raise KeyError(f"no column(s) {missing} in {path}")
+        idx = [names.index(c) for c in want]
+        parts = {c: [] for c in want}
+        while True:
+            lines = list(itertools.islice(f, chunk_rows))
+            if not lines:
+                break
+            flat = _split_block(lines, sep, ncol)
+            if flat is not None:
+                for c, j in zip(want, idx):
+                    parts[c].append(_infer(flat[j::ncol]))
+                continue
+            rows = [r for r in csv.reader(lines, delimiter=sep) if r]
+            for c, j in zip(want, idx):
+                parts[c].append(_infer([r[j] if j < len(r) else "" for r in rows]))
+        return Table({c: _concat(p) if p else np.array([], dtype=np.int64) for c, p in parts.items()},
+                     wrap, resolve, list_type)
+
+
+# -------------------------
+# TABLE
+# -------------------------
+class Table:
+    __slots__ = ("cols", "wrap", "resolve", "list_type")
+    unik_methods = frozenset({"columns", "len", "col", "row", "head", "rows", "where", "select",
+                              "with_column", "sort_by", "group_by", "join", "sum", "mean"})
+
+    def __init__(self, cols, wrap=None, resolve=None, list_type=list):
+        """`wrap(array)` is how col() and per-group aggregates hand a column to the
+        caller (default: the ndarray itself). `resolve(f)` turns a non-string
+        aggregate given to agg() into an aggregate name or a Python callable.
+        `list_type` builds the lists columns() and head() return. Tables derived
+        from this one keep all three."""
+        _need_numpy()
+        self.wrap = wrap or _identity
+        self.resolve = resolve
+        self.list_type = list_type
+        self.cols = {}
+        n = None
+        for name, v in cols.items():
+            v = _unwrap(v)
+            a = v if isinstance(v, np.ndarray) else _infer_values(list(v))
+            if n is not None and len(a) != n:
+                raise ValueError(f"column {name!r} has {len(a)} rows, expected {n}")
+            n = len(a)
+            self.cols[name] = a
+
+    def _c(self, name):
+        try:
+            return self.cols[name]
+        except KeyError:
+            raise KeyError(f"no column {name!r}") from None
+
+    def _derive(self, cols):
+        return Table(cols, self.wrap, self.resolve, self.list_type)
+
+    def _take(self, idx):
+        return self._derive({k: v[idx] for k, v in self.cols.items()})
+
+    def columns(self): return self.list_type(self.cols)
+
+    def len(self):
+        return len(next(iter(self.cols.values()))) if self.cols else 0
+
+    def col(self, name): return self.wrap(self._c(name))
+
+    # -------------------------
+    # ROWS (materialized on demand)
+    # -------------------------
+    def row(self, i):
+        return {k: v[i].item() if hasattr(v[i], "item") else v[i] for k, v in self.cols.items()}
+
+    def rows(self, start=0, stop=None):
+        """Row dicts, converted a slice of columns at a time."""
+        stop = self.len() if stop is None else min(stop, self.len())
+        names = list(self.cols)
+        step = 4096
+        for a in range(start, stop, step):
+            b = min(a + step, stop)
+            for vals in zip(*(self.cols[k][a:b].tolist() for k in names)):
+                yield dict(zip(names, vals))
+
+    def head(self, n=5): return self.list_type(self.rows(0, n))
+
+    def __iter__(self): return self.rows()
+    def __len__(self): return self.len()
+
+    # -------------------------
+    # RELATIONAL OPERATIONS
+    # -------------------------
+    def where(self, a, op=None, value=None):
+        """Rows where `column op value` holds, or where a boolean mask is true."""
+        if op is None:
+            mask = np.asarray(_unwrap(a), dtype=bool)
+        else:
+            col = self._c(a)
+            mask = _OPS[op](col, _unwrap(value))
+        return self._take(np.flatnonzero(mask))
+
+    def select(self, *names):
+        if len(names) == 1 and not isinstance(names[0], str):
+            names = tuple(names[0])
+        return self._derive({n: self._c(n) for n in names})
+
+    def with_column(self, name, values):
+        cols = dict(self.cols)
+        cols[name] = values
+        return self._derive(cols)
+
+    def sort_by(self, keys, desc=False):
+        """Stable sort on one column name or a list of names (first name most significant)."""
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        order = np.arange(self.len())
+        for k in reversed(keys):
+            col = self._c(k)[order]
+            if desc:
+                # sort on negated ranks: still stable, so ties keep their input order
+                col = -_factorize(col)[1]
+            order = order[np.argsort(col, kind="stable")]
+        return self._take(order)
+
+    def group_by(self, *keys):
+        if len(keys) == 1 and not isinstance(keys[0], str):
+            keys = tuple(keys[0])
+        return GroupBy(self, list(keys))
+
+    def join(self, other, on, how="inner"):
+        """Equi-join on column `on` (how = "inner" or "left").
+
+        The right keys are sorted once; each left key then finds its run of
+        matches by binary search, so matching is vectorized over all left rows.
+        Right columns that clash with left names get a `_right` suffix.
+        """
+        if how not in ("inner", "left"):
+            raise ValueError(f"unsupported join {how!r}")
+        lk, rk = self._c(on), other._c(on)
+        order = np.argsort(rk, kind="stable")
+        rs = rk[order]
+        lo = np.searchsorted(rs, lk, "left")
+        hi = np.searchsorted(rs, lk, "right")
+        counts = hi - lo
+        if how == "left":
+            counts_out = np.maximum(counts, 1)
+        else:
+            counts_out = counts
+        total = int(counts_out.sum())
+        left_idx = np.repeat(np.arange(len(lk)), counts_out)
+        within = np.arange(total) - np.repeat(np.cumsum(counts_out) - counts_out, counts_out)
+        matched = within < np.repeat(counts, counts_out)
+        right_pos = np.repeat(lo, counts_out) + within
+        right_idx = order[np.where(matched, right_pos, 0)] if len(rk) else np.zeros(total, dtype=np.int64)
+        cols = {k: v[left_idx] for k, v in self.cols.items()}
+        for k, v in other.cols.items():
+            if k == on:
+                continue
+            vals = v[right_idx] if len(v) else np.empty(total, dtype=v.dtype)
+            if how == "left" and not matched.all():
+                vals = vals.astype(np.float64 if vals.dtype.kind in "iufb" else object)
+                vals[~matched] = np.nan if vals.dtype.kind == "f" else None
+            cols[k + "_right" if k in cols else k] = vals
+        return self._derive(cols)
+
+    def sum(self, name): return self._c(name).sum().item()
+    def mean(self, name): return self._c(name).mean().item()
+
+    def __repr__(self):
+        n = self.len()
+        head = "\n".join(str(r) for r in self.head(5))
+        more = f"\n... {n - 5} more rows" if n > 5 else ""
+        return f"<table {n} rows x {len(self.cols)} columns {self.columns()}>" + (f"\n{head}{more}" if n else "")
+
+
+def _identity(a):
+    return a
+
+
+def _infer_values(values):
+    # a Python list -> column array (numbers stay numeric, anything else is object)
+    if all(type(v) is bool for v in values):
+        return np.array(values, dtype=bool)
+    if all(type(v) is int for v in values):
+        return np.array(values, dtype=np.int64)
+    if all(type(v) in (int, float) for v in values):
+        return np.array(values, dtype=np.float64)
+    return np.array(values, dtype=object)
+
+
+def _factorize(col):
+    """(sorted distinct values, index of each row's value among them)."""
+    if col.dtype.kind != "O":
+        return np.unique(col, return_inverse=True)
+    # strings: hash into first-seen codes in one pass, then sort only the distinct values
+    seen = {}
+    codes = np.fromiter((seen.setdefault(v, len(seen)) for v in col), dtype=np.int64, count=len(col))
+    uniq = np.empty(len(seen), dtype=object)
+    uniq[:] = list(seen)
+    order = np.argsort(uniq, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return uniq[order], rank[codes]
+
+
+class GroupBy:
+    """Rows of a Table grouped by key columns; `agg` produces one row per group."""
+    __slots__ = ("table", "keys", "_codes", "_uniq")
+    unik_methods = frozenset({"agg", "count"})
+
+    def __init__(self, table, keys):
+        self.table = table
+        self.keys = keys
+        # dense group id per row: codes per key, combined into one code and re-densified
+        codes, uniq = None, []
+        for k in keys:
+            u, inv = _factorize(table._c(k))
+            uniq.append(u)
+            codes = inv if codes is None else codes * len(u) + inv
+        if codes is None:
+            codes = np.zeros(table.len(), dtype=np.int64)
+        groups, self._codes = np.unique(codes, return_inverse=True)
+        self._uniq = (uniq, groups)
+
+    def _key_columns(self):
+        uniq, groups = self._uniq
+        out = {}
+        rest = groups
+        for k, u in reversed(list(zip(self.keys, uniq))):
+            out[k] = u[rest % len(u)]
+            rest = rest // len(u)
+        return {k: out[k] for k in self.keys}
+
+    def count(self):
+        return self.agg("count")
+
+    def _aggregate(self, f):
+        # (name, None) for a built-in aggregate, (label, fn) for a callable run per group
+        if isinstance(f, str):
+            if f in _AGGS:
+                return f, None
+        else:
+            r = self.table.resolve(f) if self.table.resolve is not None else f
+            if isinstance(r, str) and r in _AGGS:
+                return r, None
+            if callable(r):
+                name = getattr(r, "__name__", "agg")
+                return ("agg" if name == "<lambda>" else name), r
+        raise ValueError(f"unknown aggregate {f!r} (use one of {', '.join(_AGGS)} or a function)")
+
+    def agg(self, *spec):
+        """agg("sum", "mean", "count") applies each to every numeric non-key column;
+        agg({"price": "mean", "qty": ["sum", "max"]}) picks per column. Functions
+        work too: the table's `resolve` maps known ones to these names, others are
+        called once per group with the group's values."""
+        t = self.table
+        if len(spec) == 1 and isinstance(spec[0], dict):
+            plan = [(c, [self._aggregate(f) for f in ([fs] if isinstance(fs, str) else fs)])
+                    for c, fs in spec[0].items()]
+        else:
+            fs = [self._aggregate(f) for f in spec]
+            numeric = [c for c, v in t.cols.items()
+                       if c not in self.keys and v.dtype.kind in "iufb"]
+            plan = [(c, [f for f in fs if f[0] != "count"]) for c in numeric]
+            if any(f[0] == "count" for f in fs):
+                plan.append((None, [("count", None)]))
+        codes = self._codes
+        ng = len(self._uniq[1])
+        sizes = np.bincount(codes, minlength=ng)
+        out = self._key_columns()
+        order = starts = None
+        for c, fs in plan:
+            v = None if c is None else t._c(c)
+            exact = v is not None and v.dtype.kind in "iub"
+            for f, fn in fs:
+                name = f if c is None else f"{c}_{f}"
+                if f == "count" and fn is None:
+                    out[name] = sizes
+                    continue
+                if order is None and (fn is not None or f in ("min", "max") or exact):
+                    order = np.argsort(codes, kind="stable")
+                    starts = np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.int64) if ng \
+                        else np.zeros(0, dtype=np.int64)
+                if fn is not None:
+                    vals = v[order] if v is not None else order
+                    ends = np.append(starts[1:], len(vals))
+                    res = [fn(t.wrap(vals[a:b])) for a, b in zip(starts.tolist(), ends.tolist())]
+                    out[name] = _infer_values([x.item() if hasattr(x, "item") else x for x in res])
+                elif f in ("sum", "mean") and exact:
+                    total = _int_sums(v[order], starts)
+                    out[name] = total if f == "sum" else total / sizes
+                elif f == "sum":
+                    out[name] = np.bincount(codes, weights=v, minlength=ng)
+                elif f == "mean":
+                    out[name] = np.bincount(codes, weights=v, minlength=ng) / sizes
+                else:
+                    ufunc = np.minimum if f == "min" else np.maximum
+                    out[name] = ufunc.reduceat(v[order], starts) if len(v) else v[:0]
+        return t._derive(out)
+
+
+def _int_sums(vals, starts):
+    """Exact per-group sums of an int / bool column sorted by group.
+
+    int64 reduceat is exact unless a sum leaves the int64 range; the float64
+    estimate flags that case, and those sums are redone with Python ints.
+    """
+    if not len(vals):
+        return np.zeros(len(starts), dtype=np.int64)
+    vals = vals.astype(np.int64, copy=False)
+    total = np.add.reduceat(vals, starts)
+    rough = np.add.reduceat(vals.astype(np.float64), starts)
+    if np.abs(rough).max() >= 2.0 ** 62:
+        ends = np.append(starts[1:], len(vals))
+        total = np.array([sum(vals[a:b].tolist()) for a, b in zip(starts.tolist(), ends.tolist())],
+                         dtype=object)
+    return total
@@ -0,0 +1,266 @@
+# src/stdlib/tasks.py
+# Cooperative tasks for `task` / `run` / `await` / `wait`, on one asyncio loop:
+#   a suspendable Unik body is a Python generator that yields requests
+#   (Sleep, Await, Gather, Blocking) at `wait` / `await` / `run` / `ask`; Scheduler.drive turns
+#   it into a coroutine that carries those requests out on the loop, so each Unik
+#   task costs one generator + one asyncio.Task (no threads, no stacks)
+#   Scheduler   - the loop, the task cap (a semaphore on *running* tasks),
+#                 spawn / timeouts / cancellation, blocking reads moved off the
+#                 loop, draining spawned tasks at program end, and a blocking
+#                 fallback for code that is not running under the loop
+#   TaskHandle  - what spawn() returns: cancel, done, cancelled, result
+# Output that depends on timing or on how tasks interleave cannot be replayed,
+# so spawn, timeouts, sleeps and gathers of several tasks taint a cached run.
+
+import asyncio
+import threading
+
+from src.stdlib import runcache
+
+MAX_RUNNING = 16384
+
+
+class Sleep:
+    __slots__ = ("seconds",)
+    def __init__(self, seconds): self.seconds = seconds
+
+
+class Await:
+    __slots__ = ("target",)
+    def __init__(self, target): self.target = target
+
+
+class Gather:
+    __slots__ = ("targets",)
+    def __init__(self, targets): self.targets = targets
+
+
+class Blocking:
+    """A blocking read (`ask` inside a task): fn() runs on a thread while other tasks go on."""
+    __slots__ = ("fn",)
+    def __init__(self, fn): self.fn = fn
+
+
+class Timeout:
+    """`timeout(x, seconds)`: awaiting it awaits x, or fails after `seconds`."""
+    __slots__ = ("target", "seconds")
+    def __init__(self, target, seconds): self.target = target; self.seconds = seconds
+
+
+class AsyncCall:
+    """The result of calling an `async` function: the suspended call, started when awaited."""
+    __slots__ = ("make",)
+    def __init__(self, make): self.make = make      # make() -> body generator
+    def __repr__(self): return "<async call>"
+
+
+class TaskHandle:
+    unik_methods = frozenset({"cancel", "done", "cancelled", "result"})
+
+    def __init__(self, task, name=None):
+        self.task = task
+        self.name = name
+
+    def cancel(self): return self.task.cancel()
+    def done(self): return self.task.done()
+    def cancelled(self): return self.task.cancelled()
+    def result(self): return self.task.result() if self.task.done() else None
+    def __repr__(self): return f"<task {self.name or ''}{' done' if self.task.done() else ''}>"
+
+
+class Scheduler:
+    def __init__(self, max_running=MAX_RUNNING):
+        self.max_running = max_running
+        self.loop = None
+        self._sem = None
+        self._spawned = set()   # spawned tasks not yet done (admitted or queued)
+        self._io = None         # one blocking read at a time, in request order
+
+    def _ensure_loop(self):
+        if self.loop is None or self.loop.is_closed():
+            self.loop = asyncio.new_event_loop()
+            self._sem = self._io = None
+            self._spawned = set()
+        return self.loop
+
+    def running(self):
+        return self.loop is not None and self.loop.is_running()
+
+    def set_limit(self, n):
+        # the semaphore cannot be resized under tasks that hold or wait on it, and a
+        # new one beside it would let both sets run: change the cap between batches
+        if self._spawned:
+            raise RuntimeError("task_limit while spawned tasks are pending; await them first")
+        self.max_running = max(1, int(n))
+        self._sem = None
+
+    # -------------------------
+    # DRIVING GENERATORS
+    # -------------------------
+    async def drive(self, gen):
+        value = error = None
+        while True:
+            try:
+                req = gen.send(value) if error is None else gen.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            value = error = None
+            try:
+                value = await self.awaitable(req)
+            except asyncio.CancelledError:
+                gen.close()         # unwinds the Unik body; its finally blocks run
+                raise
+            except Exception as e:
+                error = e
+
+    def awaitable(self, req):
+        if isinstance(req, Sleep):
+            runcache.taint("wait")
+            return asyncio.sleep(req.seconds)
+        if isinstance(req, Gather):
+            if len(req.targets) > 1:
+                runcache.taint("task interleaving")
+            return asyncio.gather(*(self.awaitable(Await(t)) for t in req.targets))
+        if isinstance(req, Await):
+            return self.to_awaitable(req.target)
+        if isinstance(req, Blocking):
+            return self._off_loop(req.fn)
+        raise TypeError(f"cannot wait on {req!r}")
+
+    async def _off_loop(self, fn):
+        if self._io is None:
+            self._io = asyncio.Lock()
+        async with self._io:
+            return await _in_thread(fn)
+
+    def to_awaitable(self, x):
+        if isinstance(x, AsyncCall):
+            return self.drive(x.make())
+        if isinstance(x, TaskHandle):
+            return x.task
+        if isinstance(x, Timeout):
+            return self._timeout(x)
+        if hasattr(x, "start"):                     # a task definition: run it now
+            return self.drive(x.start())
+        if asyncio.isfuture(x) or asyncio.iscoroutine(x):
+            return x
+        return _ready(x)
+
+    async def _timeout(self, t):
+        runcache.taint("timeout")
+        try:
+            return await asyncio.wait_for(self.to_awaitable(t.target), t.seconds)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"timed out after {t.seconds}s") from None
+
+    def spawn(self, target, name=None):
+        """Start `target` in the background (under the running-task cap)."""
+        runcache.taint("spawn")
+        loop = self._ensure_loop()
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_running)
+        sem = self._sem
+
+        async def capped():
+            async with sem:
+                return await self.to_awaitable(target)      # started only once admitted
+        task = loop.create_task(capped())
+        self._spawned.add(task)
+        task.add_done_callback(self._spawned.discard)
+        return TaskHandle(task, name)
+
+    # -------------------------
+    # ENTRY POINTS
+    # -------------------------
+    def run(self, gen):
+        """Run a suspendable body to completion from synchronous code."""
+        if self.running():
+            # called from plain (non-async) code inside a task: the loop cannot be
+            # re-entered, so only async calls that never wait can be awaited
+            return self.run_blocking(gen)
+        return self._ensure_loop().run_until_complete(self.drive(gen))
+
+    def run_blocking(self, gen):
+        value = error = None
+        while True:
+            try:
+                req = gen.send(value) if error is None else gen.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            value = error = None
+            try:
+                value = self._blocking(req)
+            except Exception as e:
+                error = e
+
+    def _blocking(self, req):
+        if isinstance(req, Sleep):
+            # sleeping here would stall the loop and every other task with it
+            raise RuntimeError("wait in a non-async function; declare the function async")
+        if isinstance(req, Blocking):
+            return req.fn()
+        if isinstance(req, Gather):
+            return [self._blocking(Await(t)) for t in req.targets]
+        t = req.target
+        if isinstance(t, AsyncCall):
+            return self.run_blocking(t.make())
+        if hasattr(t, "start"):
+            return self.run_blocking(t.start())
+        if isinstance(t, (TaskHandle, Timeout)) or asyncio.isfuture(t):
+            raise RuntimeError("await on a task from a non-async function; declare the function async")
+        return t
+
+    def finish(self):
+        """Run spawned tasks to completion (end of program), including ones spawned
+        by code that never suspended and so never gave them a chance to start."""
+        loop = self.loop
+        if loop is None or loop.is_closed() or loop.is_running():
+            return
+        while True:
+            pending = [t for t in asyncio.all_tasks(loop) if not t.done()]
+            if not pending:
+                return
+            loop.run_until_complete(asyncio.wait(pending))     # may spawn more
+
+    def shutdown(self):
+        """Cancel whatever is still running and close the loop (end of program)."""
+        loop = self.loop
+        if loop is None or loop.is_closed() or loop.is_running():
+            return
+        pending = [t for t in asyncio.all_tasks(loop) if not t.done()]
+        for t in pending:
+            t.cancel()
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.close()
+
+
+async def _ready(x):
+    return x
+
+
+def _in_thread(fn):
+    # a daemon thread rather than the loop's executor: a task cancelled while its
+    # read is still blocked must not keep the process alive at exit
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+
+    def settle(value, error):
+        if fut.done():
+            return                  # cancelled meanwhile
+        if error is None:
+            fut.set_result(value)
+        else:
+            fut.set_exception(error)
+
+    def work():
+        try:
+            value, error = fn(), None
+        except BaseException as e:
+            value, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, value, error)
+        except RuntimeError:
+            pass                    # the loop is already closed
+    threading.Thread(target=work, name="unik-io", daemon=True).start()
+    return fut
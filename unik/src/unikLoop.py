@@ -1,16 +1,31 @@
 # unik_repl.py
 import re
 
+try:
+    from src.stdlib.output import out
+except ImportError:             # run as a script from src/
+    from stdlib.output import out
+
+
+def say(*args):
+    out.line(" ".join(map(str, args)))
+
+
+def ask(prompt=""):
+    out.flush()                 # pending output (and the prompt) before blocking
+    return input(prompt)
+
+
 def unik_repl():
     env = {}  # environment to store variables
 
-    print("unik>> Welcome to Unik REPL!")
-    print("Type 'exit' or 'quit' to leave the shell.")
-    print("Use 'load filename.unik' to run a file.")
+    say("unik>> Welcome to Unik REPL!")
+    say("Type 'exit' or 'quit' to leave the shell.")
+    say("Use 'load filename.unik' to run a file.")
     
     while True:
         try:
-            line = input("unik>> ").strip()
+            line = ask("unik>> ").strip()
             if line in ("exit", "quit"):
                 break
 
@@ -22,7 +37,7 @@ def unik_repl():
                         lines = f.readlines()
                     run_unik_lines(lines, env)
                 except Exception as e:
-                    print(f"Error loading file '{filename}': {e}")
+                    say(f"Error loading file '{filename}': {e}")
                 continue
 
             # handle variable assignment
@@ -60,7 +75,7 @@ def unik_repl():
                 continue
 
         except Exception as e:
-            print("Error:", e)
+            say("Error:", e)
 
 
 def read_block():
@@ -68,7 +83,7 @@ def read_block():
     block = []
     open_braces = 1
     while open_braces > 0:
-        line = input().strip()
+        line = ask().strip()
         if "{" in line:
             open_braces += 1
         if "}" in line:
@@ -93,7 +108,7 @@ def read_if_else_block(line, env):
     if_body = []
     open_braces = 1
     while open_braces > 0:
-        l = input().strip()
+        l = ask().strip()
         if "{" in l:
             open_braces += 1
         if "}" in l:
@@ -106,12 +121,12 @@ def read_if_else_block(line, env):
     else_body = []
     # peek ahead
     try:
-        next_line = input().strip()
+        next_line = ask().strip()
         if next_line.startswith("else"):
             # read else body
             open_braces = 1
             while open_braces > 0:
-                l = input().strip()
+                l = ask().strip()
                 if "{" in l:
                     open_braces += 1
                 if "}" in l:
@@ -212,24 +227,23 @@ def exec_unik_line(line, env):
         var, expr = line.split("=", 1)
         env[var.strip()] = eval(expr.strip(), {}, env)
     else:
-        print("Unknown command:", line)
+        say("Unknown command:", line)
 
 
 def give_unik(value, env):
     value = value.strip()
     if value in ('""', "'\\n'", '"\\n"'):
-        print()
+        out.line()
         return
     parts = [v.strip() for v in value.split(",")]
-    out = []
+    parts_out = []
     for v in parts:
         try:
-            out.append(str(eval(v, {}, env)))
+            parts_out.append(str(eval(v, {}, env)))
         except:
-            out.append(v.strip('"').strip("'"))
-    print(" ".join(out), end=" ")
-    if not value.endswith(","):
-        print()
+            parts_out.append(v.strip('"').strip("'"))
+    text = " ".join(parts_out) + " "
+    out.write(text if value.endswith(",") else text + "\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,24 @@
+# tests/conftest.py
+# Makes main.py and src/ importable and provides `unik`, which runs a Unik program
+# in a scratch directory and returns (interpreter, printed output).
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def unik(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)     # the interpreter creates its caches in the cwd
+    import main
+
+    def run(src):
+        interp = main.Interpreter()
+        try:
+            interp.run(main.parse_source(src))
+        finally:
+            main.uout.flush()
+        return interp, capsys.readouterr().out
+    return run
@@ -0,0 +1,88 @@
+# tests/test_aicache.py
+# aik cache: stable keys, memory / disk / generate counters, the parsed-program
+# LRU and size-capped eviction of the least recently used files.
+import os
+import subprocess
+import sys
+
+from src.stdlib.aicache import AICache, prompt_key
+
+
+def gen(calls):
+    def generate(prompt):
+        calls.append(prompt)
+        return f"give {prompt!r}\n"
+    return generate
+
+
+def test_key_is_stable_across_processes_and_layout():
+    key = prompt_key("sum  the\n numbers", "stub")
+    assert key == prompt_key(" sum the numbers ", "stub")
+    assert key != prompt_key("sum the numbers", "other")
+    code = "from src.stdlib.aicache import prompt_key; print(prompt_key('sum the numbers', 'stub'))"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == key
+
+
+def test_counters_follow_memory_disk_and_generation(tmp_path):
+    calls, parses = [], []
+    parse = lambda src: parses.append(src) or ("prog", src)
+    c = AICache(str(tmp_path))
+    first = c.program("p", "stub", gen(calls), parse)
+    assert c.program("p", "stub", gen(calls), parse) is first
+    assert (c.hits, c.disk_hits, c.misses) == (1, 0, 1)
+    # a new process finds the source on disk and only parses it
+    c2 = AICache(str(tmp_path))
+    c2.program("p", "stub", gen(calls), parse)
+    assert (c2.hits, c2.disk_hits, c2.misses) == (0, 1, 0)
+    assert calls == ["p"] and len(parses) == 2
+    assert c2.stats() == {"hits": 0, "disk_hits": 1, "misses": 0, "evictions": 0, "parsed": 1}
+
+
+def test_parsed_lru_keeps_the_most_recent(tmp_path):
+    c = AICache(str(tmp_path), lru_size=2)
+    calls = []
+    for p in ("a", "b", "a", "c"):
+        c.program(p, "", gen(calls), str)
+    assert list(c.parsed) == [prompt_key("a"), prompt_key("c")]
+    c.program("b", "", gen(calls), str)           # parsed again from disk
+    assert c.disk_hits == 1 and calls == ["a", "b", "c"]
+
+
+def test_disk_cap_evicts_least_recently_used(tmp_path):
+    c = AICache(str(tmp_path), max_bytes=350)
+    keys = [prompt_key(str(i)) for i in range(3)]
+    for i, k in enumerate(keys):
+        c.store(k, "x" * 100)
+        os.utime(c._path(k), (1000 + i, 1000 + i))
+    c.load(keys[0])                               # reading refreshes the clock
+    c.store(prompt_key("new"), "y" * 100)
+    left = sorted(f for f in os.listdir(tmp_path) if f.endswith(".unik"))
+    assert left == sorted(k + ".unik" for k in (keys[0], keys[2], prompt_key("new")))
+    assert c.evictions == 1 and c._bytes == 300
+
+
+def test_newest_entry_survives_even_when_larger_than_the_cap(tmp_path):
+    c = AICache(str(tmp_path), max_bytes=50)
+    c.store(prompt_key("old"), "o" * 40)
+    c.store(prompt_key("big"), "b" * 80)
+    assert c.has(prompt_key("big")) and not c.has(prompt_key("old"))
+
+
+def test_first_generation_wins(tmp_path):
+    c = AICache(str(tmp_path))
+    c.store("k", "give 1\n")
+    c.store("k", "give 2\n")
+    assert c.load("k") == "give 1\n"
+
+
+def test_ai_stats_builtin(unik, tmp_path):
+    import main
+    block = 'aik @ { "say hi" }\n'
+    key = prompt_key(main.parse_source(block)[0].prompt, main.aigen.backend_from_env().name)
+    os.makedirs(tmp_path / ".unik_ai_cache", exist_ok=True)
+    (tmp_path / ".unik_ai_cache" / (key + ".unik")).write_text('give "hi"\n')
+    _, out = unik("loop i = 1..3 {\n" + block + "}\ns = ai_stats()\n"
+                  'give s["disk_hits"]\ngive s["hits"]\ngive s["misses"]\n')
+    assert out.splitlines() == ["hi", "hi", "hi", "1", "2", "0"]
@@ -0,0 +1,66 @@
+# tests/test_aigen.py
+# aik generation over HTTP against the stand-in server, and prefetch batches that
+# come back short.
+import threading
+
+import pytest
+
+from src.stdlib import aigen
+
+
+@pytest.fixture
+def server():
+    srv = aigen.serve(port=0)
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_http_backend_matches_stub(server):
+    http, stub = aigen.HTTPBackend(server), aigen.StubBackend()
+    prompts = ["add function for two numbers", "something else"]
+    try:
+        assert http.generate(prompts[0]) == stub.generate(prompts[0])
+        assert http.generate_many(prompts) == stub.generate_many(prompts)
+    finally:
+        http.close()
+
+
+def test_prefetcher_over_http(server):
+    prompts = [f"task number {i}" for i in range(20)]
+    seen = {}
+    pf = aigen.Prefetcher(aigen.HTTPBackend(server), batch_size=3,
+                          on_done=lambda p, src: seen.setdefault(p, src))
+    try:
+        pf.submit(prompts)
+        got = [pf.get(p) for p in prompts]
+    finally:
+        pf.close()
+        pf.backend.close()
+    assert got == [aigen.StubBackend().generate(p) for p in prompts]
+    assert seen == dict(zip(prompts, got))
+
+
+def test_aik_program_uses_the_server(unik, server, monkeypatch):
+    monkeypatch.setenv("UNIK_AI_URL", server)
+    _, out = unik('x = 2\ny = 3\naik @ { "add function for two numbers" }\n')
+    assert out.strip() == "5"
+
+
+class Short(aigen.StubBackend):
+    def generate_many(self, prompts):
+        return super().generate_many(prompts)[:-1]
+
+
+def test_short_batch_fails_the_missing_prompts():
+    pf = aigen.Prefetcher(Short(), batch_size=4)
+    try:
+        pf.submit(["a", "b", "c"])
+        assert pf.get("a") == Short().generate("a")
+        assert pf.get("b") == Short().generate("b")
+        with pytest.raises(RuntimeError, match="2 codes for 3 prompts"):
+            pf.get("c")
+    finally:
+        pf.close()
@@ -0,0 +1,55 @@
+# tests/test_buffer.py
+# Bytes views, struct pack/unpack and read_chunks, from Python and from scripts.
+import struct
+
+from src.stdlib import buffer as ubuf
+from src.stdlib.buffer import Bytes
+
+
+def test_pack_unpack_round_trip():
+    b = ubuf.pack("<iHd", -7, 513, 2.5)
+    assert b.len() == struct.calcsize("<iHd")
+    assert b.unpack("<iHd") == [-7, 513, 2.5]
+    assert b.unpack("<H", 4) == [513]
+
+
+def test_pack_into_writes_through_views():
+    buf = Bytes(8)
+    view = buf.slice(4, 8)
+    view.pack_into("<I", 0, 0xDEADBEEF)
+    assert buf.unpack("<I", 4) == [0xDEADBEEF]
+    assert buf.slice(0, 4).list() == [0, 0, 0, 0]
+
+
+def test_iter_unpack_and_find_within_view():
+    b = ubuf.pack("<4h", 1, 2, 3, 4)
+    assert [r[0] for r in b.iter_unpack("<h")] == [1, 2, 3, 4]
+    data = Bytes(b"xxabcxxabc")
+    assert data.slice(3).find(b"abc") == 4
+    assert data.slice(3, 6).find(b"abc") == -1
+
+
+def test_list_type_follows_views_and_copies():
+    b = ubuf.pack("<2B", 1, 2, list_type=tuple)
+    assert b.list() == (1, 2)
+    assert b.slice(1).list() == (2,)
+    assert b.copy().unpack("<B") == (1,)
+    assert (b + b"\x03").list() == (1, 2, 3)
+
+
+def test_read_chunks_reuses_one_buffer(tmp_path):
+    p = tmp_path / "data.bin"
+    p.write_bytes(bytes(range(10)))
+    chunks = [c.copy().list() for c in ubuf.read_chunks(str(p), 4)]
+    assert chunks == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_script_results_are_unik_lists(unik):
+    _, out = unik('''
+b = pack("<hh", 3, -4)
+give b.unpack("<hh")
+give b.unpack("<h", 2).len()
+give b.list().len()
+give from_hex("0102ff").list()
+''')
+    assert out.splitlines() == ["[3, -4]", "1", "4", "[1, 2, 255]"]
@@ -0,0 +1,69 @@
+# tests/test_build.py
+# main.py --build: a build loads only while its format, source and pinned aik code
+# all match the lock; anything else is treated as no build.
+import json
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+SRC = 'x = 2\ny = 3\naik @ { "add function for two numbers" }\n'
+
+
+@pytest.fixture
+def built(tmp_path, monkeypatch):
+    # built by the command line, so the pickle refers to __main__ classes
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "prog.unik").write_text(SRC)
+    subprocess.run([sys.executable, MAIN, "--build", "prog.unik"], check=True,
+                   capture_output=True, cwd=tmp_path)
+    return tmp_path
+
+
+def run_locked(capsys):
+    import main
+    main.run_file("prog.unik", locked=True)
+    return capsys.readouterr().out
+
+
+def edit_lock(path, change):
+    lock = json.loads(path.read_text())
+    change(lock)
+    path.write_text(json.dumps(lock))
+
+
+def test_command_line_build_loads_after_import(built, capsys):
+    assert run_locked(capsys).strip() == "5"
+
+
+def test_lock_and_build_carry_the_format(built):
+    import main
+    lock = json.loads((built / "prog.unik.lock").read_text())
+    assert lock["format"] == main.BUILD_FORMAT
+    assert list(lock["aik"].values()) == [main.code_digest(main.aigen.StubBackend().generate(
+        "add function for two numbers"))]
+
+
+@pytest.mark.parametrize("change", [
+    lambda lock: lock.update(format=0),
+    lambda lock: lock.update(source="0" * 64),
+    lambda lock: lock["aik"].update({k: "0" * 64 for k in lock["aik"]}),
+    lambda lock: lock["aik"].clear(),
+])
+def test_lock_mismatch_means_no_build(built, capsys, change):
+    edit_lock(built / "prog.unik.lock", change)
+    with pytest.raises(RuntimeError, match="no build"):
+        run_locked(capsys)
+
+
+def test_unloadable_build_means_no_build(built, capsys):
+    import main
+    (built / "prog.unikc").write_bytes(pickle.dumps({"format": main.BUILD_FORMAT})[:-3])
+    with pytest.raises(RuntimeError, match="no build"):
+        run_locked(capsys)
+    (built / "prog.unikc").write_bytes(b"c__main__\nNope\n.")    # a class this runtime lacks
+    with pytest.raises(RuntimeError, match="no build"):
+        run_locked(capsys)
@@ -0,0 +1,41 @@
+# tests/test_collections.py
+# Collection methods hand back Unik lists, like the list builtins do.
+import pytest
+
+from src.stdlib.collections import Heap, Deque, SortedSet, SortedMap, Counter, Bitset
+
+
+@pytest.mark.parametrize("expr", [
+    "heap([5, 1, 3]).list()",
+    "deque([1, 2, 3]).list()",
+    "sorted_set([3, 1, 2]).list()",
+    "sorted_set([3, 1, 2]).range(1, 2)",
+    "sorted_map({3: 1, 1: 2}).keys()",
+    "sorted_map({3: 1, 1: 2}).values()",
+    "sorted_map({3: 1, 1: 2}).items()",
+    "sorted_map({3: 1, 1: 2}).range(1, 3)",
+    "counter([1, 1, 2]).most_common()",
+    "counter([1, 1, 2]).keys()",
+    "counter([1, 1, 2]).items()",
+    "bitset(16).set(3).set(9).list()",
+    "bitset(16).set(3).union(bitset(8).set(1)).list()",
+])
+def test_list_results_are_unik_lists(unik, expr):
+    interp, _ = unik(f"r = {expr}\nr.append(0)\n")
+    assert type(interp.global_env.get("r")).__name__ == "UnikList"
+
+
+def test_int_results_use_packed_storage(unik):
+    interp, out = unik("s = sorted_set([9, 4, 7, 1, 8, 2, 6, 3, 5])\n"
+                       "xs = map(x => x * 10, s.list())\ngive xs\n")
+    assert out.strip() == "[10, 20, 30, 40, 50, 60, 70, 80, 90]"
+    assert interp.global_env.get("xs").items.typecode == "q"
+
+
+def test_default_list_type_is_plain_list():
+    assert Heap([2, 1]).list() == [1, 2] and type(Heap([2, 1]).list()) is list
+    assert Deque([1]).list() == [1]
+    assert SortedSet([2, 1]).range() == [1, 2]
+    assert SortedMap({1: "a"}).items() == [(1, "a")]
+    assert Counter("aab").most_common(1) == [("a", 2)]
+    assert Bitset().set(5).difference(Bitset().set(5)).list() == []
@@ -0,0 +1,87 @@
+# tests/test_columnar.py
+# columnar() stores: bulk updates must give the same values as per-entity code.
+import pytest
+
+import main
+
+CLS = '''
+class P {
+    init(x) { self.x = x }
+}
+ps = columnar(P)
+'''
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(main, "np", None)
+    elif main.np is None:
+        pytest.skip("NumPy not installed")
+    return request.param
+
+
+def test_update_matches_python_ints(unik, backend):
+    _, out = unik(CLS + '''
+ps.new(3000000000)
+ps.new(-5)
+ps.new(7)
+ps.update("x", "*", 4000000000)
+give ps.column("x")
+ps.update("x", "-", 1)
+give ps.sum("x")
+''')
+    big = [3000000000 * 4000000000, -5 * 4000000000, 7 * 4000000000]
+    assert out.splitlines() == [str(big), str(sum(big) - 3)]
+
+
+def test_update_between_columns_and_division(unik, backend):
+    _, out = unik('''
+class P {
+    init(x, v) { self.x = x
+        self.v = v }
+}
+ps = columnar(P)
+loop i = 1..4 { ps.new(i, i * 10) }
+ps.update("x", "+", "v")
+give ps.column("x")
+ps.update("x", "/", 2)
+give ps.column("x")
+''')
+    assert out.splitlines() == ["[11, 22, 33, 44]", "[5.5, 11.0, 16.5, 22.0]"]
+
+
+def test_update_by_zero_raises_like_python(unik, backend):
+    with pytest.raises(ZeroDivisionError):
+        unik(CLS + '''
+ps.new(1)
+ps.update("x", "%", 0)
+''')
+
+
+def test_unknown_column_is_an_attribute_error(unik):
+    for call in ('ps.fill("y", 1)', 'ps.update("y", "+", 1)', 'ps.update("x", "+", "y")'):
+        with pytest.raises(AttributeError, match="no field y"):
+            unik(CLS + "ps.new(1)\n" + call)
+
+
+def test_new_field_reads_none_for_earlier_entities(unik):
+    _, out = unik(CLS + '''
+ps.new(1)
+ps.push({"x": 2, "y": 5})
+give ps.column("y")
+ps.push({"x": 3, "y": 6})
+give ps.get(0).y
+''')
+    assert out.splitlines() == ["[None, 5]", "None"]
+
+
+def test_big_ints_widen_the_column(unik):
+    _, out = unik(CLS + '''
+ps.new(1)
+ps.new(2)
+ps.get(1).x = 10000000000000000000000
+ps.new(-10000000000000000000000)
+give ps.column("x")
+''')
+    assert out.splitlines() == ["[1, 10000000000000000000000, -10000000000000000000000]"]
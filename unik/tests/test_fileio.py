@@ -0,0 +1,78 @@
+# tests/test_fileio.py
+# Writers a script leaves open are committed at the end of the run, or dropped if
+# the run raised.
+import os
+
+import pytest
+
+
+def run(tmp_path, monkeypatch, src):
+    import main
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "prog.unik").write_text(src)
+    main.run_file("prog.unik")
+
+
+def test_unclosed_writer_is_committed(tmp_path, monkeypatch):
+    run(tmp_path, monkeypatch, 'w = file_writer("out.txt")\nw.line("hello")\n'
+                               'j = json_writer("out.json")\nj.write(1)\n')
+    assert (tmp_path / "out.txt").read_text() == "hello\n"
+    assert (tmp_path / "out.json").read_text() == "[\n1\n]\n"
+    assert not [n for n in os.listdir(tmp_path) if n.endswith(".tmp")]
+
+
+def test_failed_run_keeps_previous_contents(tmp_path, monkeypatch):
+    (tmp_path / "out.txt").write_text("before\n")
+    with pytest.raises(ZeroDivisionError):
+        run(tmp_path, monkeypatch, 'w = file_writer("out.txt")\nw.line("after")\nx = 1 / 0\n')
+    assert (tmp_path / "out.txt").read_text() == "before\n"
+    assert not [n for n in os.listdir(tmp_path) if n.endswith(".tmp")]
+
+
+
+def test_two_writers_on_one_path(tmp_path):
+    from src.stdlib import fileio
+    p = tmp_path / "out.txt"
+    a, b = fileio.FileWriter(p), fileio.FileWriter(p)
+    a.line("first")
+    b.line("second")
+    a.close()
+    assert p.read_text() == "first\n"
+    b.close()
+    assert p.read_text() == "second\n"
+    assert not [n for n in os.listdir(tmp_path) if n.endswith(".tmp")]
+
+
+def test_replace_keeps_the_target_mode(tmp_path):
+    from src.stdlib import fileio
+    p = tmp_path / "out.txt"
+    p.write_text("x")
+    os.chmod(p, 0o640)
+    fileio.write_file(p, "y")
+    assert os.stat(p).st_mode & 0o777 == 0o640
+
+
+def test_lines_stream_through_a_pipe(unik, tmp_path, monkeypatch):
+    from src.stdlib import fileio
+    (tmp_path / "big.txt").write_text("".join(f"{i}\n" for i in range(1000)))
+    read = []
+    real = fileio.TextFile._lines
+
+    def counted(self, keep_ends=False):
+        for line in real(self, keep_ends):
+            read.append(line)
+            yield line
+    monkeypatch.setattr(fileio.TextFile, "_lines", counted)
+    _, out = unik('f = askfile("big.txt")\n'
+                  'r = f.lines() |> map(x => x * 2) |> take(3)\n'
+                  'give r |> collect\n')
+    assert out.strip() == "['00', '11', '22']"
+    assert len(read) <= 4           # stopped early, never read the whole file
+
+
+def test_head_is_a_unik_list_and_close_releases_the_map(unik, tmp_path):
+    (tmp_path / "a.txt").write_text("x\ny\nz\n")
+    interp, out = unik('f = askfile("a.txt")\nh = f.head(2)\nh.append("w")\ngive h\n'
+                       'give f.slice(0, 1)\nf.close()\n')
+    assert out.split("\n")[:2] == ["['x', 'y', 'w']", "x"]
+    assert interp.global_env.get("f")._mm is None
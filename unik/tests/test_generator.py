@@ -0,0 +1,81 @@
+# tests/test_generator.py
+# Generator functions: calling one returns a lazy Stream over a suspended body
+# that is resumed per item (send/next) and can be closed before it finishes.
+import pytest
+
+COUNT = '''func count(n) {
+    i = 0
+    repeat i < n {
+        i = i + 1
+        give "made", i
+        yield i
+    }
+}
+'''
+
+
+def test_body_runs_only_as_items_are_pulled(unik):
+    _, out = unik(COUNT + "s = count(1000000000)\ngive \"start\"\ngive s |> take(2) |> collect\n")
+    assert out.splitlines() == ["start", "made1", "made2", "[1, 2]"]
+
+
+def test_send_resumes_and_close_ends_the_body(unik):
+    interp, _ = unik(COUNT.replace('        give "made", i\n', "") + "s = count(5)\n")
+    gen = interp.global_env.get("s").it
+    assert gen.send(None) == 1
+    assert next(gen) == 2
+    gen.close()
+    with pytest.raises(StopIteration):
+        next(gen)
+
+
+def test_close_while_suspended_in_nested_loops(unik):
+    interp, _ = unik('''
+func grid() {
+    loop r = 1..3 {
+        loop c = 1..3 {
+            if c != r { yield [r, c] }
+        }
+    }
+}
+g = grid()
+''')
+    gen = interp.global_env.get("g").it
+    assert [list(next(gen)) for _ in range(3)] == [[1, 2], [1, 3], [2, 1]]
+    gen.close()
+    assert list(gen) == []
+
+
+def test_return_and_break_end_the_stream(unik):
+    _, out = unik('''
+func upto(n) {
+    loop i = 1..100 {
+        if i > n { ret 0 }
+        yield i
+    }
+}
+func evens() {
+    i = 0
+    repeat true {
+        i = i + 2
+        if i > 6 { break }
+        yield i
+    }
+    yield 100
+}
+give upto(3) |> collect
+give evens() |> collect
+''')
+    assert out.splitlines() == ["[1, 2, 3]", "[2, 4, 6, 100]"]
+
+
+def test_each_call_is_independent(unik):
+    _, out = unik(COUNT.replace('        give "made", i\n', "") + '''
+a = count(3)
+b = count(3)
+give a |> first
+loop x in b { give x }
+give a |> collect
+''')
+    assert out.splitlines() == ["1", "1", "2", "3", "[2, 3]"]
+
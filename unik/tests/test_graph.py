@@ -0,0 +1,185 @@
+# tests/test_graph.py
+# CSR graph algorithms against straightforward adjacency-list versions, with and
+# without NumPy.
+import heapq
+import random
+from collections import deque
+
+import pytest
+
+from src.stdlib import graph as ugraph
+from src.stdlib.graph import Graph
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(ugraph, "np", None)
+    elif ugraph.np is None:
+        pytest.skip("NumPy not installed")
+    return request.param
+
+
+def random_edges(seed, n, m, weighted=False, dag=False):
+    rnd = random.Random(seed)
+    edges = []
+    for _ in range(m):
+        u, v = rnd.randrange(n), rnd.randrange(n)
+        if dag and u >= v:
+            continue
+        edges.append((u, v, rnd.randrange(1, 20)) if weighted else (u, v))
+    return edges
+
+
+def adjacency(n, edges, directed=True):
+    adj = [[] for _ in range(n)]
+    for e in edges:
+        adj[e[0]].append((e[1], e[2] if len(e) > 2 else 1))
+    if not directed:
+        for e in edges:
+            adj[e[1]].append((e[0], e[2] if len(e) > 2 else 1))
+    return adj
+
+
+def ref_bfs(adj, s):
+    seen, order, q = {s}, [], deque([s])
+    while q:
+        u = q.popleft()
+        order.append(u)
+        for v, _ in adj[u]:
+            if v not in seen:
+                seen.add(v)
+                q.append(v)
+    return order
+
+
+def ref_dfs(adj, s):
+    seen, order = set(), []
+    def go(u):
+        seen.add(u)
+        order.append(u)
+        for v, _ in adj[u]:
+            if v not in seen:
+                go(v)
+    go(s)
+    return order
+
+
+def ref_dist(adj, s):
+    dist, heap = {s: 0}, [(0, s)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, w in adj[u]:
+            if d + w < dist.get(v, float("inf")):
+                dist[v] = d + w
+                heapq.heappush(heap, (d + w, v))
+    return dist
+
+
+def graph_of(n, edges, directed=True):
+    src = [e[0] for e in edges]
+    dst = [e[1] for e in edges]
+    w = [e[2] for e in edges] if edges and len(edges[0]) > 2 else None
+    return Graph.from_arrays(src, dst, w, n, directed)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_traversals(backend, seed):
+    n = 60
+    edges = random_edges(seed, n, 150)
+    g, adj = graph_of(n, edges), adjacency(n, edges)
+    for s in (0, 7, 31):
+        assert g.bfs(s) == ref_bfs(adj, s)
+        assert g.dfs(s) == ref_dfs(adj, s)
+        assert g.hops(s) == ref_dist(adjacency(n, [(u, v) for u, v in edges]), s)
+    for u in range(n):
+        assert g.neighbors(u) == [v for v, _ in adj[u]]
+        assert g.degree(u) == len(adj[u])
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_dijkstra_and_path(backend, seed):
+    n = 50
+    edges = random_edges(seed, n, 200, weighted=True)
+    g, adj = graph_of(n, edges), adjacency(n, edges)
+    want = ref_dist(adj, 0)
+    assert g.dijkstra(0) == want
+    for t in range(n):
+        assert g.dijkstra(0, t) == want.get(t)
+        p = g.path(0, t)
+        if t not in want:
+            assert p is None
+            continue
+        assert p[0] == 0 and p[-1] == t
+        cost = sum(min(w for v, w in adj[a] if v == b) for a, b in zip(p, p[1:]))
+        assert cost == want[t]
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_toposort_and_cycles(backend, seed):
+    n = 40
+    edges = random_edges(seed, n, 120, dag=True)
+    order = graph_of(n, edges).toposort()
+    pos = {v: i for i, v in enumerate(order)}
+    assert sorted(order) == list(range(n))
+    assert all(pos[u] < pos[v] for u, v in edges)
+    with pytest.raises(ValueError):
+        graph_of(3, [(0, 1), (1, 2), (2, 0)]).toposort()
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_components(backend, seed):
+    n = 80
+    edges = random_edges(seed, n, 50)
+    parent = list(range(n))
+    def find(x):
+        while parent[x] != x:
+            x = parent[x]
+        return x
+    for u, v in edges:
+        parent[find(u)] = find(v)
+    groups = {}
+    for v in range(n):
+        groups.setdefault(find(v), []).append(v)
+    assert graph_of(n, edges).components() == sorted(groups.values())
+
+
+def test_pagerank_backends_agree(monkeypatch):
+    if ugraph.np is None:
+        pytest.skip("NumPy not installed")
+    edges = random_edges(3, 30, 90)
+    fast = graph_of(30, edges).pagerank()
+    monkeypatch.setattr(ugraph, "np", None)
+    slow = graph_of(30, edges).pagerank()
+    assert abs(sum(fast.values()) - 1) < 1e-9
+    assert all(abs(fast[v] - slow[v]) < 1e-9 for v in fast)
+
+
+def test_labels(backend):
+    g = Graph.from_edges([("a", "b", 2), ("b", "c", 1), ("a", "c", 5)])
+    assert g.bfs("a") == ["a", "b", "c"]
+    assert g.dijkstra("a", "c") == 3
+    assert g.path("a", "c") == ["a", "b", "c"]
+    with pytest.raises(KeyError):
+        g.bfs("zz")
+    u = Graph.from_edges([("x", "y")], directed=False)
+    assert u.bfs("y") == ["y", "x"]
+
+
+def test_results_are_unik_lists(unik):
+    _, out = unik("""
+g = graph([["a", "b"], ["b", "c"], ["x", "y"]])
+r = g.bfs("a")
+r.append("z")
+give r
+give g.dfs("a").len()
+give g.neighbors("a").len()
+give g.path("a", "c").pop()
+give g.toposort().len()
+cs = g.components()
+give cs.len()
+give cs[0].len()
+""")
+    assert out.split("\n")[:7] == ["['a', 'b', 'c', 'z']", "3", "1", "c", "5", "2", "3"]
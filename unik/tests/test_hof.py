@@ -0,0 +1,49 @@
+# tests/test_hof.py
+# Every higher-order builtin takes (fn, data) and (data, fn) with the same result.
+import pytest
+
+DATA = "xs = [5, 3, 9, 1, 7, 2, 8, 6, 4, 0, 11, 3]\n"
+
+CASES = [
+    ("map", "x => x * 2"),
+    ("filter", "x => x % 2 == 0"),
+    ("reduce", "(a, b) => a + b"),
+    ("reduce", "(a, b) => a * 2 + b"),
+    ("flat_map", "x => [x, x]"),
+    ("take_while", "x => x > 2"),
+    ("drop_while", "x => x > 2"),
+    ("sort", "x => 0 - x"),
+    ("sort_by", "x => x % 4"),
+    ("group_by", "x => x % 3"),
+    ("min_by", "x => (x - 6) * (x - 6)"),
+    ("max_by", "x => x % 5"),
+    ("unique", "x => x % 4"),
+]
+
+
+def show(call):
+    return f"r = {call}\ngive r |> collect\n" if call.split("(")[0] in \
+        ("flat_map", "take_while", "drop_while") else f"give {call}\n"
+
+
+@pytest.mark.parametrize("name,fn", CASES)
+def test_both_argument_orders(unik, name, fn):
+    _, out = unik(DATA + show(f"{name}({fn}, xs)") + show(f"{name}(xs, {fn})"))
+    first, second = out.strip().split("\n")
+    assert first == second
+
+
+@pytest.mark.parametrize("name,fn", [("map", "x => x * 2"), ("filter", "x => x > 4"),
+                                     ("sort_by", "x => 0 - x")])
+def test_vectorized_path_both_orders(unik, name, fn):
+    _, out = unik("xs = []\nloop i = 1..50 { xs.append(i) }\n"
+                  f"give {name}({fn}, xs)\ngive {name}(xs, {fn})\n")
+    first, second = out.strip().split("\n")
+    assert first == second
+
+
+def test_sort_forms(unik):
+    _, out = unik(DATA + "give sort(xs)\ngive sort(xs, true)\ngive sort(x => 0 - x, xs, false)\n")
+    asc, desc, by_neg = out.strip().split("\n")
+    assert asc == "[0, 1, 2, 3, 3, 4, 5, 6, 7, 8, 9, 11]"
+    assert desc == by_neg
@@ -0,0 +1,142 @@
+# tests/test_inline_cache.py
+# Per-site inline caches for `obj.attr`: results must match a plain lookup as a
+# site sees new shapes, goes polymorphic and then megamorphic.
+import main
+
+
+def sites(node, attr, seen=None):
+    # every AttrAccess for `attr` reachable from a parsed program
+    seen = set() if seen is None else seen
+    if id(node) in seen:
+        return []
+    seen.add(id(node))
+    if isinstance(node, list):
+        return [s for n in node for s in sites(n, attr, seen)]
+    if not isinstance(node, main.Node):
+        return []
+    found = [node] if isinstance(node, main.AttrAccess) and node.attr == attr else []
+    for v in vars(node).values():
+        if isinstance(v, (list, main.Node)):
+            found += sites(v, attr, seen)
+    return found
+
+
+def test_objects_built_alike_share_a_shape(unik):
+    interp, _ = unik('''
+class P {
+    init(x, y) { self.x = x
+        self.y = y }
+}
+a = P(1, 2)
+b = P(3, 4)
+''')
+    a, b = interp.global_env.get("a"), interp.global_env.get("b")
+    assert a.shape is b.shape
+    assert list(a.shape.slots) == ["x", "y"]
+
+
+def test_field_order_changes_the_slot(unik):
+    _, out = unik('''
+class P {}
+func getx(o) { ret o.x }
+a = P()
+a.x = 1
+a.y = 2
+b = P()
+b.y = 20
+b.x = 10
+give getx(a), " ", getx(b), " ", getx(a)
+''')
+    assert out == "1 10 1\n"
+
+
+def test_site_goes_polymorphic_then_megamorphic(tmp_path, monkeypatch, capsys):
+    # objects of many shapes, `v` at different slots, then a dict at the same site
+    src = '''
+class A {}
+func getv(o) { ret o.v }
+objs = []
+loop i = 1..6 {
+    o = A()
+    loop j = 1..i { o.v = j }
+    objs.append(o)
+}
+o = A()
+o.pad = 0
+o.v = 7
+objs.append(o)
+o = A()
+o.pad = 0
+o.pad2 = 0
+o.v = 8
+objs.append(o)
+o = A()
+o.a = 0
+o.b = 0
+o.c = 0
+o.v = 9
+objs.append(o)
+o = A()
+o.a = 0
+o.b = 0
+o.c = 0
+o.d = 0
+o.v = 10
+objs.append(o)
+d = {"v": 11}
+objs.append(d)
+loop o in objs { give getv(o) }
+'''
+    monkeypatch.chdir(tmp_path)
+    ast = main.parse_source(src)
+    main.Interpreter().run(ast)
+    main.uout.flush()
+    out = capsys.readouterr().out.splitlines()
+    assert out == ["1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11"]
+    ic = [s for s in sites(ast, "v") if s.ic.megamorphic]
+    assert ic, "the getv site saw more shapes than POLY_LIMIT"
+
+
+def test_new_field_after_a_method_hit(unik):
+    _, out = unik('''
+class A {
+    func name() { ret "method" }
+}
+func peek(o) { ret o.name }
+a = A()
+f = peek(a)
+give f()
+b = A()
+b.name = "field"
+give peek(b)
+give peek(a)()
+''')
+    assert out.splitlines() == ["method", "field", "method"]
+
+
+def test_columns_added_later_get_a_new_layout(unik):
+    _, out = unik('''
+class P {
+    init(x) { self.x = x }
+}
+func getx(o) { ret o.x }
+ps = columnar(P)
+ps.new(1)
+give getx(ps.get(0))
+ps.push({"y": 5, "x": 2})
+give getx(ps.get(1)), " ", getx(ps.get(0)), " ", ps.get(1).y
+''')
+    assert out.splitlines() == ["1", "2 1 5"]
+
+
+def test_dicts_and_natives_share_a_site(unik):
+    _, out = unik('''
+class Box {
+    init(v) { self.v = v }
+}
+func v(o) { ret o.v }
+func size(o) { ret o.len() }
+give v(Box(1)), " ", v({"v": 2}), " ", v(Box(3))
+give size([1, 2, 3]), " ", size(builder("xy")), " ", size([4])
+''')
+    assert out.splitlines() == ["1 2 3", "3 2 1"]
@@ -0,0 +1,162 @@
+# tests/test_json.py
+# Streaming and lazy JSON against json.loads on random documents, with the input
+# cut into chunks at arbitrary points.
+import io
+import os
+import json
+import random
+
+import pytest
+
+from src.stdlib import json as ujson
+
+
+def random_value(rnd, depth=0):
+    kind = rnd.randrange(9 if depth < 4 else 5)
+    if kind == 0: return rnd.randrange(-10**6, 10**6)
+    if kind == 1: return rnd.choice([0.5, -1e-7, 3.25e12, 1.0, 2e300])
+    if kind == 2: return rnd.choice([True, False, None])
+    if kind == 3: return "".join(rnd.choice('ab "\\\né中{}[],:') for _ in range(rnd.randrange(8)))
+    if kind == 4: return rnd.randrange(10**20, 10**22)
+    if kind in (5, 6): return [random_value(rnd, depth + 1) for _ in range(rnd.randrange(5))]
+    return {"k%d%s" % (rnd.randrange(20), '"' if rnd.random() < .1 else ""): random_value(rnd, depth + 1)
+            for _ in range(rnd.randrange(5))}
+
+
+def chunks(text, rnd):
+    cuts = sorted(rnd.sample(range(len(text) + 1), min(len(text) + 1, rnd.randrange(1, 30))))
+    return [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+
+
+def rebuild(events):
+    # value from the event stream
+    stack, key, root = [], [], []
+    def put(v):
+        if not stack:
+            root.append(v)
+        elif isinstance(stack[-1], list):
+            stack[-1].append(v)
+        else:
+            stack[-1][key.pop()] = v
+    for kind, v in events:
+        if kind == "start_map" or kind == "start_array":
+            c = {} if kind == "start_map" else []
+            put(c)
+            stack.append(c)
+        elif kind in ("end_map", "end_array"):
+            stack.pop()
+        elif kind == "map_key":
+            key.append(v)
+        else:
+            put(v)
+    return root
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_events_rebuild_document(seed):
+    rnd = random.Random(seed)
+    doc = random_value(rnd)
+    text = json.dumps(doc, indent=rnd.choice([None, 1]), ensure_ascii=False)
+    assert rebuild(ujson.events(chunks(text, rnd))) == [doc]
+    assert rebuild(ujson.events(io.StringIO(text), chunk_size=3)) == [doc]
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_items_and_lines(seed):
+    rnd = random.Random(seed)
+    arr = [random_value(rnd) for _ in range(rnd.randrange(12))]
+    doc = {"meta": random_value(rnd), "data": {"rows": arr}}
+    text = json.dumps(doc, ensure_ascii=False)
+    assert list(ujson.items(chunks(text, rnd), "data.rows")) == arr
+    assert list(ujson.items(chunks(json.dumps(arr), rnd))) == arr
+    jl = "\n".join(json.dumps(v) for v in arr) + "\n"
+    assert list(ujson.lines(chunks(jl, rnd))) == arr
+    assert list(ujson.lines(io.StringIO(jl))) == arr
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_lazy_matches_loads(seed):
+    rnd = random.Random(seed)
+    doc = {"a": random_value(rnd), "b": [random_value(rnd) for _ in range(6)]}
+    lz = ujson.lazy(json.dumps(doc))
+    assert lz.value() == doc
+
+    def same(lazy_v, v):
+        if isinstance(v, dict):
+            assert sorted(lazy_v.keys()) == sorted(v) and lazy_v.len() == len(v)
+            for k in v:
+                same(lazy_v[k], v[k])
+        elif isinstance(v, list):
+            assert lazy_v.len() == len(v)
+            for i, x in enumerate(v):
+                same(lazy_v[i], x)
+            if v:
+                same(lazy_v[-1], v[-1])
+        else:
+            assert lazy_v == v
+    same(ujson.lazy(json.dumps(doc)), doc)
+
+
+def test_lazy_file_is_mmapped(tmp_path):
+    p = tmp_path / "doc.json"
+    p.write_text(json.dumps({"x": [1, {"y": "z"}]}))
+    lz = ujson.lazy(str(p))
+    assert lz["x"][1]["y"] == "z" and lz.get("missing", 7) == 7
+
+
+def test_malformed_input_raises():
+    with pytest.raises(ValueError):
+        list(ujson.events(['{"a": 1,', ' ]']))
+    with pytest.raises(ValueError):
+        list(ujson.events(['[1, 2']))
+
+
+@pytest.mark.parametrize("mode", ["array", "lines"])
+def test_writer_roundtrip(tmp_path, mode):
+    rnd = random.Random(5)
+    arr = [random_value(rnd) for _ in range(20)]
+    path = str(tmp_path / "out.json")
+    w = ujson.Writer(path, mode)
+    w.write_all(arr)
+    assert w.close() == len(arr)
+    got = list(ujson.items(path)) if mode == "array" else list(ujson.lines(path))
+    assert got == arr
+
+
+def test_writer_replaces_target_only_on_close(tmp_path):
+    p = tmp_path / "out.json"
+    p.write_text("[1]\n")
+    w = ujson.Writer(str(p))
+    w.write({"a": 1})
+    assert p.read_text() == "[1]\n"          # not truncated up front
+    w.close()
+    assert json.loads(p.read_text()) == [{"a": 1}]
+
+
+def test_writer_abort_keeps_previous_contents(tmp_path):
+    p = tmp_path / "out.json"
+    p.write_text("[1]\n")
+    with pytest.raises(ZeroDivisionError):
+        with ujson.Writer(str(p)) as w:
+            w.write(2)
+            1 / 0
+    assert p.read_text() == "[1]\n"
+    assert w.closed and sorted(os.listdir(tmp_path)) == ["out.json"]
+
+
+def test_failed_run_aborts_json_writer(tmp_path, monkeypatch):
+    import main
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "out.json").write_text("[1]\n")
+    (tmp_path / "prog.unik").write_text('w = json_writer("out.json")\nw.write(5)\nx = 1 / 0\n')
+    with pytest.raises(ZeroDivisionError):
+        main.run_file("prog.unik")
+    assert (tmp_path / "out.json").read_text() == "[1]\n"
+
+
+def test_lazy_keys_are_unik_lists(unik, tmp_path):
+    (tmp_path / "d.json").write_text('{"a": 1, "b": [1, 2, 3]}')
+    _, out = unik('d = json_lazy("d.json")\nk = d.keys()\nk.append("c")\ngive k\n'
+                  'give d.items().len()\n')
+    assert out.split("\n")[:2] == ["['a', 'b', 'c']", "2"]
+    assert isinstance(ujson.lazy("[1, 2, 3]", list_type=tuple)[0:2], tuple)
@@ -0,0 +1,14 @@
+# tests/test_memo.py
+# Memoized calls never hand back a result computed for an argument of another type.
+
+SRC = """func h(n) {
+    if n <= 0 { return n }
+    return h(n - 1) + n
+}
+"""
+
+
+def test_inferred_memo_keys_on_type(unik):
+    _, out = unik(SRC + "give h(2)\ngive h(2.0)\ngive h(true)\ngive h(2)\n")
+    assert out.split() == ["3", "3.0", "1", "3"]
+
@@ -0,0 +1,130 @@
+# tests/test_persistent.py
+# PVector / PMap against list / dict under random operation sequences.
+import random
+
+import pytest
+
+from src.stdlib.persistent import PVector, PMap, EMPTY_MAP
+
+
+class Collides:
+    # equal-hash keys, to reach the HAMT collision nodes
+    def __init__(self, n): self.n = n
+    def __hash__(self): return self.n % 7
+    def __eq__(self, other): return isinstance(other, Collides) and other.n == self.n
+    def __repr__(self): return f"C{self.n}"
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_pvector_matches_list(seed):
+    rnd = random.Random(seed)
+    v, ref = PVector.from_iter([]), []
+    history = []
+    for _ in range(3000):
+        op = rnd.random()
+        if op < 0.6 or not ref:
+            x = rnd.randrange(10**6)
+            v, ref = v.push(x), ref + [x]
+        elif op < 0.85:
+            i = rnd.randrange(len(ref))
+            x = rnd.randrange(10**6)
+            v = v.set(i, x)
+            ref = ref[:i] + [x] + ref[i + 1:]
+        else:
+            v, ref = v.pop(), ref[:-1]
+        if rnd.random() < 0.02:
+            history.append((v, list(ref)))
+        assert len(v) == len(ref)
+    assert list(v) == ref
+    assert [v.get(i) for i in range(len(ref))] == ref
+    # older versions are untouched by later updates
+    for old, snapshot in history:
+        assert list(old) == snapshot
+
+
+@pytest.mark.parametrize("n", [0, 1, 31, 32, 33, 1024, 1025, 32 * 32 * 32 + 5])
+def test_pvector_from_iter_and_edges(n):
+    items = list(range(n))
+    v = PVector.from_iter(items)
+    assert list(v) == items and len(v) == n
+    if n:
+        assert v.get(-1) == items[-1]
+        assert list(v.pop()) == items[:-1]
+        assert list(v.set(n - 1, "x"))[-1] == "x"
+    with pytest.raises(IndexError):
+        v.get(n)
+    assert list(v.push("end")) == items + ["end"]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_pmap_matches_dict(seed):
+    rnd = random.Random(seed)
+    m, ref = EMPTY_MAP, {}
+    history = []
+    keys = [rnd.randrange(500) for _ in range(200)] + [f"k{i}" for i in range(50)] + \
+           [Collides(i) for i in range(40)]
+    for _ in range(4000):
+        k = rnd.choice(keys)
+        if rnd.random() < 0.7:
+            v = rnd.randrange(100)
+            m = m.set(k, v)
+            ref = {**ref, k: v}
+        else:
+            m = m.remove(k)
+            ref = {kk: vv for kk, vv in ref.items() if kk != k}
+        if rnd.random() < 0.02:
+            history.append((m, dict(ref)))
+        assert len(m) == len(ref)
+    assert m.dict() == ref
+    assert m == ref
+    for k in keys:
+        assert m.has(k) == (k in ref)
+        assert m.get(k) == ref.get(k)
+    for old, snapshot in history:
+        assert old.dict() == snapshot
+
+
+def test_pmap_set_same_value_and_missing_remove_return_self():
+    m = PMap.from_items([("a", 1)])
+    assert m.set("a", 1) is m
+    assert m.remove("zzz") is m
+    with pytest.raises(KeyError):
+        m["zzz"]
+
+
+def test_class_defaults_are_not_shared(unik):
+    _, out = unik("""
+class Bag {
+  items = []
+  n = 0
+  func add(x) {
+    self.items.append(x)
+  }
+}
+class Sub : Bag {
+  tag = "s"
+}
+a = Bag()
+b = Bag()
+a.add(1)
+give b.items
+give a.items
+give Sub().items
+""")
+    assert out.split("\n")[:3] == ["[]", "[1]", "[]"]
+
+
+def test_lists_handed_to_scripts_are_unik_lists(unik):
+    _, out = unik("""
+k = pmap({1: 2, 3: 4}).keys()
+k.append(5)
+give k
+v = pmap({1: 2}).set(7, 8).values()
+v.append(0)
+give v
+l = pvec([1, 2]).push(3).list()
+l.append(4)
+give l
+give pvec([]).push(1).list().len()
+""")
+    assert out.split("\n")[:4] == ["[1, 3, 5]", "[2, 8, 0]", "[1, 2, 3, 4]", "1"]
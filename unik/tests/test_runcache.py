@@ -0,0 +1,109 @@
+# tests/test_runcache.py
+# main.py --cache: runs are replayed only while the program, its arguments, its
+# inputs and the runtime are all unchanged.
+import io
+import os
+
+import pytest
+
+
+@pytest.fixture
+def cached(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    import main
+
+    def run(src, args=(), stdin=""):
+        (tmp_path / "prog.unik").write_text(src)
+        monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+        main.run_file("prog.unik", args, cache=True)
+        return capsys.readouterr().out
+    return run
+
+
+def tokens(src):
+    import main
+    return main.Lexer(src).tokenize(src)
+
+
+def test_key_ignores_layout_and_comments(tmp_path, monkeypatch):
+    from src.stdlib import runcache
+    monkeypatch.chdir(tmp_path)
+    a = runcache.run_key(tokens("x = 1\ngive x\n"), [])
+    assert a == runcache.run_key(tokens("x   =  1   # one\ngive x\n"), [])
+    assert a != runcache.run_key(tokens("x = 2\ngive x\n"), [])
+    assert a != runcache.run_key(tokens("x = 1\ngive x\n"), ["arg"])
+
+
+def test_key_covers_the_runtime(tmp_path, monkeypatch):
+    from src.stdlib import runcache
+    monkeypatch.chdir(tmp_path)
+    toks = tokens("give 1\n")
+    before = runcache.run_key(toks, [])
+    monkeypatch.setattr(runcache, "_runtime", "another interpreter")
+    assert runcache.run_key(toks, []) != before
+
+
+def test_source_digest_shares_the_token_hash():
+    import hashlib
+    import main
+    from src.stdlib import runcache
+    toks = tokens("give 1 + 2\n")
+    assert main.source_digest(toks) == runcache.hash_tokens(hashlib.sha256(), toks).hexdigest()
+
+
+def test_replay_restores_output_and_files(cached, tmp_path, monkeypatch):
+    from src.stdlib import runcache
+    replays = []
+    real = runcache.RunCache.replay
+    monkeypatch.setattr(runcache.RunCache, "replay",
+                        lambda self, rec, out: replays.append(rec) or real(self, rec, out))
+    src = 'givefile "out.txt", "made"\ngive "done"\n'
+    assert cached(src) == "done\n"
+    assert not replays
+    os.remove(tmp_path / "out.txt")
+    assert cached(src) == "done\n"
+    assert len(replays) == 1
+    assert (tmp_path / "out.txt").read_text().startswith("made")
+
+
+def test_changed_input_file_reruns(cached, tmp_path):
+    (tmp_path / "in.txt").write_text("one\n")
+    src = 'give askfile("in.txt")\n'
+    assert "one" in cached(src)
+    (tmp_path / "in.txt").write_text("two\n")
+    assert "two" in cached(src)
+
+
+def test_answers_are_part_of_the_match(cached):
+    src = 'name = ask "who?"\ngive name\n'
+    assert cached(src, stdin="ann\n").endswith("ann\n")
+    assert cached(src, stdin="bob\n").endswith("bob\n")
+    assert cached(src, stdin="ann\n").endswith("ann\n")
+
+
+@pytest.mark.parametrize("src", [
+    'func f() async { ret 1 }\nh = spawn(f())\ngive await h\n',
+    'wait 1 ms\ngive "slept"\n',
+    'func f() async { ret 1 }\ngive await timeout(f(), 5)\n',
+    'task a { give "a" }\ntask b { give "b" }\nrun a, b\n',
+    'loop v in json_lines("-") { give v }\n',
+])
+def test_timing_tasks_and_stdin_are_not_cached(cached, monkeypatch, src):
+    from src.stdlib import runcache
+    replays = []
+    monkeypatch.setattr(runcache.RunCache, "replay", lambda self, rec, out: replays.append(rec))
+    stdin = '{"k": 1}'
+    first = cached(src, stdin=stdin)
+    assert cached(src, stdin=stdin) == first
+    assert not replays
+
+
+def test_single_task_run_is_cached(cached, monkeypatch):
+    from src.stdlib import runcache
+    replays = []
+    real = runcache.RunCache.replay
+    monkeypatch.setattr(runcache.RunCache, "replay",
+                        lambda self, rec, out: replays.append(rec) or real(self, rec, out))
+    src = 'task a { give "a" }\nrun a\n'
+    assert cached(src) == cached(src) == "a\n"
+    assert len(replays) == 1
@@ -0,0 +1,75 @@
+# tests/test_str_accum.py
+# `s = s + x` inside a loop appends to a builder in place; every way the string can
+# be observed during or after the loop must see the same value as plain `+`.
+import pytest
+
+
+def value(unik, src, name="s"):
+    interp, out = unik(src)
+    return interp.global_env.get(name), out
+
+
+def test_loop_result_is_a_plain_string(unik):
+    s, _ = value(unik, 's = "<"\nloop i = 1..5 { s = s + i + "," }\ns = s + ">"\n')
+    assert type(s) is str and s == "<1,2,3,4,5,>"
+
+
+def test_mixed_operands_match_plain_plus(unik):
+    s, _ = value(unik, 's = ""\nloop x in [1, 2.5, true, [1, 2], "t"] { s = s + x + "|" }\n')
+    assert s == "1|2.5|True|[1, 2]|t|"
+
+
+def test_repeat_and_nested_loops(unik):
+    s, _ = value(unik, '''
+s = ""
+i = 0
+repeat i < 3 {
+    i = i + 1
+    loop j = 1..i { s = s + j }
+    s = s + ";"
+}
+''')
+    assert s == "1;12;123;"
+
+
+@pytest.mark.parametrize("src,expect", [
+    # a snapshot taken inside the loop does not grow afterwards
+    ('s = "a"\nkeep = []\nloop i = 1..3 {\n s = s + i\n keep.append(s)\n}\ngive keep\n',
+     "['a1', 'a12', 'a123']"),
+    ('s = ""\nt = ""\nloop i = 1..3 {\n s = s + i\n t = s\n}\ngive t, " ", s\n', "123 123"),
+    # a closure made in the loop reads the value at call time
+    ('s = ""\nfs = []\nloop i = 1..2 {\n s = s + i\n fs.append(() => s)\n}\ns = s + "!"\ngive fs[0]()\n', "12!"),
+    # a function that appends to the same variable while the loop runs
+    ('s = ""\nfunc f() {\n s = s + "f"\n ret s\n}\nloop i = 1..2 {\n s = s + i\n give f()\n}\ngive s\n',
+     "1f\n1f2f\n1f2f"),
+    # the right-hand side rebinds the name
+    ('s = "x"\nfunc g() {\n s = "reset"\n ret "+"\n}\nloop i = 1..2 { s = s + g() }\ngive s\n', "x++"),
+    ('s = "a"\nfunc h() {\n s = s + "f"\n ret s\n}\nloop i = 1..2 { s = s + h() }\ngive s\n', "aafaaff"),
+    # reassigned to a non-string mid-loop
+    ('s = ""\nloop i = 1..3 {\n s = s + i\n if i == 2 { s = 0 }\n}\ngive s\n', "3"),
+    # dict and object fields holding the value
+    ('s = ""\nd = {}\nloop i = 1..3 {\n s = s + i\n d["v"] = s\n}\ngive d["v"]\n', "123"),
+])
+def test_escaping_accumulator(unik, src, expect):
+    _, out = unik(src)
+    assert out.strip() == expect
+
+
+def test_break_and_errors_leave_a_string(unik):
+    s, _ = value(unik, 's = ""\nloop i = 1..10 {\n s = s + i\n if i == 3 { break }\n}\n')
+    assert type(s) is str and s == "123"
+    with pytest.raises(ZeroDivisionError):
+        unik('s = ""\nloop i = 1..3 {\n s = s + i\n x = 1 / (2 - i)\n}\n')
+
+
+def test_function_local_accumulator(unik):
+    _, out = unik('''
+func report(n) {
+    out = "r:"
+    loop i = 1..n { out = out + i }
+    ret out
+}
+give report(3)
+give report(2)
+''')
+    assert out.splitlines() == ["r:123", "r:12"]
@@ -0,0 +1,66 @@
+# tests/test_stream.py
+# `|>` pipelines are lazy: each item goes through every stage once, and a terminal
+# that stops early (take, first, take_while, break) stops the upstream stages too.
+import pytest
+
+COUNTED = '''calls = []
+func f(x) {
+    calls.append(x)
+    ret x * 2
+}
+'''
+
+
+@pytest.mark.parametrize("pipeline,result,calls", [
+    ("r = range(1, 1000000000) |> map(f) |> filter(x => x % 3 == 0) |> take(2) |> collect",
+     "[6, 12]", "[1, 2, 3, 4, 5, 6]"),
+    ("r = [5, 6, 7, 8] |> map(f) |> first", "10", "[5]"),
+    ("r = range(1, 1000000000) |> map(f) |> take_while(x => x < 7) |> collect",
+     "[2, 4, 6]", "[1, 2, 3, 4]"),
+    ("r = range(1, 1000000000) |> map(f) |> drop(2) |> take(1) |> collect", "[6]", "[1, 2, 3]"),
+    ("r = [1, 2, 3, 4, 5, 6] |> map(f) |> chunk(2) |> first", "[2, 4]", "[1, 2]"),
+])
+def test_terminal_stops_upstream(unik, pipeline, result, calls):
+    _, out = unik(COUNTED + pipeline + "\ngive r\ngive calls\n")
+    assert out.splitlines() == [result, calls]
+
+
+def test_break_out_of_a_stream_loop(unik):
+    _, out = unik(COUNTED + '''
+loop x in range(1, 1000000000) |> map(f) {
+    if x > 4 { break }
+    give x
+}
+give calls
+''')
+    assert out.splitlines() == ["2", "4", "[1, 2, 3]"]
+
+
+def test_stages_interleave_per_item(unik):
+    _, out = unik('''
+func a(x) {
+    give "a", x
+    ret x
+}
+func b(x) {
+    give "b", x
+    ret x
+}
+r = [1, 2] |> map(a) |> map(b) |> collect
+''')
+    assert out.splitlines() == ["a1", "b1", "a2", "b2"]
+
+
+def test_streams_are_single_pass(unik):
+    _, out = unik('''
+s = [1, 2, 3] |> map(x => x + 1)
+give s |> take(2) |> collect
+give s |> collect
+''')
+    assert out.splitlines() == ["[2, 3]", "[4]"]
+
+
+def test_lists_in_give_lists_out(unik):
+    interp, _ = unik("r = map(x => x + 1, [1, 2, 3])\ns = [1, 2, 3] |> map(x => x + 1)\n")
+    assert type(interp.global_env.get("r")).__name__ == "UnikList"
+    assert type(interp.global_env.get("s")).__name__ == "Stream"
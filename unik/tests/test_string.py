@@ -0,0 +1,67 @@
+# tests/test_string.py
+# Aho-Corasick matcher against a brute-force search.
+import random
+
+import pytest
+
+from src.stdlib.string import Automaton, find_all, count
+
+
+def brute(text, patterns):
+    pats = list(dict.fromkeys(patterns))
+    hits = [(i, p) for p in pats for i in range(len(text)) if text.startswith(p, i)]
+    return sorted(hits, key=lambda h: (h[0] + len(h[1]), pats.index(h[1])))
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_find_all_matches_brute_force(seed):
+    rnd = random.Random(seed)
+    alpha = "abc" if seed % 2 else "abcdxy"
+    text = "".join(rnd.choice(alpha) for _ in range(rnd.randrange(0, 400)))
+    patterns = ["".join(rnd.choice(alpha) for _ in range(rnd.randrange(1, 6)))
+                for _ in range(rnd.randrange(1, 25))]
+    ac = Automaton(patterns)
+    want = brute(text, patterns)
+    assert sorted(ac.find_all(text), key=lambda h: (h[0] + len(h[1]), h[0])) == \
+        sorted(want, key=lambda h: (h[0] + len(h[1]), h[0]))
+    assert ac.count(text) == len(want)
+    assert ac.contains(text) == bool(want)
+    assert ac.counts(text) == {p: sum(1 for _, q in want if q == p) for p in set(q for _, q in want)}
+    # fed in random chunks, the scanner reports the same matches with stream offsets
+    cuts = sorted(rnd.sample(range(len(text) + 1), min(len(text) + 1, 6)))
+    chunks = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+    assert list(ac.scan(chunks)) == list(ac.find_all(text))
+    for p in set(patterns):
+        assert find_all(text, p, overlap=True) == [i for i, q in want if q == p]
+        assert count(text, p, overlap=True) == sum(1 for _, q in want if q == p)
+
+
+def test_ignore_case_offsets_survive_length_changing_folds():
+    text = "xİab ßtraße ABx"
+    ac = Automaton(["ab", "STRASSE"], ignore_case=True)
+    hits = ac.find_all(text)
+    assert (2, "ab") in hits and (12, "ab") in hits
+    assert (5, "strasse") in hits
+    # the same offsets when the text arrives one character at a time
+    assert list(ac.scan(list(text))) == hits
+
+
+def test_empty_pattern_rejected():
+    with pytest.raises(ValueError):
+        Automaton(["a", ""])
+
+
+def test_unik_values(unik):
+    interp, out = unik("""
+m = matcher(["he", "she", "his", "hers"])
+hits = m.find_all("ushers")
+give hits
+give len(hits)
+s = m.scan(["us", "hers"])
+give s |> collect
+""")
+    lines = out.strip().split("\n")
+    assert lines[0] == "[(1, 'she'), (2, 'he'), (2, 'hers')]"
+    assert lines[1] == "3"
+    assert type(interp.global_env.get("hits")).__name__ == "UnikList"
+    assert type(interp.global_env.get("s")).__name__ == "Stream"
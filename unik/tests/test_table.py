@@ -0,0 +1,91 @@
+# tests/test_table.py
+# Table group-by aggregates: string specs, the interpreter's builtins, per-group
+# functions, and exact int sums; read_csv on ragged rows; stable descending sorts.
+import pytest
+
+from src.stdlib.table import Table, read_csv
+
+np = pytest.importorskip("numpy")
+
+
+def test_int_sums_stay_exact():
+    big = 2 ** 53 + 1
+    t = Table({"k": ["a", "a", "b"], "v": [big, 1, 2]})
+    g = t.group_by("k").agg("sum", "mean")
+    assert g.row(0)["v_sum"] == big + 1
+    assert g.row(1)["v_sum"] == 2
+    assert g.cols["v_sum"].dtype == np.int64
+
+
+def test_int_sums_beyond_int64_fall_back_to_python_ints():
+    t = Table({"k": [1, 1], "v": [2 ** 62, 2 ** 62]})
+    assert t.group_by("k").agg("sum").row(0)["v_sum"] == 2 ** 63
+
+
+def test_callables_and_resolve():
+    t = Table({"k": ["x", "y", "x"], "v": [1, 5, 3]},
+              resolve=lambda f: {sum: "sum", len: "count"}.get(f, f))
+    g = t.group_by("k").agg(sum, len, lambda vals: int(vals.max() - vals.min()))
+    assert g.columns() == ["k", "v_sum", "v_agg", "count"]
+    assert g.row(0) == {"k": "x", "v_sum": 4, "v_agg": 2, "count": 2}
+    with pytest.raises(ValueError):
+        t.group_by("k").agg("median")
+
+
+def test_derived_tables_keep_wrap():
+    class Box:
+        def __init__(self, a): self.data = a
+    t = Table({"k": [1, 2, 2], "v": [1.0, 2.0, 3.0]}, wrap=Box)
+    assert isinstance(t.where("k", "==", 2).col("v"), Box)
+    assert isinstance(t.group_by("k").agg("sum").col("v_sum"), Box)
+
+
+def test_unik_agg_with_builtins(unik):
+    _, out = unik("""
+t = table({"k": ["a", "b", "a"], "v": [1, 2, 3]})
+func spread(xs) -> xs.max() - xs.min()
+g = t.group_by("k").agg(sum, spread, count)
+give g.columns()
+give g.col("v_sum")
+give g.col("v_spread")
+""")
+    assert out.split("\n")[:3] == ["['k', 'v_sum', 'v_spread', 'count']", "vector([4, 2])", "vector([2, 0])"]
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 65536])
+def test_ragged_rows_are_not_restriped(tmp_path, chunk_rows):
+    p = tmp_path / "r.csv"
+    p.write_text("a,b,c\n1,2,3\n4,5\n6,7,8,9\n")
+    t = read_csv(str(p), chunk_rows=chunk_rows)
+    assert t.col("a").tolist() == [1, 4, 6]
+    assert t.col("b").tolist() == [2, 5, 7]
+    c = t.col("c")
+    assert c[0] == 3 and np.isnan(c[1]) and c[2] == 8
+
+
+def test_rectangular_csv_fast_path(tmp_path):
+    p = tmp_path / "r.csv"
+    p.write_text("a,b\n1,x\n2,y\n3,z\n")
+    t = read_csv(str(p), chunk_rows=2)
+    assert t.col("a").tolist() == [1, 2, 3]
+    assert t.col("b").tolist() == ["x", "y", "z"]
+
+
+def test_sort_desc_keeps_ties_in_order():
+    t = Table({"k": [1, 2, 1, 2, 1], "i": [0, 1, 2, 3, 4]})
+    assert t.sort_by("k", desc=True).col("i").tolist() == [1, 3, 0, 2, 4]
+    s = Table({"k": ["b", "a", "b", "a"], "i": [0, 1, 2, 3]})
+    assert s.sort_by("k", desc=True).col("i").tolist() == [0, 2, 1, 3]
+    assert s.sort_by(["k", "i"], desc=True).col("i").tolist() == [2, 0, 3, 1]
+
+
+def test_columns_and_head_are_unik_lists(unik):
+    _, out = unik("""
+t = table({"k": [1, 2, 3]})
+c = t.columns()
+c.append("x")
+give c
+h = t.head(2)
+give h.len()
+""")
+    assert out.split("\n")[:2] == ["['k', 'x']", "2"]
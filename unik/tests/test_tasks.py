@@ -0,0 +1,148 @@
+# tests/test_tasks.py
+# task / spawn / await / wait on the scheduler: concurrency, the running-task cap,
+# cancellation and timeouts, `ask` off the loop, and what happens at program end.
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from src.stdlib import tasks
+
+WORKER = """func worker(i) async {
+  wait 50ms
+  ret i * 2
+}
+"""
+
+
+@pytest.fixture
+def program(tmp_path, monkeypatch, capsys):
+    # through run_file, which drains and shuts the scheduler down at program end
+    monkeypatch.chdir(tmp_path)
+    import main
+
+    def run(src):
+        (tmp_path / "prog.unik").write_text(src)
+        main.run_file("prog.unik")
+        return capsys.readouterr().out.split("\n")[:-1]
+    return run
+
+
+def test_spawned_tasks_run_concurrently(program):
+    start = time.perf_counter()
+    out = program(WORKER + "hs = []\nloop i = 1..200 { hs.append(spawn(worker(i))) }\n"
+                           "r = await gather(hs)\ngive len(r)\ngive r[199]\n")
+    assert out == ["200", "400"]
+    assert time.perf_counter() - start < 2
+
+
+def test_task_limit_caps_running_tasks(program):
+    start = time.perf_counter()
+    out = program(WORKER + "task_limit(2)\nhs = []\nloop i = 1..6 { hs.append(spawn(worker(i))) }\n"
+                           "r = await gather(hs)\ngive len(r)\n")
+    assert out == ["6"]
+    assert time.perf_counter() - start >= 0.15      # three rounds of two
+
+
+def test_cancel_and_timeout(program):
+    slow = """func slow() async {
+  wait 5s
+  ret "late"
+}
+"""
+    out = program(slow + "h = spawn(slow())\ncancel(h)\nwait 10ms\ngive h.cancelled()\n")
+    assert out == ["True"]
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        program(slow + "x = await timeout(slow(), 0.05)\n")
+    assert time.perf_counter() - start < 2
+
+
+def test_spawn_without_suspend_point_runs_at_program_end(program):
+    out = program("""func note(i) async {
+  wait 10ms
+  give "task", i
+}
+spawn(note(1))
+spawn(note(2))
+give "main"
+""")
+    assert out == ["main", "task1", "task2"]
+
+
+def test_ask_inside_a_task_lets_others_run(program, monkeypatch):
+    r, w = os.pipe()
+    monkeypatch.setattr("sys.stdin", os.fdopen(r))
+    threading.Timer(0.4, lambda: (os.write(w, b"bob\n"), os.close(w))).start()
+    out = program("""task ticker {
+  loop i = 1..3 {
+    wait 50ms
+    give "tick", i
+  }
+}
+task asker {
+  name = ask "name? "
+  give "hi ", name
+}
+run ticker, asker
+""")
+    assert out == ["name? tick1", "tick2", "tick3", "hi bob"]
+
+
+def test_shutdown_cancels_leftover_tasks():
+    sched = tasks.Scheduler()
+    cancelled = []
+
+    async def forever():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+    def tick():
+        yield tasks.Sleep(0)        # let it start
+    h = sched.spawn(forever())
+    sched.run(tick())
+    sched.shutdown()
+    assert h.cancelled() and cancelled and sched.loop.is_closed()
+
+
+def test_finish_drains_tasks_spawned_by_tasks():
+    sched = tasks.Scheduler()
+    done = []
+
+    async def child():
+        await asyncio.sleep(0.01)
+        done.append("child")
+
+    async def parent():
+        sched.spawn(child())
+        done.append("parent")
+    sched.spawn(parent())
+    sched.finish()
+    sched.shutdown()
+    assert done == ["parent", "child"]
+
+
+def test_task_limit_is_rejected_while_tasks_are_pending(program):
+    with pytest.raises(RuntimeError, match="task_limit"):
+        program(WORKER + "task_limit(2)\nh = spawn(worker(1))\ntask_limit(8)\n")
+    out = program(WORKER + "task_limit(1)\nh = spawn(worker(1))\ngive await h\n"
+                           "task_limit(4)\nr = await gather([spawn(worker(2)), spawn(worker(3))])\ngive r\n")
+    assert out == ["2", "[4, 6]"]
+
+
+def test_wait_in_a_non_async_function_is_an_error(program):
+    src = """func pause() {
+  wait 10ms
+  ret 1
+}
+func outer() async {
+  ret pause()
+}
+give await outer()
+"""
+    with pytest.raises(RuntimeError, match="declare the function async"):
+        program(src)
@@ -0,0 +1,53 @@
+# tests/test_template.py
+# String interpolation: holes, format specs, {{ }} escapes, quotes inside holes,
+# and brace text that is not a hole (JSON, "{}", prose) staying as written.
+import pytest
+
+
+def give(unik, *lines, pre='name = "ann"\ntotal = 3.14159\nd = {"k": 5}\n'):
+    _, out = unik(pre + "".join(f"give {l}\n" for l in lines))
+    return out.split("\n")[:-1]
+
+
+def test_holes(unik):
+    assert give(unik, '"Hello {name}!"', '"{name}{name}"', '"{1 + 2} items"') == \
+        ["Hello ann!", "annann", "3 items"]
+
+
+def test_format_specs(unik):
+    assert give(unik, '"{total:.2f}|{total:>8.1f}|{name:>5}|{42:05d}"') == \
+        ["3.14|     3.1|  ann|00042"]
+
+
+def test_escaped_braces(unik):
+    assert give(unik, '"{{literal}} {name}"', '"{{{name}}}"', '"}}"') == \
+        ["{literal} ann", "{ann}", "}"]
+
+
+def test_quotes_and_colons_inside_holes(unik):
+    assert give(unik, r'"{d[\"k\"]}"', r'"{len(\"a:b\")}"', r'"{name + \":\"}"') == \
+        ["5", "3", "ann:"]
+
+
+@pytest.mark.parametrize("lit,shown", [
+    (r'"{\"a\": 1}"', '{"a": 1}'),
+    (r'"{\"a\": 1, \"b\": [1, 2]}"', '{"a": 1, "b": [1, 2]}'),
+    ('"{}"', "{}"),
+    ('"}"', "}"),
+    ('"a { b"', "a { b"),
+    ('"{x y}"', "{x y}"),
+    ('"{name:zz}"', "{name:zz}"),
+])
+def test_brace_text_that_is_not_a_hole(unik, lit, shown):
+    assert give(unik, lit) == [shown]
+
+
+def test_json_with_a_hole_inside(unik):
+    assert give(unik, r'"{\"user\": \"{name}\", \"n\": {1 + 1}}"') == ['{"user": "ann", "n": 2}']
+
+
+def test_plan_is_built_once_at_parse_time():
+    import main
+    node = main.parse_source('give "a {x:>3} b"\n')[0].expr
+    assert isinstance(node, main.Template)
+    assert node.parts[0] == "a " and node.parts[1][1] == ">3" and node.parts[2] == " b"
@@ -0,0 +1,81 @@
+# tests/test_unik_cache.py
+# CacheStore: batches survive a busy database, concurrent processes never lose
+# increments, the legacy JSON cache is migrated once, and late writes after close
+# are harmless.
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+import unik_cache
+from unik_cache import CacheStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = CacheStore(str(tmp_path / "c.db"), legacy_json=None)
+    yield s
+    s.close()
+
+
+def test_busy_database_keeps_the_batch(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(unik_cache, "BATCH_SIZE", 4)
+    store.db.execute("PRAGMA busy_timeout = 50")
+    other = sqlite3.connect(str(tmp_path / "c.db"), isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")            # another writer holds the lock
+    for i in range(10):
+        store.bump("errors", "boom")            # flushes fail busy; must not raise
+    store.put("suggestions", "k", "v")
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+    assert store.count("errors", "boom") == 10
+    other.execute("ROLLBACK")
+    other.close()
+    store.flush()
+    assert not store.counts and not store.values
+    assert store.items("errors") == {"boom": 10}
+    assert store.get("suggestions", "k") == "v"
+
+
+def test_writes_after_close_are_dropped(tmp_path):
+    s = CacheStore(str(tmp_path / "c.db"), legacy_json=None)
+    s.bump("errors", "a")
+    s.close()
+    s.bump("errors", "a")
+    s.put("suggestions", "k", "v")
+    assert s.get("suggestions", "k", "none") == "none"
+    s.close()
+    again = CacheStore(str(tmp_path / "c.db"), legacy_json=None)
+    assert again.count("errors", "a") == 1
+    again.close()
+
+
+def test_concurrent_processes_merge_counts(tmp_path):
+    db = str(tmp_path / "c.db")
+    code = ("import sys; sys.path.insert(0, %r)\n"
+            "from unik_cache import CacheStore\n"
+            "s = CacheStore(%r, legacy_json=None)\n"
+            "for i in range(500): s.bump('patterns', 'p')\n"
+            "s.close()\n") % (ROOT, db)
+    procs = [subprocess.Popen([sys.executable, "-c", code]) for _ in range(4)]
+    assert all(p.wait() == 0 for p in procs)
+    s = CacheStore(db, legacy_json=None)
+    assert s.count("patterns", "p") == 2000
+    s.close()
+
+
+def test_legacy_json_is_migrated_once(tmp_path):
+    legacy = tmp_path / "old.json"
+    legacy.write_text(json.dumps({"errors": {"e": 3}, "suggestions": {"k": "fix it"}}))
+    s = CacheStore(str(tmp_path / "c.db"), legacy_json=str(legacy))
+    assert s.count("errors", "e") == 3 and s.get("suggestions", "k") == "fix it"
+    s.close()
+    assert not legacy.exists() and (tmp_path / "old.json.migrated").exists()
+    s = CacheStore(str(tmp_path / "c.db"), legacy_json=str(legacy))
+    assert s.count("errors", "e") == 3
+    s.close()
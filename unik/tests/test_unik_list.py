@@ -0,0 +1,76 @@
+# tests/test_unik_list.py
+# UnikList keeps all-int / all-float contents in array('q'/'d') and upgrades to a
+# plain list on the first write the array cannot hold, without changing values.
+from array import array
+
+import pytest
+
+from main import UnikList
+
+
+def storage(lst):
+    return lst.items.typecode if type(lst.items) is array else "list"
+
+
+@pytest.mark.parametrize("values,code", [
+    ([1, 2, 3], "q"), ([1.5, 2.0], "d"), ([1, 2.0], "list"), (["a"], "list"),
+    ([True, False], "list"), ([2 ** 70], "list"), ([], "list"),
+])
+def test_packing(values, code):
+    lst = UnikList(values)
+    assert storage(lst) == code
+    assert list(lst) == values and [type(v) for v in lst] == [type(v) for v in values]
+
+
+@pytest.mark.parametrize("write", [
+    lambda l: l.append(2.5), lambda l: l.append("s"), lambda l: l.append(2 ** 64),
+    lambda l: l.append(True), lambda l: l.insert(0, 0.5), lambda l: l.insert(1, 2 ** 63),
+    lambda l: l.__setitem__(1, "x"), lambda l: l.__setitem__(0, -2 ** 63 - 1),
+    lambda l: l.extend([4, 5.0]), lambda l: l.extend(UnikList(["z"])),
+])
+def test_int_list_upgrades_on_a_foreign_write(write):
+    lst, ref = UnikList([1, 2, 3]), [1, 2, 3]
+    write(lst)
+    write(ref)
+    assert storage(lst) == "list"
+    assert list(lst) == ref and [type(v) for v in lst] == [type(v) for v in ref]
+
+
+def test_float_list_does_not_coerce_ints():
+    lst = UnikList([0.5, 1.5])
+    lst.append(2)
+    assert storage(lst) == "list" and type(lst[2]) is int
+
+
+def test_packed_writes_stay_packed():
+    lst = UnikList([1, 2])
+    lst.append(3)
+    lst.insert(0, 0)
+    lst[1] = 10
+    lst.extend(UnikList([4, 5]))
+    assert storage(lst) == "q" and list(lst) == [0, 10, 2, 3, 4, 5]
+    assert storage(lst.copy()) == "q" and storage(lst[1:3]) == "q" and storage(lst * 2) == "q"
+
+
+def test_emptied_list_specializes_again():
+    lst = UnikList(["a"])
+    lst.pop()
+    lst.append(1.5)
+    assert storage(lst) == "d"
+
+
+def test_script_writes(unik):
+    interp, out = unik('''
+xs = [1, 2, 3]
+ys = [1, 2, 3]
+xs.append(4.5)
+ys.append(4)
+zs = [1.0, 2.0]
+zs.push("three")
+give xs
+give ys
+give zs
+''')
+    env = interp.global_env
+    assert [storage(env.get(n)) for n in ("xs", "ys", "zs")] == ["list", "q", "list"]
+    assert out.splitlines() == ["[1, 2, 3, 4.5]", "[1, 2, 3, 4]", "[1.0, 2.0, 'three']"]
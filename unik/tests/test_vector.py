@@ -0,0 +1,59 @@
+# tests/test_vector.py
+# Vectorized map/filter/sort_by over int lists keep Python int semantics: results
+# that could wrap or round in int64 fall back to the per-element path.
+from array import array
+
+import pytest
+
+import main
+
+N = 20
+INTS = "xs = []\nloop i = 1..%d { xs.append(i * 1000000000) }\n" % N
+VALUES = [i * 1000000000 for i in range(1, N + 1)]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(main, "np", None)
+    elif main.np is None:
+        pytest.skip("NumPy not installed")
+    return request.param
+
+
+def results(unik, src):
+    interp, _ = unik(INTS + src)
+    return interp.global_env.get("r")
+
+
+@pytest.mark.parametrize("fn,expect", [
+    ("x => x * 3", lambda x: x * 3),
+    ("x => x * x * x", lambda x: x * x * x),                  # far past int64
+    ("x => x * 9000000000 - 1", lambda x: x * 9000000000 - 1),
+    ("x => x + big", lambda x: x + 2 ** 70),                    # closure beyond 2**53
+    ("x => (x * 1000000007 + 1) / 3", lambda x: (x * 1000000007 + 1) / 3),
+    ("x => x % 7 - 3", lambda x: x % 7 - 3),
+])
+def test_map_matches_python_ints(unik, backend, fn, expect):
+    r = results(unik, f"big = {2 ** 70}\nr = map({fn}, xs)\n")
+    assert list(r) == [expect(x) for x in VALUES]
+    assert all(type(a) is type(expect(1)) for a in r)
+
+
+def test_small_results_stay_packed(unik, backend):
+    r = results(unik, "r = map(x => x * 2 + 1, xs)\n")
+    assert type(r.items) is array and r.items.typecode == "q"
+    assert list(r) == [x * 2 + 1 for x in VALUES]
+
+
+def test_filter_and_sort_by_on_overflowing_keys(unik, backend):
+    r = results(unik, "r = filter(x => x * x * x > 8000000000000000000000000000, xs)\n")
+    assert list(r) == [x for x in VALUES if x ** 3 > 8 * 10 ** 27]
+    # keys wrap in int64 past 2**63: the order must follow the true values
+    r = results(unik, "r = sort_by(xs, x => 0 - x * x * 10)\n")
+    assert list(r) == sorted(VALUES, reverse=True)
+
+
+def test_modulo_by_zero_raises(unik, backend):
+    with pytest.raises(ZeroDivisionError):
+        results(unik, "r = map(x => x % 0, xs)\n")
@@ -0,0 +1,173 @@
+# unik_cache.py
+# Self-evolving cache store shared by unik_full.py and unik_part3.py.
+# Entries live in SQLite (WAL mode), so several processes can record at once:
+# - bump() / put() only touch an in-memory batch (constant time, any cache size)
+# - the batch is group-committed in one transaction once it reaches BATCH_SIZE
+#   entries or FLUSH_SECONDS have passed, and at exit
+# - counters are merged as deltas (count = count + n), so concurrent writers
+#   never lose each other's increments
+# - every CHECKPOINT_EVERY commits the WAL is folded back into the database
+# - a busy database (another writer past the timeout) never costs entries:
+#   the batch stays in memory and the next flush retries it
+# - writes after close() are dropped (atexit may close before late callers)
+import atexit
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+BATCH_SIZE = 256
+FLUSH_SECONDS = 1.0
+CHECKPOINT_EVERY = 64
+KINDS = ("errors", "patterns", "suggestions")
+
+class CacheStore:
+    def __init__(self, path=".unik_ai_cache.db", legacy_json=".unik_ai_cache.json"):
+        self.path = path
+        self.lock = threading.Lock()
+        self.counts = {}        # (kind, key) -> pending increment
+        self.values = {}        # (kind, key) -> pending value
+        self.last_flush = time.monotonic()
+        self.commits = 0
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS entries (
+                               kind TEXT NOT NULL, key TEXT NOT NULL,
+                               count INTEGER NOT NULL DEFAULT 0, value TEXT,
+                               PRIMARY KEY (kind, key)) WITHOUT ROWID""")
+        if legacy_json and os.path.exists(legacy_json):
+            self.import_json(legacy_json)
+        atexit.register(self.close)
+
+    # -------------------------
+    # WRITES (batched)
+    # -------------------------
+    def bump(self, kind, key, n=1):
+        with self.lock:
+            if self.db is None:
+                return
+            k = (kind, key)
+            self.counts[k] = self.counts.get(k, 0) + n
+            self._maybe_flush()
+
+    def put(self, kind, key, value):
+        with self.lock:
+            if self.db is None:
+                return
+            self.values[(kind, key)] = value
+            self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self.counts) + len(self.values) >= BATCH_SIZE or \
+                time.monotonic() - self.last_flush >= FLUSH_SECONDS:
+            # bump() runs inside error handlers: a busy database must not raise
+            # there; the batch is kept and retried on a later write
+            try:
+                self._flush()
+            except sqlite3.OperationalError:
+                pass
+
+    def _flush(self):
+        self.last_flush = time.monotonic()
+        if not self.counts and not self.values or self.db is None:
+            return
+        db = self.db
+        db.execute("BEGIN IMMEDIATE")   # one writer at a time across processes; may raise busy
+        counts, values = self.counts, self.values
+        self.counts, self.values = {}, {}
+        try:
+            db.executemany("""INSERT INTO entries (kind, key, count) VALUES (?, ?, ?)
+                              ON CONFLICT (kind, key) DO UPDATE SET count = count + excluded.count""",
+                           [(kind, key, n) for (kind, key), n in counts.items()])
+            db.executemany("""INSERT INTO entries (kind, key, value) VALUES (?, ?, ?)
+                              ON CONFLICT (kind, key) DO UPDATE SET value = excluded.value""",
+                           [(kind, key, v) for (kind, key), v in values.items()])
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            for k, n in counts.items():     # keep the batch for the next attempt
+                self.counts[k] = self.counts.get(k, 0) + n
+            for k, v in values.items():
+                self.values.setdefault(k, v)
+            raise
+        self.commits += 1
+        if self.commits % CHECKPOINT_EVERY == 0:
+            self.checkpoint()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    # -------------------------
+    # READS (see pending writes)
+    # -------------------------
+    def count(self, kind, key):
+        with self.lock:
+            if self.db is None:
+                return self.counts.get((kind, key), 0)
+            row = self.db.execute("SELECT count FROM entries WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+            return (row[0] if row else 0) + self.counts.get((kind, key), 0)
+
+    def get(self, kind, key, default=None):
+        with self.lock:
+            if (kind, key) in self.values:
+                return self.values[(kind, key)]
+            if self.db is None:
+                return default
+            row = self.db.execute("SELECT value FROM entries WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+            return row[0] if row and row[0] is not None else default
+
+    def items(self, kind):
+        """{key: count or value} for one kind, as the old JSON cache held it."""
+        self.flush()
+        if self.db is None:
+            return {}
+        rows = self.db.execute("SELECT key, count, value FROM entries WHERE kind = ?", (kind,))
+        return {k: (v if v is not None else c) for k, c, v in rows}
+
+    # -------------------------
+    # MAINTENANCE
+    # -------------------------
+    def checkpoint(self):
+        try:
+            self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.OperationalError:
+            pass    # another process is mid-transaction; the next checkpoint catches up
+
+    def compact(self):
+        self.flush()
+        self.checkpoint()
+        self.db.execute("VACUUM")
+
+    def import_json(self, path):
+        # one-time migration of the old whole-file JSON cache
+        moved = path + ".migrated"
+        try:
+            os.replace(path, moved)     # atomic: only one process migrates
+            with open(moved, "r") as f:
+                old = json.load(f)
+        except (OSError, ValueError):
+            return
+        for kind in KINDS:
+            for key, v in old.get(kind, {}).items():
+                if isinstance(v, int):
+                    self.bump(kind, key, v)
+                else:
+                    self.put(kind, key, v)
+        self.flush()
+
+    def close(self):
+        if self.db is None:
+            return
+        try:
+            self.flush()
+            self.checkpoint()
+        except sqlite3.OperationalError as e:
+            pending = len(self.counts) + len(self.values)
+            sys.stderr.write(f"unik cache: {pending} pending entries not saved ({e})\n")
+        with self.lock:
+            self.db.close()
+            self.db = None
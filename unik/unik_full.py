@@ -1,7 +1,7 @@
 # unik_full.py
 import asyncio
-import json
-import os
+from unik_cache import CacheStore
+from src.stdlib.aigen import backend_from_env
 
 # -------------------------
 # AST NODES
@@ -132,24 +132,22 @@ GLOBAL_ENV = {}
 # -------------------------
 # AI CACHE
 # -------------------------
-CACHE_FILE = ".unik_ai_cache.json"
-if os.path.exists(CACHE_FILE):
-    with open(CACHE_FILE, "r") as f:
-        AI_CACHE = json.load(f)
-else:
-    AI_CACHE = {"errors": {}, "patterns": {}, "suggestions": {}}
+CACHE_FILE = ".unik_ai_cache.db"
+AI_CACHE = CacheStore(CACHE_FILE)
 
 def save_cache():
-    with open(CACHE_FILE, "w") as f:
-        json.dump(AI_CACHE, f, indent=2)
+    AI_CACHE.flush()
+
+AI_BACKEND = backend_from_env()   # UNIK_AI_URL selects an HTTP backend
 
 def aik(prompt, context=None):
     key = prompt.lower()
-    suggestion = f"# AI Suggestion for: {prompt}"
-    AI_CACHE["suggestions"][key] = suggestion
-    save_cache()
+    suggestion = AI_CACHE.get("suggestions", key)
+    if suggestion is None:
+        suggestion = AI_BACKEND.generate(prompt)
+        AI_CACHE.put("suggestions", key, suggestion)
     print(f"[AI Suggestion] {suggestion}")
-    return String(f"<AI-generated code for '{prompt}'>")
+    return String(suggestion)
 
 # -------------------------
 # EXECUTOR
@@ -188,9 +186,7 @@ async def execute_with_debug(node, env=None):
         return await execute(node, env)
     except Exception as e:
         err_msg = str(e)
-        AI_CACHE["errors"].setdefault(err_msg, 0)
-        AI_CACHE["errors"][err_msg] += 1
-        save_cache()
+        AI_CACHE.bump("errors", err_msg)
         print(f"[Error] {err_msg}")
         print(f"[Hint] {explain_error(node, e)}")
 
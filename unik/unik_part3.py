@@ -1,22 +1,15 @@
 # unik_part3.py
-import json
-import os
+from unik_cache import CacheStore
 from unik_part2 import execute, GLOBAL_ENV, TASKS
 
 # -------------------------
 # SELF-EVOLVING CACHE
 # -------------------------
-CACHE_FILE = ".unik_ai_cache.json"
-
-if os.path.exists(CACHE_FILE):
-    with open(CACHE_FILE, "r") as f:
-        AI_CACHE = json.load(f)
-else:
-    AI_CACHE = {"errors": {}, "patterns": {}, "suggestions": {}}
+CACHE_FILE = ".unik_ai_cache.db"
+AI_CACHE = CacheStore(CACHE_FILE)
 
 def save_cache():
-    with open(CACHE_FILE, "w") as f:
-        json.dump(AI_CACHE, f, indent=2)
+    AI_CACHE.flush()
 
 # -------------------------
 # AI INTEGRATION (SIMULATED)
@@ -30,8 +23,7 @@ def aik(prompt, context=None):
     """
     key = prompt.lower()
     suggestion = f"# AI Suggestion for: {prompt}"
-    AI_CACHE["suggestions"][key] = suggestion
-    save_cache()
+    AI_CACHE.put("suggestions", key, suggestion)
     print(f"[AI Suggestion] {suggestion}")
     # Return placeholder AST node for demo
     from unik_part1 import String
@@ -48,9 +40,7 @@ async def execute_with_debug(node, env=None):
     except Exception as e:
         # Log error in cache
         err_msg = str(e)
-        AI_CACHE["errors"].setdefault(err_msg, 0)
-        AI_CACHE["errors"][err_msg] += 1
-        save_cache()
+        AI_CACHE.bump("errors", err_msg)
         # Human-readable explanation
         explanation = explain_error(node, e)
         print(f"[Error] {err_msg}")
@@ -78,6 +68,4 @@ def log_pattern(node_type):
     Track frequently used patterns (like repeat loops)
     """
     key = str(node_type)
-    AI_CACHE["patterns"].setdefault(key, 0)
-    AI_CACHE["patterns"][key] += 1
-    save_cache()
+    AI_CACHE.bump("patterns", key)